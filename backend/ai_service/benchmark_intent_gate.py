@@ -0,0 +1,134 @@
+# backend/ai_service/benchmark_intent_gate.py
+"""
+Intent Gate Benchmark - local classifier vs Gemini gate
+
+    python -m backend.ai_service.benchmark_intent_gate [--live] [--repeats 1]
+
+Cases are the 100 labelled utterances of poc/intent/daiso_poc_data.csv; the local classifier
+is scored on held-out (5-fold) predictions. The Gemini numbers come from the recorded
+[M1] Flash columns of the same sheet, so no API key is needed. The hybrid row uses the local
+answer for a "Y" with p >= INTENT_CLASSIFIER_THRESHOLD and the Flash answer and latency otherwise
+(local "N" predictions always escalate, as in _classify_intent).
+
+--live also calls the gate through _classify_intent (Gemini only, then local + escalation)
+on the sheet and the test_pipeline cases. This requires .env with GOOGLE_API_KEY.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.ai_service.config import INTENT_CLASSIFIER_THRESHOLD
+from backend.ai_service.intent_classifier import (
+    CSV_LABEL,
+    CSV_TEXT,
+    POC_QUESTIONS_JSON,
+    IntentClassifier,
+    answers_locally,
+    cross_val_predictions,
+    load_gate_csv,
+    load_training_data,
+)
+
+FLASH_LABEL, FLASH_MS = "[M1] Flash 예측", "[M1] 속도(ms)"
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _row(name, correct, total, latencies, llm_calls):
+    return {
+        "gate": name,
+        "acc": correct / total if total else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": _percentile(latencies, 0.95) if latencies else 0.0,
+        "llm_share": llm_calls / total if total else 0.0,
+    }
+
+
+def offline_benchmark(threshold: float):
+    rows = load_gate_csv()
+    extra_texts, extra_labels = load_training_data(csv_path="", json_path=POC_QUESTIONS_JSON)
+    scored = [r for r in rows if r[CSV_TEXT].strip()]
+    held_out = dict(zip((r["No."] for r in scored), cross_val_predictions(scored, extra_texts, extra_labels)))
+
+    classifier = IntentClassifier.train(*load_training_data())
+    local_ms = []
+    for r in rows:
+        start = time.perf_counter()
+        classifier.predict(r[CSV_TEXT])
+        local_ms.append((time.perf_counter() - start) * 1000)
+
+    local_ok = flash_ok = hybrid_ok = escalated = 0
+    flash_ms, hybrid_ms = [], []
+    for r, ms in zip(rows, local_ms):
+        label, confidence = held_out.get(r["No."], ("N", 1.0))  # blank utterance: N
+        flash = r[FLASH_LABEL]
+        local_ok += label == r[CSV_LABEL]
+        flash_ok += flash == r[CSV_LABEL]
+        llm_ms = float(r[FLASH_MS] or 0)  # blank for the silent utterance
+        flash_ms.append(llm_ms)
+        if answers_locally(label, confidence, threshold):
+            hybrid_ok += label == r[CSV_LABEL]
+            hybrid_ms.append(ms)
+        else:
+            escalated += 1
+            hybrid_ok += flash == r[CSV_LABEL]
+            hybrid_ms.append(ms + llm_ms)
+
+    n = len(rows)
+    return [
+        _row("local", local_ok, n, local_ms, 0),
+        _row("gemini", flash_ok, n, flash_ms, n),
+        _row(f"hybrid@{threshold}", hybrid_ok, n, hybrid_ms, escalated),
+    ]
+
+
+async def live_benchmark(repeats: int):
+    from backend.ai_service import intent_keyword_node as node
+    from backend.ai_service.intent_classifier import get_intent_classifier
+    from backend.ai_service.test_pipeline import INTENT_GATE_CASES
+
+    cases = [(r[CSV_TEXT], r[CSV_LABEL]) for r in load_gate_csv() if r[CSV_TEXT].strip()]
+    cases += list(INTENT_GATE_CASES)
+    results = []
+    for name, classifier in (("gemini (live)", None), ("hybrid (live)", get_intent_classifier())):
+        node.get_intent_classifier = lambda: classifier
+        correct, latencies, llm_calls = 0, [], 0
+        for _ in range(repeats):
+            for text, expected in cases:
+                start = time.perf_counter()
+                result = await node._classify_intent(text)
+                latencies.append((time.perf_counter() - start) * 1000)
+                correct += result == expected
+                llm_calls += classifier is None or not answers_locally(*classifier.predict(text),
+                                                                          INTENT_CLASSIFIER_THRESHOLD)
+        results.append(_row(name, correct, len(cases) * repeats, latencies, llm_calls))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local intent gate against Gemini")
+    parser.add_argument("--threshold", type=float, default=INTENT_CLASSIFIER_THRESHOLD)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    results = offline_benchmark(args.threshold)
+    if args.live:
+        results += asyncio.run(live_benchmark(args.repeats))
+
+    print(f"\n{'gate':<16} {'acc':>6} {'p50 ms':>8} {'p95 ms':>8} {'LLM calls':>10}")
+    for r in results:
+        print(f"{r['gate']:<16} {r['acc']:>6.0%} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['llm_share']:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# backend/ai_service/benchmark_pipeline_modes.py
+"""
+Intent & Keyword Benchmark - staged (3 calls) vs merged (1 call) pipeline modes
+
+    python -m backend.ai_service.benchmark_pipeline_modes [--repeats 3] [--modes sequential,speculative,merged]
+
+Cases are the intent gate / NLU cases of test_pipeline.py. For each mode it reports gate
+accuracy (Y/N), NLU accuracy (intent + item) and p50/p95 latency of the whole
+gate → NLU → expansion step. The keyword memo, the local intent gate classifier and the
+rule-based NLU fast path are disabled so every mode pays its LLM calls.
+
+Required: .env with GOOGLE_API_KEY
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Measure the LLM calls, not memo lookups or local shortcuts (read by config at import)
+os.environ["LLM_MEMO_PATH"] = ""
+os.environ["INTENT_CLASSIFIER_PATH"] = ""
+os.environ["FAST_PATH_NLU"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.ai_service import intent_keyword_node as node
+from backend.ai_service.test_pipeline import INTENT_GATE_CASES, NLU_CASES
+
+
+async def _merged_only(text, history):
+    """Merged call without the staged fallback (a failure counts against the mode)."""
+    return await node._analyze_merged(text, history)
+
+
+MODES = {
+    "sequential": node._run_sequential,
+    "speculative": node._run_speculative,
+    "merged": _merged_only,
+}
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def bench_mode(name: str, run, repeats: int) -> dict:
+    latencies, gate_ok, gate_n, nlu_ok, nlu_n, errors = [], 0, 0, 0, 0, 0
+    cases = [(text, valid, None, None) for text, valid in INTENT_GATE_CASES]
+    cases += [(text, None, intent, item) for text, intent, item in NLU_CASES]
+
+    for _ in range(repeats):
+        for text, expected_valid, expected_intent, expected_item in cases:
+            start = time.perf_counter()
+            try:
+                intent_valid, nlu, _ = await run(text, [])
+            except Exception as e:
+                errors += 1
+                print(f"  [ERROR] {name} '{text}': {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            if expected_valid is not None:
+                gate_n += 1
+                gate_ok += int(intent_valid == expected_valid)
+            else:
+                nlu_n += 1
+                intent = nlu.intent.value if nlu else "UNSUPPORTED"
+                item_ok = expected_item is None or bool(nlu and nlu.slots.item and expected_item in nlu.slots.item)
+                nlu_ok += int(intent == expected_intent and item_ok)
+
+    return {
+        "mode": name,
+        "gate_acc": gate_ok / gate_n if gate_n else 0.0,
+        "nlu_acc": nlu_ok / nlu_n if nlu_n else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": _percentile(latencies, 0.95) if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark staged vs merged intent/NLU/expansion")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--modes", default="sequential,speculative,merged")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.modes.split(","):
+        print(f"Running {name}...")
+        results.append(await bench_mode(name, MODES[name], args.repeats))
+
+    print(f"\n{'mode':<12} {'gate acc':>9} {'nlu acc':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['gate_acc']:>9.0%} {r['nlu_acc']:>8.0%} "
+              f"{r['p50']:>8.0f} {r['p95']:>8.0f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+# backend/ai_service/benchmark_reranker.py
+"""
+Reranker Benchmark - local vs Gemini vs hybrid reranker
+
+    python -m backend.ai_service.benchmark_reranker [--live]
+    python -m backend.ai_service.benchmark_reranker --run-dir <ivhl run> --catalog <catalog.tsv>
+
+Default cases are the 61 golden rerank cases of poc/kdg (poc_v5_experiment_phase_1_eval):
+candidates are built the same way (ground-truth products named by their hint, the other
+hints as real products or noise), shuffled with a fixed seed. With --run-dir / --catalog the
+inputs of rerank_benchmark_results.py are used instead: top-10 predicted_doc_ids of each
+detail.jsonl case, graded against its expected_doc_ids.
+
+A case passes when the selected id is a ground-truth id, or nothing is selected and the
+case has none. "decisive" is the share the local reranker answers on its own in hybrid
+mode, "decisive acc" its accuracy on those. --live also runs the Gemini and hybrid
+rerankers (requires .env with GOOGLE_API_KEY).
+
+The local scorer uses MiniLM when sentence-transformers and the model weights are
+available (the production setup); the header line says which scoring ran. --no-embeddings
+forces lexical-only scoring for comparison.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.ai_service.config import RERANK_LOCAL_MARGIN, RERANK_LOCAL_MIN_SCORE
+from backend.ai_service.reranker_node import HybridReranker, LLMReranker, LocalReranker
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GOLDEN_CASES = os.path.join(PROJECT_ROOT, "poc", "kdg", "data", "poc_v5_golden_test_cases.json")
+MOCK_PRODUCTS = os.path.join(PROJECT_ROOT, "poc", "kdg", "data", "poc_v5_mock_product_db.json")
+TOP_K = 10  # candidates per run-dir case, as in rerank_benchmark_results.py
+
+
+# ─── Cases ───────────────────────────────────────────────────
+
+def golden_cases(seed: int = 0):
+    """[(case_id, scenario, query, candidates, gold_ids)] from the poc/kdg golden set."""
+    with open(MOCK_PRODUCTS, "r", encoding="utf-8") as f:
+        products = {str(p["id"]): p for p in json.load(f)}
+    with open(GOLDEN_CASES, "r", encoding="utf-8") as f:
+        raw_cases = json.load(f)
+
+    rng = random.Random(seed)
+    cases = []
+    for case in raw_cases:
+        hints = case["candidates_hint"]
+        gold = [str(g) for g in case.get("ground_truth_ids_hint", [])]
+        candidates, seen = [], set()
+        for idx, gid in enumerate(gold):
+            product = dict(products.get(gid, {"id": gid, "name": f"Target Product {gid}"}))
+            if idx < len(hints):  # the case defines what the ground-truth product is
+                product["name"] = hints[idx]
+                product["desc"] = f"Simulated product description for {hints[idx]}"
+                product.pop("searchable_desc", None)
+                product.pop("keywords", None)
+            candidates.append(product)
+            seen.add(str(product["id"]))
+        for n, hint in enumerate(hints[len(gold):]):
+            flat = hint.replace(" ", "").lower()
+            if any(flat in c["name"].replace(" ", "").lower() or c["name"].replace(" ", "").lower() in flat
+                   for c in candidates):
+                continue
+            real = next((p for p in products.values() if hint in p["name"]), None)
+            if real is not None and str(real["id"]) not in seen:
+                candidates.append(real)
+                seen.add(str(real["id"]))
+            elif real is None:
+                candidates.append({"id": f"NOISE_{case['id']}_{n}", "name": hint, "desc": f"Description for {hint}"})
+        rng.shuffle(candidates)
+        cases.append((case["id"], case["scenario_type"], case["query"], candidates, gold))
+    return cases
+
+
+def run_dir_cases(run_dir: str, catalog_path: str):
+    """Cases from an ivhl benchmark run (detail.jsonl) and its catalog TSV."""
+    catalog = {}
+    with open(catalog_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or line.lower().startswith(("doc_id", "id")):
+                continue
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 3:
+                catalog[parts[0]] = {"id": parts[0], "name": parts[1], "desc": parts[2],
+                                     "category_major": parts[3] if len(parts) > 3 else ""}
+
+    cases = []
+    with open(os.path.join(run_dir, "detail.jsonl"), "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            if "case_id" not in case or case.get("status") != "EVAL":
+                continue
+            query = case.get("intent_text", "") or case.get("raw_text", "")
+            candidates = [catalog.get(d, {"id": d, "name": "Unknown", "desc": ""})
+                          for d in case.get("predicted_doc_ids", [])[:TOP_K]]
+            cases.append((case["case_id"], case.get("expected_category") or "-", query, candidates,
+                          [str(d) for d in case.get("expected_doc_ids") or []]))
+    return cases
+
+
+# ─── Scoring ─────────────────────────────────────────────────
+
+def _passed(selected, gold) -> bool:
+    return (selected is None and not gold) or (selected is not None and str(selected) in gold)
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def evaluate(name, reranker, cases):
+    correct, latencies, decisive, decisive_ok = 0, [], 0, 0
+    by_scenario = defaultdict(lambda: [0, 0])
+    for _, scenario, query, candidates, gold in cases:
+        start = time.perf_counter()
+        result = await reranker.rerank(query, candidates)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ok = _passed(result.get("selected_id"), gold)
+        correct += ok
+        by_scenario[scenario][0] += ok
+        by_scenario[scenario][1] += 1
+        if result.get("decisive"):
+            decisive += 1
+            decisive_ok += ok
+    n = len(cases)
+    return {
+        "reranker": name,
+        "acc": correct / n if n else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": _percentile(latencies, 0.95) if latencies else 0.0,
+        "decisive": decisive / n if n else 0.0,
+        "decisive_acc": decisive_ok / decisive if decisive else 0.0,
+        "by_scenario": dict(by_scenario),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local reranker against Gemini")
+    parser.add_argument("--run-dir", help="ivhl run directory containing detail.jsonl")
+    parser.add_argument("--catalog", help="catalog TSV of that run")
+    parser.add_argument("--min-score", type=float, default=RERANK_LOCAL_MIN_SCORE)
+    parser.add_argument("--margin", type=float, default=RERANK_LOCAL_MARGIN)
+    parser.add_argument("--no-embeddings", action="store_true", help="lexical scores only")
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--scenarios", action="store_true", help="per-scenario accuracy")
+    args = parser.parse_args()
+
+    cases = run_dir_cases(args.run_dir, args.catalog) if args.run_dir else golden_cases()
+    local = LocalReranker(args.min_score, args.margin, use_embeddings=not args.no_embeddings)
+    scoring = "MiniLM + lexical" if local.load() else "lexical only"
+    rerankers = [("local", local)]
+    if args.live:
+        rerankers += [("gemini", LLMReranker()), ("hybrid", HybridReranker(local, LLMReranker()))]
+
+    async def run():
+        return [await evaluate(name, reranker, cases) for name, reranker in rerankers]
+
+    results = asyncio.run(run())
+    print(f"\n{len(cases)} cases, {scoring}, min_score={args.min_score}, margin={args.margin}")
+    print(f"{'reranker':<10} {'acc':>6} {'p50 ms':>8} {'p95 ms':>8} {'decisive':>9} {'decisive acc':>13}")
+    for r in results:
+        print(f"{r['reranker']:<10} {r['acc']:>6.0%} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+              f"{r['decisive']:>9.0%} {r['decisive_acc']:>13.0%}")
+    if args.scenarios:
+        for r in results:
+            print(f"\n[{r['reranker']}]")
+            for scenario, (ok, total) in sorted(r["by_scenario"].items(), key=lambda x: -x[1][1]):
+                print(f"  {scenario:<20} {ok}/{total}")
+
+
+if __name__ == "__main__":
+    main()
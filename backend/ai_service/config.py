@@ -3,14 +3,25 @@
 Shared configuration for AI Service Layer.
 - Gemini API initialization (singleton)
 - Model constants
+- Model registry (one GenerativeModel per pipeline call, with concurrency limit and timeout)
+- Per-request latency budget (deadline) and hedged duplicate requests
+- Degraded-answer tracking (fallbacks taken while a node runs)
 - Debug logging utility
 """
 
 import os
+import asyncio
 import datetime
+import time
 import warnings
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from .schemas import NLU_RESPONSE_SCHEMA, MERGED_RESPONSE_SCHEMA
+
 # Suppress google.generativeai deprecation warning
 # TODO: Migrate to google.genai SDK (requires API surface change in all nodes)
 warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
@@ -20,6 +31,52 @@ load_dotenv()
 # ─── Constants ───────────────────────────────────────────────
 MODEL_NAME = "gemini-2.0-flash"
 
+# Lexical search backend for _bm25_search: "memory" (in-process BM25 index) | "fts5" (SQLite products_fts)
+LEXICAL_BACKEND = os.getenv("LEXICAL_BACKEND", "memory").lower()
+
+# /api/query response cache (response_cache.py): max entries (0 = off), TTL in seconds,
+# and the MiniLM cosine similarity for near-duplicate hits (0 = exact matches only, the default)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "512"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "600"))
+QUERY_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("QUERY_CACHE_SEMANTIC_THRESHOLD", "0"))
+
+# Run the intent gate and NLU concurrently and start keyword expansion from the streamed
+# item slot (intent_keyword_node._run_speculative); "0" = strictly sequential calls
+SPECULATIVE_NLU = os.getenv("SPECULATIVE_NLU", "1") == "1"
+
+# Dictionary fast path for simple product lookups (fast_nlu.py): the NLU call is skipped
+# when the utterance is "<catalog noun> 어디 있어?"-shaped (the intent gate still runs);
+# "0" = always call the Gemini NLU
+FAST_PATH_NLU = os.getenv("FAST_PATH_NLU", "1") == "1"
+
+# Intent & Keyword node: "staged" (gate, NLU, expansion calls) | "merged" (one structured call)
+INTENT_PIPELINE_MODE = os.getenv("INTENT_PIPELINE_MODE", "staged").lower()
+
+# /api/query latency budget in seconds (PipelineState["deadline"]); 0 = unbounded.
+# Stages that would overrun it fall back to local answers (no expansion, lexical rerank,
+# template clarification question).
+QUERY_LATENCY_BUDGET = float(os.getenv("QUERY_LATENCY_BUDGET", "8"))
+
+# Local Intent Gate classifier (intent_classifier.py); empty path (default) = Gemini gate only.
+# Only "Y" predictions with p >= the threshold are answered locally; "N" and low-confidence
+# predictions go to Gemini. Off by default: benchmark_intent_gate puts hybrid@0.7 at 92%
+# accuracy against 97% for Gemini alone, and a wrong local "N" rejects a real shopper.
+INTENT_CLASSIFIER_PATH = os.getenv("INTENT_CLASSIFIER_PATH", "")
+INTENT_CLASSIFIER_THRESHOLD = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.7"))
+
+# Reranker (reranker_node.py): "llm" (Gemini for every query) | "local" (lexical / MiniLM
+# scores only) | "hybrid" (local pick when its lead is decisive, Gemini otherwise).
+# A local pick needs score >= RERANK_LOCAL_MIN_SCORE and a lead of RERANK_LOCAL_MARGIN over the runner-up.
+# "llm" stays the default until benchmark_reranker has been run with MiniLM loaded.
+RERANKER = os.getenv("RERANKER", "llm").lower()
+RERANK_LOCAL_MIN_SCORE = float(os.getenv("RERANK_LOCAL_MIN_SCORE", "0.6"))
+RERANK_LOCAL_MARGIN = float(os.getenv("RERANK_LOCAL_MARGIN", "0.2"))
+
+# Persistent memo of keyword expansion / inference outputs (memo_store.py); empty = off
+LLM_MEMO_PATH = os.getenv(
+    "LLM_MEMO_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_memo.db")
+)
+
 # ─── Gemini Singleton ────────────────────────────────────────
 _genai = None
 
@@ -43,6 +100,213 @@ def get_genai():
     return _genai
 
 
+# ─── Model Registry ──────────────────────────────────────────
+# Defaults for every model; per model overridable with LLM_TIMEOUT_<NAME> / LLM_CONCURRENCY_<NAME>
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "10"))         # seconds per call
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))    # in-flight calls per model
+
+# Hedging: a duplicate request is sent when the first one is slower than the model's
+# observed LLM_HEDGE_QUANTILE latency (needs LLM_HEDGE_MIN_SAMPLES calls); "0" = off
+LLM_HEDGE = os.getenv("LLM_HEDGE", "1") == "1"
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_LATENCY_WINDOW = 200  # recent latencies kept per model
+
+_JSON = {"response_mime_type": "application/json"}
+
+# reserve: seconds of the request budget left for the stages after this call
+MODEL_CONFIGS = {
+    "intent_gate": {"generation_config": {"temperature": 0.0, "max_output_tokens": 5}, "timeout": 3.0,
+                    "reserve": 1.0},
+    "nlu": {"generation_config": {**_JSON, "response_schema": NLU_RESPONSE_SCHEMA,
+                                  "temperature": 0.0, "max_output_tokens": 256}, "timeout": 8.0,
+            "reserve": 1.0},
+    "merged": {"generation_config": {**_JSON, "response_schema": MERGED_RESPONSE_SCHEMA,
+                                     "temperature": 0.0, "max_output_tokens": 384}, "timeout": 8.0,
+               "reserve": 1.0},
+    "expansion": {"generation_config": _JSON, "timeout": 5.0, "reserve": 1.0},
+    "inference": {"generation_config": _JSON, "timeout": 5.0, "reserve": 0.5},
+    "rerank": {"generation_config": _JSON, "reserve": 0.2},
+    "clarification": {"generation_config": {}, "timeout": 6.0, "reserve": 0.1},
+}
+MIN_CALL_TIME = 0.3  # below this much budget a call is not attempted
+
+
+def new_deadline(budget: float = QUERY_LATENCY_BUDGET) -> Optional[float]:
+    """Deadline (time.monotonic) for a request started now; None when unbounded."""
+    return time.monotonic() + budget if budget > 0 else None
+
+
+def budget_left(deadline: Optional[float]) -> float:
+    """Seconds until the deadline (inf without one)."""
+    return float("inf") if deadline is None else deadline - time.monotonic()
+
+
+# ─── Degraded Answers ────────────────────────────────────────
+# A node runs inside track_fallbacks(); every local fallback it takes (failed/timed-out LLM
+# call) calls mark_degraded(). Nodes report it as PipelineState["degraded"] and such
+# responses are not put in the response cache.
+_fallbacks: ContextVar[Optional[List[str]]] = ContextVar("fallbacks", default=None)
+
+
+@contextmanager
+def track_fallbacks():
+    """Collects the mark_degraded() reasons of the block (tasks it starts share the list)."""
+    reasons: List[str] = []
+    token = _fallbacks.set(reasons)
+    try:
+        yield reasons
+    finally:
+        _fallbacks.reset(token)
+
+
+def mark_degraded(reason: str):
+    reasons = _fallbacks.get()
+    if reasons is not None:
+        reasons.append(reason)
+
+
+class LLMModel:
+    """
+    A configured GenerativeModel built once and shared by all requests (its client, and
+    with it the connection, stays open), behind a per-model semaphore and timeout.
+    A call is capped by both the model timeout and the request deadline minus `reserve`;
+    running out raises asyncio.TimeoutError into the caller's fallback. Calls slower than
+    the model's p95 get one hedged duplicate, and the first answer wins.
+    """
+
+    def __init__(self, name: str, generation_config: Dict, timeout: Optional[float] = None,
+                 concurrency: Optional[int] = None, reserve: float = 0.0):
+        key = name.upper()
+        self.name = name
+        self.generation_config = generation_config
+        self.timeout = float(os.getenv(f"LLM_TIMEOUT_{key}", timeout or LLM_TIMEOUT))
+        self.concurrency = int(os.getenv(f"LLM_CONCURRENCY_{key}", concurrency or LLM_CONCURRENCY))
+        self.reserve = reserve
+        self._model = None
+        self._sem = None
+        self._sem_loop = None
+        self._latencies = deque(maxlen=LLM_LATENCY_WINDOW)
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "timeouts": 0, "skipped": 0}
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_genai().GenerativeModel(MODEL_NAME, generation_config=self.generation_config)
+        return self._model
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem, self._sem_loop = asyncio.Semaphore(self.concurrency), loop
+        return self._sem
+
+    def call_timeout(self, deadline: Optional[float] = None) -> float:
+        """Time this call may take; raises asyncio.TimeoutError if the budget is already spent."""
+        timeout = min(self.timeout, budget_left(deadline) - self.reserve)
+        if timeout < MIN_CALL_TIME:
+            self.stats["skipped"] += 1
+            raise asyncio.TimeoutError(f"{self.name}: latency budget exhausted")
+        return timeout
+
+    def hedge_delay(self) -> Optional[float]:
+        """p95 (LLM_HEDGE_QUANTILE) of recent latencies, or None while there are too few."""
+        if not LLM_HEDGE or len(self._latencies) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(LLM_HEDGE_QUANTILE * len(ordered)))]
+
+    async def generate(self, contents, deadline: Optional[float] = None):
+        timeout = self.call_timeout(deadline)
+        self.stats["calls"] += 1
+        delay = self.hedge_delay()
+        call = self._call(contents) if delay is None or delay >= timeout else self._hedged(contents, delay)
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
+    async def _call(self, contents):
+        async with self._semaphore():
+            start = time.monotonic()
+            try:
+                response = await self.model.generate_content_async(contents)
+            except asyncio.CancelledError:
+                # Lost a hedge race or timed out: the elapsed time is a lower bound of its latency
+                self._latencies.append(time.monotonic() - start)
+                raise
+            self._latencies.append(time.monotonic() - start)
+            return response
+
+    async def _hedged(self, contents, delay: float):
+        primary = asyncio.ensure_future(self._call(contents))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and not self._semaphore().locked():
+                self.stats["hedged"] += 1
+                tasks.add(asyncio.ensure_future(self._call(contents)))
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+            raise done.pop().exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(self, contents, deadline: Optional[float] = None):
+        """Yield response chunks; the timeout bounds the whole stream (not hedged)."""
+        timeout = self.call_timeout(deadline)
+        self.stats["calls"] += 1
+        async with self._semaphore():
+            end = time.monotonic() + timeout
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(contents, stream=True), timeout
+                )
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), max(end - time.monotonic(), 0.001))
+                    except StopAsyncIteration:
+                        return
+                    yield chunk
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise
+
+    def report(self) -> Dict:
+        return {**self.stats, "timeout": self.timeout, "hedge_delay": self.hedge_delay()}
+
+
+_models: Dict[str, LLMModel] = {}
+
+
+def get_model(name: str) -> LLMModel:
+    """Registry lookup; the model is built on first use and reused afterwards."""
+    model = _models.get(name)
+    if model is None:
+        model = _models[name] = LLMModel(name, **MODEL_CONFIGS[name])
+    return model
+
+
+def build_models():
+    """Build every configured model up front (e.g. at API startup)."""
+    for name in MODEL_CONFIGS:
+        get_model(name).model
+    return _models
+
+
+def model_report() -> Dict[str, Dict]:
+    """Call / hedge / timeout counters of the models used so far."""
+    return {name: model.report() for name, model in _models.items()}
+
+
 # ─── Logging ─────────────────────────────────────────────────
 _LOG_FILE = "ai_service_debug.log"
 
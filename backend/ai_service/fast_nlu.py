@@ -0,0 +1,324 @@
+# backend/ai_service/fast_nlu.py
+"""
+Fast-path NLU for simple product lookups ("<상품명> 어디 있어?"), no LLM call.
+It replaces the NLU step only; intent_keyword_node still runs the intent gate on every hit.
+
+    price        "5000원 이하", "5천원 이상"                       → max_price / min_price
+                 "1000원짜리"                                      → max_price (not an exact price)
+    lookup tail  "어디 있어(요)", "어딨어", "찾아줘", "재고 있어?", ...  (stripped)
+    core         segmented with one Aho–Corasick automaton over
+                   - CATEGORIES keywords (category_matcher.py)       → category_hint = major
+                   - words of catalog product names                   → no category hint
+                   - attribute words (colors, sizes)                  → attrs
+
+The result is confident only when the whole core is covered by dictionary words, with
+one contiguous run of item words (max 3); with a lookup tail, one unknown leading word
+is accepted as a modifier of the item ("충전 케이블 찾아줘"). Anything else (unknown words, facilities,
+refunds, two items, ...) returns None and _analyze_text (Gemini) runs as before. The
+automaton is rebuilt when the catalog snapshot version changes.
+
+Usage:
+    python -m backend.ai_service.fast_nlu     # fast-path coverage on the PoC utterances
+"""
+
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from collections import defaultdict, deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.database.catalog import on_catalog_reload
+
+from .config import log_debug
+from .response_cache import normalize_query
+from .schemas import Intent, NLUSlots, NLUResponse
+
+FAST_PATH_MODEL = "fast-path"
+MAX_ITEM_WORDS = 3
+
+ITEM, ATTR = "item", "attr"
+
+ATTR_WORDS = {
+    "빨간", "빨간색", "빨강", "파란", "파란색", "파랑", "노란", "노란색", "노랑", "초록", "초록색",
+    "검은", "검은색", "검정", "검정색", "하얀", "하얀색", "흰", "흰색", "분홍", "분홍색", "핑크",
+    "회색", "그레이", "베이지", "아이보리", "화이트", "블랙", "투명", "투명한",
+    "큰", "작은", "대형", "중형", "소형", "미니", "대용량", "긴", "짧은", "두꺼운", "얇은",
+}
+
+# Not product lookups: facility / policy questions go to the full NLU (OTHER_INQUIRY)
+NON_PRODUCT_WORDS = (
+    "화장실", "계산대", "입구", "출구", "엘리베이터", "에스컬레이터", "주차", "직원", "카운터",
+    "배달", "교환", "환불", "반품", "영업시간", "포인트", "영수증", "멤버십", "와이파이",
+)
+
+_FILLERS = {"혹시", "저기요", "저기", "저", "음", "그", "여기", "그럼", "좀", "다이소"}
+
+_LOOKUP_TAIL = re.compile(
+    r"(어디에?있(어요?|나요|니|습니까|을까요?|지|는지)|어딨(어요?|나요|니)|어디(야|예요|에요|임|인가요|에)?"
+    r"|위치(가|는)?(어디(야|예요|에요)?|알려줘|알려주세요)?|(파는곳|코너|매대)(은|는|이|가)?(어디(야|예요|에요)?|알려줘|알려주세요)?"
+    r"|찾아(줘|주세요|요)|찾고있(어요?|는데)|찾는데|(재고)?(가|는)?(남아)?있(어요?|나요|니|습니까|을까요?)"
+    r"|팔아(요)?|파나요|주세요|사려고(하는데|해요)?)$"
+)
+_PARTICLE = re.compile(r"(은|는|이|가|을|를|도)$")
+
+_WON = r"(?:원|₩)?"
+_PRICE_PATTERNS = [
+    # (regex, slots to set); amount in group "n", unit multiplier in group "u"
+    (re.compile(rf"(?P<n>\d+)\s*(?P<u>천|만)?\s*{_WON}\s*(이하|이내|까지|아래|미만|보다\s*싼)"), ("max_price",)),
+    (re.compile(rf"(?P<n>\d+)\s*(?P<u>천|만)?\s*{_WON}\s*(이상|넘는|초과|부터|보다\s*비싼)"), ("min_price",)),
+    # "N원짜리" means about N: an upper bound keeps the cheaper items a shopper also means
+    (re.compile(rf"(?P<n>\d+)\s*(?P<u>천|만)?\s*{_WON}\s*짜리"), ("max_price",)),
+]
+_UNIT = {None: 1, "천": 1000, "만": 10000}
+
+
+# ─── Aho–Corasick Automaton ──────────────────────────────────
+
+class AhoCorasick:
+    """Multi-pattern matcher: every dictionary occurrence in one pass over the text."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+    def add(self, word: str):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if word not in self._out[node]:
+            self._out[node].append(word)
+
+    def build(self) -> "AhoCorasick":
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        return self
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, word) for every match."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for word in self._out[node]:
+                yield i + 1 - len(word), i + 1, word
+
+
+# ─── Fast-path Analyzer ──────────────────────────────────────
+
+def _name_words(name: str) -> List[str]:
+    """Dictionary words of a product name: 2+ letters, no digits ("뚜껑수납함(약17*17 cm)" → 뚜껑수납함)."""
+    return [w for w in re.findall(r"[가-힣a-z]+", normalize_query(name)) if len(w) >= 2]
+
+
+class FastPathNLU:
+    """Deterministic analyzer; analyze() returns an NLUResponse or None (not confident)."""
+
+    def __init__(self, products: List[Dict], categories: Dict[str, Dict[str, List[str]]], version=None):
+        self.version = version
+        self.lexicon: Dict[str, Tuple[str, Optional[str]]] = {}  # word -> (kind, category major)
+
+        # Name words carry no category hint: a word's products often span several majors
+        # ("부탄가스", "방향제"), and a wrong hint steers the search away from the item
+        for p in products:
+            for w in _name_words(p.get("name", "")):
+                if w not in ATTR_WORDS:
+                    self.lexicon[w] = (ITEM, None)
+
+        for major, middles in categories.items():  # only the keyword table sets category hints
+            for middle, keywords in middles.items():
+                for kw in [middle, *keywords]:
+                    kw = normalize_query(kw).replace(" ", "")
+                    if len(kw) >= 2 and "/" not in kw:
+                        self.lexicon[kw] = (ITEM, major)
+        for w in ATTR_WORDS:
+            self.lexicon[w] = (ATTR, None)
+
+        self.automaton = AhoCorasick()
+        for w in self.lexicon:
+            self.automaton.add(w)
+        self.automaton.build()
+
+    def terms(self, text: str) -> frozenset:
+        """
+        Dictionary words of the utterance (longest matches only) plus latin tokens:
+        "빨간색 볼펜" → {빨간색, 볼펜}, "건전지 aaa" → {건전지, aaa}. Used by the response cache
+        so that a semantic hit names the same products and attributes.
+        """
+        norm = normalize_query(text)
+        flat = norm.replace(" ", "")
+        matches = list(self.automaton.iter(flat))
+        found = {w for s, e, w in matches
+                 if not any(s2 <= s and e <= e2 and (s2, e2) != (s, e) for s2, e2, _ in matches)}
+        return frozenset(found | set(re.findall(r"[a-z]+", norm)))
+
+    def analyze(self, text: str) -> Optional[NLUResponse]:
+        start_time = time.time()
+        raw = unicodedata.normalize("NFKC", text or "")
+        raw = re.sub(r"(?<=\d),(?=\d{3})", "", raw)  # 5,000원 → 5000원
+
+        slots: Dict = {"attrs": []}
+        for pattern, keys in _PRICE_PATTERNS:
+            match = pattern.search(raw)
+            if match:
+                amount = int(match.group("n")) * _UNIT[match.group("u")]
+                for key in keys:
+                    slots[key] = amount
+                slots["attrs"].append(re.sub(r"\s+", " ", match.group(0)).strip())
+                raw = raw[:match.start()] + " " + raw[match.end():]
+
+        words = [w for w in normalize_query(raw).split() if w not in _FILLERS]
+        norm = " ".join(words)
+        if not norm or any(w in norm.replace(" ", "") for w in NON_PRODUCT_WORDS):
+            return None
+
+        # Spaceless view (STT output is often unspaced) with offsets back into `norm`
+        pos = [i for i, ch in enumerate(norm) if ch != " "]
+        flat = norm.replace(" ", "")
+        tail = _LOOKUP_TAIL.search(flat)
+        core_end = tail.start() if tail else len(flat)
+
+        segments = self._segment_core(flat, 0, core_end)
+        if segments is None and tail and " " in norm[:pos[core_end - 1] + 1 if core_end else 0]:
+            # "<unknown modifier> <known item ...>": the first word joins the item run
+            first_end = len(norm.split(" ", 1)[0])
+            rest = self._segment_core(flat, first_end, core_end)
+            modifier = flat[:first_end]
+            if (rest and rest[0][2] == ITEM and re.fullmatch(r"[가-힣a-z]{2,5}", modifier)
+                    and next(self.automaton.iter(modifier), None) is None):  # "볼펜이랑 노트" is two items
+                segments = [(0, first_end, ITEM)] + rest
+        if segments is None:
+            return None
+
+        item_runs = [i for i, (_, _, kind) in enumerate(segments) if kind == ITEM]
+        if not item_runs or item_runs[-1] - item_runs[0] + 1 != len(item_runs) or len(item_runs) > MAX_ITEM_WORDS:
+            return None  # no item, two separate items, or too long a phrase
+
+        first, last = segments[item_runs[0]], segments[item_runs[-1]]
+        item = norm[pos[first[0]]:pos[last[1] - 1] + 1]
+        attrs = [norm[pos[s]:pos[e - 1] + 1] for s, e, kind in segments if kind == ATTR]
+        head = flat[last[0]:last[1]]
+
+        slots["attrs"] = attrs + slots["attrs"]
+        return NLUResponse(
+            request_id=str(uuid.uuid4())[:8],
+            intent=Intent.PRODUCT_LOCATION,
+            slots=NLUSlots(
+                item=item,
+                attrs=slots["attrs"],
+                category_hint=self.lexicon[head][1],
+                query_rewrite=" ".join(attrs + [item]),
+                min_price=slots.get("min_price"),
+                max_price=slots.get("max_price"),
+            ),
+            needs_clarification=False,
+            model_name=FAST_PATH_MODEL,
+            latency_ms=int((time.time() - start_time) * 1000),
+        )
+
+    def _segment_core(self, flat: str, start: int, end: int) -> Optional[List[Tuple[int, int, str]]]:
+        """_segment, retried without a trailing particle ("볼펜은", "그릇을")."""
+        segments = self._segment(flat, start, end)
+        if segments is None:
+            match = _PARTICLE.search(flat[start:end])
+            segments = self._segment(flat, start, start + match.start()) if match else None
+        return segments
+
+    def _segment(self, flat: str, start: int, end: int) -> Optional[List[Tuple[int, int, str]]]:
+        """Fewest dictionary words covering flat[start:end] exactly, or None."""
+        if end <= start:
+            return None
+        ending_at: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+        for s, e, word in self.automaton.iter(flat[start:end]):
+            ending_at[start + e].append((start + s, word))
+
+        best: Dict[int, Tuple[int, int, str]] = {start: (0, start, "")}  # end -> (pieces, start, word)
+        for e in range(start + 1, end + 1):
+            for s, word in ending_at.get(e, ()):
+                if s in best and (e not in best or best[s][0] + 1 < best[e][0]):
+                    best[e] = (best[s][0] + 1, s, word)
+        if end not in best:
+            return None
+
+        segments, e = [], end
+        while e > start:
+            _, s, word = best[e]
+            segments.append((s, e, self.lexicon[word][0]))
+            e = s
+        return segments[::-1]
+
+
+# ─── Analyzer Holder ─────────────────────────────────────────
+_analyzer: Optional[FastPathNLU] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_fast_nlu() -> Optional[FastPathNLU]:
+    """Process-wide analyzer, rebuilt when the catalog snapshot version changes (None on failure)."""
+    global _analyzer
+    try:
+        from backend.database.catalog import get_catalog
+        from backend.database.category_matcher import CATEGORIES
+
+        catalog = get_catalog()
+        if _analyzer is None or _analyzer.version < catalog.version:
+            with _analyzer_lock:
+                if _analyzer is None or _analyzer.version < catalog.version:
+                    _analyzer = FastPathNLU(catalog.to_dicts(), CATEGORIES, version=catalog.version)
+                    log_debug(f"[Fast NLU] Built dictionary: {len(_analyzer.lexicon)} words")
+    except Exception as e:
+        log_debug(f"[Fast NLU] Unavailable: {e}")
+        return None
+    return _analyzer
+
+
+def _rebuild_on_reload(catalog):
+    """Catalog refresher thread: rebuild a dictionary in use before the new snapshot goes live."""
+    global _analyzer
+    if _analyzer is None:
+        return
+    from backend.database.category_matcher import CATEGORIES
+
+    analyzer = FastPathNLU(catalog.to_dicts(), CATEGORIES, version=catalog.version)
+    with _analyzer_lock:
+        _analyzer = analyzer
+    log_debug(f"[Fast NLU] Rebuilt dictionary for catalog v{catalog.version}: {len(analyzer.lexicon)} words")
+
+
+on_catalog_reload(_rebuild_on_reload)
+
+
+if __name__ == "__main__":
+    from backend.ai_service.intent_classifier import CSV_LABEL, CSV_TEXT, load_gate_csv, load_training_data
+    from backend.ai_service.test_pipeline import NLU_CASES
+
+    analyzer = get_fast_nlu()
+    gate_y = [r[CSV_TEXT] for r in load_gate_csv() if r[CSV_LABEL] == "Y"]
+    questions = load_training_data(csv_path="")[0]
+    for name, texts in (("gate sheet (Y)", gate_y), ("kiosk questions", questions)):
+        hits = [t for t in texts if analyzer.analyze(t) is not None]
+        print(f"{name:<16} fast path {len(hits)}/{len(texts)} ({len(hits) / max(1, len(texts)):.0%})")
+
+    print("\nNLU cases (fast path → item; '-' = Gemini):")
+    for text, intent, item in NLU_CASES:
+        result = analyzer.analyze(text)
+        ok = result is None or (result.intent.value == intent and (item is None or item in (result.slots.item or "")))
+        print(f"  {'[PASS]' if ok else '[FAIL]'} '{text}' → {result.slots.item if result else '-'}")
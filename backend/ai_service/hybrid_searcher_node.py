@@ -3,7 +3,8 @@
 Pipeline Node 2: Hybrid Searcher (BM25 + Vector)
 
 Strategy: BM25 is primary (exact keyword match), Vector is supplementary (semantic expansion)
-BM25: SQLite flexible search (AND → OR → single-term fallback)  
+BM25: In-process inverted index over syllable n-grams (backend.database.lexical_index),
+      or SQLite FTS5 trigram index with bm25() ranking when LEXICAL_BACKEND=fts5
 Vector: ChromaDB cosine similarity (supplementary, no distance filter)
 Fusion: Reciprocal Rank Fusion (RRF) with k=60
 
@@ -12,17 +13,21 @@ Architecture: Supervisor → Intent & Keyword → [Hybrid Searcher] → LLM Re-r
 
 from typing import List, Dict
 
-from .config import log_debug
+from .config import log_debug, track_fallbacks, LEXICAL_BACKEND
 from .schemas import PipelineState, Intent
 
 
 # ─── Search Adapters ─────────────────────────────────────────
 
-def _bm25_search(query: str) -> List[Dict]:
-    """BM25-like search: SQLite flexible query (AND → OR → single-term)."""
+def _bm25_search(query: str, top_k: int = 50) -> List[Dict]:
+    """BM25 search: ranked in-memory index (n-gram terms match compounds in one pass) or FTS5."""
     try:
-        from backend.database.database import search_products_flexible
-        results = search_products_flexible(query)
+        if LEXICAL_BACKEND == "fts5":
+            from backend.database.database import search_products_fts
+            results = search_products_fts(query, limit=top_k)
+        else:
+            from backend.database.lexical_index import get_lexical_index
+            results = get_lexical_index().search(query, limit=top_k)
         log_debug(f"[BM25] '{query}' → {len(results)} results")
         return results if results else []
     except ImportError:
@@ -30,6 +35,14 @@ def _bm25_search(query: str) -> List[Dict]:
         return []
 
 
+async def _bm25_search_async(query: str, top_k: int = 50) -> List[Dict]:
+    """Run _bm25_search without blocking the event loop (FTS5 hits SQLite, the memory index does not)."""
+    if LEXICAL_BACKEND == "fts5":
+        from backend.database.database import run_db
+        return await run_db(_bm25_search, query, top_k)
+    return _bm25_search(query, top_k)
+
+
 def _vector_search(query: str, top_k: int = 10) -> List[Dict]:
     """Dense vector search: ChromaDB cosine similarity (supplementary)."""
     try:
@@ -108,10 +121,11 @@ async def hybrid_search_node(state: PipelineState) -> dict:
     log_debug(f"--- [Node: Hybrid Search] item='{item_name}' / rewrite='{query_rewrite[:60]}' ---")
 
     candidates = []
+    degraded = state.get("degraded", False)
 
     # Step 1: BM25 (item name) + Vector (query_rewrite) → RRF
     if item_name:
-        bm25_results = _bm25_search(item_name)
+        bm25_results = await _bm25_search_async(item_name)
         vector_results = _vector_search(query_rewrite, top_k=10)
         candidates = _hybrid_rrf(bm25_results, vector_results)
 
@@ -119,7 +133,7 @@ async def hybrid_search_node(state: PipelineState) -> dict:
     if not candidates and expanded_keywords:
         log_debug(f"    → Trying expanded: {expanded_keywords[:5]}")
         for kw in expanded_keywords:
-            kw_results = _bm25_search(kw)
+            kw_results = await _bm25_search_async(kw)
             if kw_results:
                 candidates.extend(kw_results)
                 break
@@ -127,17 +141,19 @@ async def hybrid_search_node(state: PipelineState) -> dict:
     # Step 3: query_rewrite in BM25 (flexible OR search)
     if not candidates and query_rewrite and query_rewrite != item_name:
         log_debug(f"    → Trying rewrite in BM25: '{query_rewrite}'")
-        candidates = _bm25_search(query_rewrite)
+        candidates = await _bm25_search_async(query_rewrite)
 
     # Step 4: LLM keyword inference
     if not candidates:
         log_debug(f"    → Last resort: LLM keyword inference...")
         try:
             from .intent_keyword_node import _infer_product_keywords
-            inferred = await _infer_product_keywords(state["input_text"])
+            with track_fallbacks() as fallbacks:
+                inferred = await _infer_product_keywords(state["input_text"], deadline=state.get("deadline"))
+            degraded = degraded or bool(fallbacks)
             log_debug(f"    → Inferred: {inferred}")
             for kw in inferred:
-                kw_results = _bm25_search(kw)
+                kw_results = await _bm25_search_async(kw)
                 if kw_results:
                     candidates.extend(kw_results)
                     break
@@ -162,4 +178,4 @@ async def hybrid_search_node(state: PipelineState) -> dict:
     })
 
     log_debug(f"    → Final: {len(unique)} unique candidates")
-    return {"search_candidates": unique}
+    return {"search_candidates": unique, "degraded": degraded}
@@ -0,0 +1,220 @@
+# backend/ai_service/intent_classifier.py
+"""
+Local Intent Gate classifier (Y = assistance needed / N = ignore), CPU only.
+
+    char n-gram TF-IDF (1-3, word-boundary aware)  ┐
+    catalog keyword hit (CATEGORIES keywords)      ┴→ LogisticRegression (class_weight=balanced)
+
+Korean kiosk utterances are short and heavily inflected ("어디 있어?", "어딨어요"), so
+character n-grams generalize better than word tokens and need no tokenizer. The labelled
+N set is small (50 utterances), so whether the utterance names a catalog keyword
+("건전지", "슬리퍼") is added as an explicit feature.
+_classify_intent answers a "Y" locally when its probability is >= INTENT_CLASSIFIER_THRESHOLD
+and sends everything else to Gemini: a wrong local "N" would reject a real shopper, while
+the Gemini gate fails open.
+
+Training data:
+    - poc/intent/daiso_poc_data.csv      utterance + [GT] Y/N (50 / 50)
+    - poc/kms/question_intention.json    in-store product questions (all Y)
+
+Train / refresh the model file:
+    python -m backend.ai_service.train_intent_classifier
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .config import INTENT_CLASSIFIER_PATH, log_debug
+from .response_cache import normalize_query
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_gate.joblib")
+POC_GATE_CSV = os.path.join(PROJECT_ROOT, "poc", "intent", "daiso_poc_data.csv")
+POC_QUESTIONS_JSON = os.path.join(PROJECT_ROOT, "poc", "kms", "question_intention.json")
+
+CSV_TEXT, CSV_LABEL = "사용자 발화 (Utterance)", "[GT] 정답"
+
+
+# ─── Training Data ───────────────────────────────────────────
+
+def load_gate_csv(path: str = POC_GATE_CSV) -> List[dict]:
+    """Rows of the gate PoC sheet (utterance, ground truth, recorded Gemini Flash prediction)."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return [r for r in csv.DictReader(f) if r.get(CSV_LABEL) in ("Y", "N")]
+
+
+def load_training_data(csv_path: str = POC_GATE_CSV,
+                       json_path: str = POC_QUESTIONS_JSON) -> Tuple[List[str], List[str]]:
+    """(texts, labels) from both PoC datasets; blank utterances are skipped."""
+    texts, labels = [], []
+    if os.path.exists(csv_path):
+        for row in load_gate_csv(csv_path):
+            if row[CSV_TEXT].strip():
+                texts.append(row[CSV_TEXT])
+                labels.append(row[CSV_LABEL])
+    if os.path.exists(json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                if item.get("question", "").strip():
+                    texts.append(item["question"])
+                    labels.append("Y")
+    return texts, labels
+
+
+# ─── Classifier ──────────────────────────────────────────────
+
+def catalog_keywords() -> List[str]:
+    """Category names and keywords (2+ chars) of backend/database/category_matcher.CATEGORIES."""
+    from backend.database.category_matcher import CATEGORIES
+
+    keywords = set()
+    for major, middles in CATEGORIES.items():
+        keywords.update(major.split("/"))
+        for middle, kws in middles.items():
+            keywords.update(middle.split("/"))
+            keywords.update(kws)
+    return sorted(k for k in keywords if len(k) >= 2)
+
+
+class CatalogKeywordFeature:
+    """Single feature: `weight` if the spaceless utterance contains a catalog keyword, else 0."""
+
+    def __init__(self, keywords: Optional[List[str]] = None, weight: float = 3.0):
+        self.keywords = keywords
+        self.weight = weight
+
+    def fit(self, texts, labels=None):
+        if self.keywords is None:
+            self.keywords = catalog_keywords()  # stored with the model file
+        return self
+
+    def transform(self, texts):
+        from scipy.sparse import csr_matrix
+
+        hits = [any(k in normalize_query(t).replace(" ", "") for k in self.keywords) for t in texts]
+        return csr_matrix(np.array(hits, dtype=np.float64).reshape(-1, 1) * self.weight)
+
+    def get_params(self, deep=True):
+        return {"keywords": self.keywords, "weight": self.weight}
+
+    def set_params(self, **params):
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
+
+
+def build_pipeline():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import FeatureUnion, Pipeline
+
+    return Pipeline([
+        ("features", FeatureUnion([
+            ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(1, 3), sublinear_tf=True,
+                                      preprocessor=normalize_query)),
+            ("catalog", CatalogKeywordFeature()),
+        ])),
+        ("clf", LogisticRegression(C=4.0, class_weight="balanced", max_iter=1000)),
+    ])
+
+
+class IntentClassifier:
+    """Fitted TF-IDF + logistic regression pipeline with a (label, confidence) API."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.labels = [str(label) for label in pipeline.classes_]
+
+    @classmethod
+    def train(cls, texts: List[str], labels: List[str]) -> "IntentClassifier":
+        pipeline = build_pipeline()
+        pipeline.fit(texts, labels)
+        return cls(pipeline)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """("Y" | "N", probability of that label). Blank input is N with full confidence."""
+        if not normalize_query(text):
+            return "N", 1.0
+        probs = self.pipeline.predict_proba([text])[0]
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    def save(self, path: str):
+        import joblib
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump(self.pipeline, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        import joblib
+        return cls(joblib.load(path))
+
+
+def answers_locally(label: str, confidence: float, threshold: float) -> bool:
+    """Whether the gate keeps a local prediction: confident "Y" only, "N" always escalates."""
+    return label == "Y" and confidence >= threshold
+
+
+def cross_val_predictions(rows: List[dict], extra_texts: List[str], extra_labels: List[str],
+                          folds: int = 5, seed: int = 0) -> List[Tuple[str, float]]:
+    """
+    Held-out (label, confidence) for every gate CSV row: stratified folds over the rows,
+    the extra (all-Y) questions are always in the training part.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    texts = [r[CSV_TEXT] for r in rows]
+    labels = [r[CSV_LABEL] for r in rows]
+    predictions: List[Optional[Tuple[str, float]]] = [None] * len(rows)
+    for train_idx, test_idx in StratifiedKFold(folds, shuffle=True, random_state=seed).split(texts, labels):
+        classifier = IntentClassifier.train(
+            [texts[i] for i in train_idx] + extra_texts, [labels[i] for i in train_idx] + extra_labels
+        )
+        for i in test_idx:
+            predictions[i] = classifier.predict(texts[i])
+    return predictions
+
+
+# ─── Classifier Holder ───────────────────────────────────────
+_classifier: Optional[IntentClassifier] = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """
+    Process-wide classifier (None when INTENT_CLASSIFIER_PATH is empty or scikit-learn is
+    missing). Loads the trained model file, or trains from the PoC data if it does not exist.
+    """
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                _classifier = _load_or_train()
+                _classifier_loaded = True
+    return _classifier
+
+
+def _load_or_train() -> Optional[IntentClassifier]:
+    if not INTENT_CLASSIFIER_PATH:
+        return None
+    try:
+        if os.path.exists(INTENT_CLASSIFIER_PATH):
+            classifier = IntentClassifier.load(INTENT_CLASSIFIER_PATH)
+            log_debug(f"[Intent Classifier] Loaded {INTENT_CLASSIFIER_PATH}")
+            return classifier
+        texts, labels = load_training_data()
+        if len(set(labels)) < 2:
+            log_debug("[Intent Classifier] No training data → LLM gate only")
+            return None
+        classifier = IntentClassifier.train(texts, labels)
+        log_debug(f"[Intent Classifier] Trained on {len(texts)} utterances (model file missing)")
+        return classifier
+    except Exception as e:
+        log_debug(f"[Intent Classifier] Unavailable: {e} → LLM gate only")
+        return None
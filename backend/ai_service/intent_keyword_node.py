@@ -2,53 +2,78 @@
 """
 Pipeline Node 1: Intent & Keyword
 - Step 1: Intent Gate (Y/N) — 응대 필요 여부 판별
+  (local classifier first, Gemini only for low-confidence utterances; see intent_classifier.py)
 - Step 2: NLU Analysis — intent, slots, needs_clarification
 - Step 3: Keyword Expansion — 검색 키워드 확장
+  (SPECULATIVE_NLU: Step 1 ∥ Step 2, Step 3 starts once the NLU item slot has streamed in)
+  (INTENT_PIPELINE_MODE=merged: Steps 1-3 in a single structured call)
+  (FAST_PATH_NLU: Step 2 answered from the catalog dictionary when confident, see fast_nlu.py;
+   Step 1 still gates the utterance, concurrently with Step 3)
+  Every call is bounded by the request deadline (PipelineState["deadline"]); expansion is
+  skipped when the budget is spent.
 
 Architecture: Supervisor → [Intent & Keyword] → Hybrid Searcher → LLM Re-ranker
 """
 
+import asyncio
 import json
+import re
 import time
 import uuid
-from typing import List, Dict, Any, Optional
-
-from .config import get_genai, MODEL_NAME, log_debug
+from typing import Callable, List, Dict, Any, Optional
+
+from .config import (
+    get_model,
+    MODEL_NAME,
+    SPECULATIVE_NLU,
+    INTENT_PIPELINE_MODE,
+    INTENT_CLASSIFIER_THRESHOLD,
+    FAST_PATH_NLU,
+    log_debug,
+    mark_degraded,
+    track_fallbacks,
+)
+from .fast_nlu import get_fast_nlu
+from .intent_classifier import answers_locally, get_intent_classifier
+from .memo_store import get_memo_store, EXPAND, INFER
 from .schemas import PipelineState, Intent, NLUSlots, NLUResponse
 from .prompts import (
     INTENT_GATE_PROMPT,
     NLU_SYSTEM_PROMPT,
     KEYWORD_EXPANSION_PROMPT,
     AUX_PROMPT_KEYWORDS,
+    MERGED_PIPELINE_PROMPT,
 )
 
 
 # ─── Intent Gate ─────────────────────────────────────────────
 
-async def _classify_intent(text: str) -> str:
+async def _classify_intent(text: str, deadline: Optional[float] = None) -> str:
     """
     Classify user utterance as Y (assistance needed) or N (ignore).
-    Uses Gemini 2.0 Flash with temperature=0.0 for deterministic output.
+    The local classifier answers a confident Y (p >= INTENT_CLASSIFIER_THRESHOLD); N and
+    low-confidence predictions go to Gemini 2.0 Flash with temperature=0.0 (registry model
+    "intent_gate"), which fails open.
     """
-    genai = get_genai()
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={
-            "temperature": 0.0,
-            "max_output_tokens": 5,
-        },
-    )
+    classifier = get_intent_classifier()
+    if classifier is not None:
+        label, confidence = classifier.predict(text)
+        if answers_locally(label, confidence, INTENT_CLASSIFIER_THRESHOLD):
+            log_debug(f"[Intent Gate] '{text}' → {label} (local, p={confidence:.2f})")
+            return label
+        log_debug(f"[Intent Gate] '{text}' → {label}? (local, p={confidence:.2f}) → escalating to LLM")
 
     prompt = f"{INTENT_GATE_PROMPT}\n\nUser Utterance: \"{text}\"\nOutput (Y or N):"
 
     try:
-        response = await model.generate_content_async(prompt)
+        response = await get_model("intent_gate").generate(prompt, deadline=deadline)
         raw = response.text.strip().upper()
         result = "Y" if raw.startswith("Y") else "N"
         log_debug(f"[Intent Gate] '{text}' → {result}")
         return result
     except Exception as e:
         log_debug(f"[Intent Gate] Error: {e} → defaulting to Y")
+        mark_degraded("intent_gate")
         return "Y"  # Fail-open: assume assistance needed
 
 
@@ -105,45 +130,13 @@ def _robust_json_parse(text: str) -> dict:
     raise json.JSONDecodeError("Cannot repair JSON", text, 0)
 
 
-async def _analyze_text(text: str, history: List[Dict] = None, max_retries: int = 2) -> NLUResponse:
-    """
-    Analyze text using Gemini with response_schema for structured JSON output.
-    Includes retry logic for intermittent JSON parse failures.
-    """
-    genai = get_genai()
-
-    response_schema = {
-        "type": "object",
-        "properties": {
-            "intent": {"type": "string", "enum": ["PRODUCT_LOCATION", "OTHER_INQUIRY", "UNSUPPORTED"]},
-            "slots": {
-                "type": "object",
-                "properties": {
-                    "item": {"type": "string", "nullable": True},
-                    "attrs": {"type": "array", "items": {"type": "string"}},
-                    "category_hint": {"type": "string", "nullable": True},
-                    "query_rewrite": {"type": "string", "nullable": True},
-                    "min_price": {"type": "integer", "nullable": True},
-                    "max_price": {"type": "integer", "nullable": True},
-                },
-            },
-            "needs_clarification": {"type": "boolean"},
-        },
-        "required": ["intent", "slots", "needs_clarification"],
-    }
+# Complete "item" string value in a partially streamed NLU JSON object
+_ITEM_SLOT = re.compile(r'"item"\s*:\s*"((?:[^"\\]|\\.)*)"')
 
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={
-            "response_mime_type": "application/json",
-            "response_schema": response_schema,
-            "temperature": 0.0,
-            "max_output_tokens": 256,
-        },
-    )
 
-    # Build conversation context
-    messages = [{"role": "user", "parts": [NLU_SYSTEM_PROMPT]}]
+def _build_messages(system_prompt: str, text: str, history: List[Dict] = None) -> List[Dict]:
+    """System prompt, the last 6 history turns, then the user text."""
+    messages = [{"role": "user", "parts": [system_prompt]}]
     messages.append({"role": "model", "parts": ["Understood. Send me the user query."]})
 
     if history:
@@ -154,6 +147,62 @@ async def _analyze_text(text: str, history: List[Dict] = None, max_retries: int
         messages.append({"role": "model", "parts": ["Context noted."]})
 
     messages.append({"role": "user", "parts": [text]})
+    return messages
+
+
+def _nlu_response(parsed: dict, request_id: str, latency_ms: int, response=None) -> NLUResponse:
+    """NLUResponse from the parsed structured output."""
+    # Extract token usage
+    token_usage = {}
+    if hasattr(response, "usage_metadata") and response.usage_metadata:
+        um = response.usage_metadata
+        token_usage = {
+            "prompt_tokens": getattr(um, "prompt_token_count", 0),
+            "completion_tokens": getattr(um, "candidates_token_count", 0),
+            "total_tokens": getattr(um, "total_token_count", 0),
+        }
+
+    slots_data = parsed.get("slots") or {}
+
+    # Safety: truncate query_rewrite to prevent hallucination bloat
+    qr = slots_data.get("query_rewrite")
+    if qr and len(qr) > 50:
+        qr = qr[:50].strip()
+        slots_data["query_rewrite"] = qr
+        log_debug(f"[NLU] query_rewrite truncated to 50 chars")
+
+    return NLUResponse(
+        request_id=request_id,
+        intent=Intent(parsed["intent"]),
+        slots=NLUSlots(
+            item=slots_data.get("item"),
+            attrs=slots_data.get("attrs", []),
+            category_hint=slots_data.get("category_hint"),
+            query_rewrite=slots_data.get("query_rewrite"),
+            min_price=slots_data.get("min_price"),
+            max_price=slots_data.get("max_price"),
+        ),
+        needs_clarification=parsed.get("needs_clarification", False),
+        model_name=MODEL_NAME,
+        latency_ms=latency_ms,
+        token_usage=token_usage,
+    )
+
+
+async def _analyze_text(text: str, history: List[Dict] = None, max_retries: int = 2,
+                        on_item: Optional[Callable[[str], None]] = None,
+                        deadline: Optional[float] = None) -> NLUResponse:
+    """
+    Analyze text using Gemini with response_schema for structured JSON output.
+    Includes retry logic for intermittent JSON parse failures (immediate, within the
+    deadline; a timeout is not retried).
+    With `on_item`, the response is streamed and on_item(item) is called as soon as the
+    item slot is complete (before the rest of the JSON arrives).
+    """
+    model = get_model("nlu")
+
+    # Build conversation context
+    messages = _build_messages(NLU_SYSTEM_PROMPT, text, history)
 
     request_id = str(uuid.uuid4())[:8]
 
@@ -161,60 +210,39 @@ async def _analyze_text(text: str, history: List[Dict] = None, max_retries: int
     for attempt in range(max_retries + 1):
         try:
             start_time = time.time()
-            response = await model.generate_content_async(messages)
+            if on_item is None:
+                response = await model.generate(messages, deadline=deadline)
+                raw = response.text
+            else:
+                response, raw, item_sent = None, "", False
+                async for chunk in model.stream(messages, deadline=deadline):
+                    response = chunk  # the last chunk carries the usage metadata
+                    raw += chunk.text
+                    match = None if item_sent else _ITEM_SLOT.search(raw)
+                    if match:
+                        item_sent = True
+                        on_item(json.loads(f'"{match.group(1)}"'))
             latency_ms = int((time.time() - start_time) * 1000)
 
             # Robust JSON parsing with repair
-            parsed = _robust_json_parse(response.text)
+            parsed = _robust_json_parse(raw)
             log_debug(f"[NLU] '{text}' → {parsed.get('intent')} | latency={latency_ms}ms" +
                       (f" (retry {attempt})" if attempt > 0 else ""))
 
-            # Extract token usage
-            token_usage = {}
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                um = response.usage_metadata
-                token_usage = {
-                    "prompt_tokens": getattr(um, "prompt_token_count", 0),
-                    "completion_tokens": getattr(um, "candidates_token_count", 0),
-                    "total_tokens": getattr(um, "total_token_count", 0),
-                }
-
-            slots_data = parsed.get("slots", {})
-
-            # Safety: truncate query_rewrite to prevent hallucination bloat
-            qr = slots_data.get("query_rewrite")
-            if qr and len(qr) > 50:
-                qr = qr[:50].strip()
-                slots_data["query_rewrite"] = qr
-                log_debug(f"[NLU] query_rewrite truncated to 50 chars")
-
-            return NLUResponse(
-                request_id=request_id,
-                intent=Intent(parsed["intent"]),
-                slots=NLUSlots(
-                    item=slots_data.get("item"),
-                    attrs=slots_data.get("attrs", []),
-                    category_hint=slots_data.get("category_hint"),
-                    query_rewrite=slots_data.get("query_rewrite"),
-                    min_price=slots_data.get("min_price"),
-                    max_price=slots_data.get("max_price"),
-                ),
-                needs_clarification=parsed.get("needs_clarification", False),
-                model_name=MODEL_NAME,
-                latency_ms=latency_ms,
-                token_usage=token_usage,
-            )
+            return _nlu_response(parsed, request_id, latency_ms, response)
 
+        except asyncio.TimeoutError as e:
+            log_debug(f"[NLU] Timed out on attempt {attempt + 1}: {e}")
+            break
         except Exception as e:
             last_error = e
             if attempt < max_retries:
                 log_debug(f"[NLU] Attempt {attempt + 1} failed: {e} → retrying...")
-                import asyncio
-                await asyncio.sleep(0.5)  # Brief pause before retry
             else:
                 log_debug(f"[NLU] All {max_retries + 1} attempts failed: {e}")
 
     # All retries exhausted — return safe fallback
+    mark_degraded("nlu")
     return NLUResponse(
         request_id=request_id,
         intent=Intent.UNSUPPORTED,
@@ -223,97 +251,236 @@ async def _analyze_text(text: str, history: List[Dict] = None, max_retries: int
     )
 
 
+# ─── Merged Call (Gate + NLU + Expansion) ────────────────────
+
+async def _analyze_merged(text: str, history: List[Dict] = None, deadline: Optional[float] = None):
+    """
+    One structured Gemini call for intent gate, NLU and keyword expansion.
+    Returns (intent_valid, NLUResponse, expanded_keywords); raises on failure so the
+    caller can fall back to the staged calls.
+    """
+    start_time = time.time()
+    response = await get_model("merged").generate(
+        _build_messages(MERGED_PIPELINE_PROMPT, text, history), deadline=deadline
+    )
+    latency_ms = int((time.time() - start_time) * 1000)
+
+    parsed = _robust_json_parse(response.text)
+    intent_valid = "N" if str(parsed.get("intent_valid", "Y")).upper().startswith("N") else "Y"
+    nlu_result = _nlu_response(parsed, str(uuid.uuid4())[:8], latency_ms, response)
+    expanded = [k for k in parsed.get("expanded_keywords") or [] if isinstance(k, str) and k]
+    log_debug(f"[Merged] '{text}' → {intent_valid} / {nlu_result.intent} / {expanded} | latency={latency_ms}ms")
+    return intent_valid, nlu_result, expanded
+
+
 # ─── Keyword Expansion ──────────────────────────────────────
 
-async def _expand_search_keywords(product_name: str) -> List[str]:
+async def _expand_search_keywords(product_name: str, deadline: Optional[float] = None) -> List[str]:
     """
     Expand a product name into a list of search keywords.
     Returns: ["욕실매트", "욕실", "매트", "욕실용품", "미끄럼방지"]
+    Returns [] (expansion skipped) when the call would overrun the deadline.
     """
     if not product_name:
         return []
 
-    genai = get_genai()
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={"response_mime_type": "application/json"},
-    )
+    memo = get_memo_store()
+    cached = await memo.aget(EXPAND, KEYWORD_EXPANSION_PROMPT, product_name) if memo else None
+    if cached is not None:
+        log_debug(f"[Keyword Expand] '{product_name}' → {cached} (memo)")
+        return cached
 
     prompt = KEYWORD_EXPANSION_PROMPT.replace("{product_name}", f'"{product_name}"')
 
     try:
-        response = await model.generate_content_async(prompt)
+        response = await get_model("expansion").generate(prompt, deadline=deadline)
         keywords = json.loads(response.text)
         if isinstance(keywords, list):
             log_debug(f"[Keyword Expand] '{product_name}' → {keywords}")
+            if memo and keywords:
+                await memo.aput(EXPAND, KEYWORD_EXPANSION_PROMPT, product_name, keywords)
             return keywords
         return [product_name]
+    except asyncio.TimeoutError as e:
+        log_debug(f"[Keyword Expand] Skipped: {e}")
+        mark_degraded("expansion")
+        return []
     except Exception as e:
         log_debug(f"[Keyword Expand] Error: {e}")
+        mark_degraded("expansion")
         return [product_name]
 
 
 # ─── Keyword Inference (Problem → Product) ───────────────────
 
-async def _infer_product_keywords(text: str) -> List[str]:
+async def _infer_product_keywords(text: str, deadline: Optional[float] = None) -> List[str]:
     """
     Infer probable product keywords from a problem/usage description.
     e.g., "욕실이 미끄러워" → ["미끄럼방지 매트", "논슬립 패드"]
     """
-    genai = get_genai()
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={"response_mime_type": "application/json"},
-    )
+    memo = get_memo_store()
+    cached = await memo.aget(INFER, AUX_PROMPT_KEYWORDS, text) if memo else None
+    if cached is not None:
+        log_debug(f"[Keyword Infer] '{text}' → {cached} (memo)")
+        return cached
 
     prompt = AUX_PROMPT_KEYWORDS.replace("{text}", text)
 
     try:
-        response = await model.generate_content_async(prompt)
+        response = await get_model("inference").generate(prompt, deadline=deadline)
         keywords = json.loads(response.text)
         if isinstance(keywords, list):
             log_debug(f"[Keyword Infer] '{text}' → {keywords}")
+            if memo and keywords:
+                await memo.aput(INFER, AUX_PROMPT_KEYWORDS, text, keywords)
             return keywords
         return []
     except Exception as e:
         log_debug(f"[Keyword Infer] Error: {e}")
+        mark_degraded("inference")
         return []
 
 
 # ─── LangGraph Node Function ────────────────────────────────
 
+def _gate_rejected() -> dict:
+    """State update when the intent gate says N (무관한 발화)."""
+    return {
+        "intent_valid": "N",
+        "intent": Intent.UNSUPPORTED,
+        "slots": {},
+        "expanded_keywords": [],
+        "final_response": NLUResponse(
+            request_id=str(uuid.uuid4())[:8],
+            intent=Intent.UNSUPPORTED,
+            needs_clarification=True,
+            generated_question="죄송합니다. 상품 찾기와 관련된 질문을 해주세요. 예: '볼펜 어디 있어?'",
+        ),
+    }
+
+
+def _expansion_target(nlu_result: NLUResponse) -> Optional[str]:
+    if nlu_result.intent != Intent.PRODUCT_LOCATION:
+        return None
+    return nlu_result.slots.item or nlu_result.slots.query_rewrite
+
+
+async def _run_sequential(input_text: str, history: List[Dict], deadline: Optional[float] = None):
+    """Gate → NLU → expansion, one round trip after another."""
+    intent_valid = await _classify_intent(input_text, deadline=deadline)
+    if intent_valid == "N":
+        return "N", None, []
+
+    nlu_result = await _analyze_text(input_text, history=history, deadline=deadline)
+    item_name = _expansion_target(nlu_result)
+    expanded_keywords = await _expand_search_keywords(item_name, deadline=deadline) if item_name else []
+    return "Y", nlu_result, expanded_keywords
+
+
+async def _run_speculative(input_text: str, history: List[Dict], deadline: Optional[float] = None):
+    """
+    Gate and NLU run concurrently (same input); NLU is cancelled if the gate says N.
+    Keyword expansion starts as soon as the streamed NLU output contains the item slot,
+    so it overlaps with the rest of NLU generation. Saves about one LLM round trip.
+    """
+    expansions: Dict[str, asyncio.Task] = {}
+
+    def on_item(item: str):
+        if item and item not in expansions:
+            log_debug(f"[Node: Intent & Keyword] Speculative expansion for '{item}'")
+            expansions[item] = asyncio.create_task(_expand_search_keywords(item, deadline=deadline))
+
+    gate_task = asyncio.create_task(_classify_intent(input_text, deadline=deadline))
+    nlu_task = asyncio.create_task(
+        _analyze_text(input_text, history=history, on_item=on_item, deadline=deadline)
+    )
+    try:
+        intent_valid = await gate_task
+        if intent_valid == "N":
+            return "N", None, []
+
+        nlu_result = await nlu_task
+        item_name = _expansion_target(nlu_result)
+        task = expansions.pop(item_name, None) if item_name else None
+        if task is not None:
+            expanded_keywords = await task
+        else:
+            expanded_keywords = await _expand_search_keywords(item_name, deadline=deadline) if item_name else []
+        return "Y", nlu_result, expanded_keywords
+    finally:
+        # Gate said N, NLU changed its item, or the intent is not a product lookup
+        for task in [gate_task, nlu_task, *expansions.values()]:
+            if not task.done():
+                task.cancel()
+
+
+async def _run_staged(input_text: str, history: List[Dict], deadline: Optional[float] = None):
+    run = _run_speculative if SPECULATIVE_NLU else _run_sequential
+    return await run(input_text, history, deadline)
+
+
+async def _run_fast_path(input_text: str, deadline: Optional[float] = None):
+    """
+    Dictionary analysis of a simple product lookup; None when not confident (→ LLM path).
+    The intent gate still runs, concurrently with keyword expansion: an off-topic utterance
+    can contain a catalog word ("고양이 어디 있어"), so only the NLU call is skipped.
+    """
+    analyzer = get_fast_nlu()
+    nlu_result = analyzer.analyze(input_text) if analyzer else None
+    if nlu_result is None:
+        return None
+    log_debug(f"[Fast NLU] '{input_text}' → item='{nlu_result.slots.item}' "
+              f"hint={nlu_result.slots.category_hint} attrs={nlu_result.slots.attrs}")
+    gate_task = asyncio.create_task(_classify_intent(input_text, deadline=deadline))
+    expand_task = asyncio.create_task(_expand_search_keywords(nlu_result.slots.item, deadline=deadline))
+    try:
+        if await gate_task == "N":
+            return "N", None, []
+        return "Y", nlu_result, await expand_task
+    finally:
+        for task in (gate_task, expand_task):
+            if not task.done():
+                task.cancel()
+
+
+async def _run_merged(input_text: str, history: List[Dict], deadline: Optional[float] = None):
+    """Single merged call; the staged calls are the fallback if it fails."""
+    try:
+        intent_valid, nlu_result, expanded_keywords = await _analyze_merged(input_text, history, deadline)
+    except Exception as e:
+        log_debug(f"[Merged] Error: {e} → falling back to staged calls")
+        return await _run_staged(input_text, history, deadline)
+    if intent_valid == "Y" and _expansion_target(nlu_result) and not expanded_keywords:
+        expanded_keywords = await _expand_search_keywords(_expansion_target(nlu_result), deadline=deadline)
+    return intent_valid, nlu_result, expanded_keywords
+
+
 async def intent_keyword_node(state: PipelineState) -> dict:
     """
     LangGraph node: Intent & Keyword
     Performs Intent Gate → NLU Analysis → Keyword Expansion
+    (concurrently when SPECULATIVE_NLU is on, see _run_speculative; as one call when
+    INTENT_PIPELINE_MODE is "merged", see _analyze_merged)
     """
     input_text = state["input_text"]
     history = state.get("history", [])
     log_debug(f"--- [Node: Intent & Keyword] Input: '{input_text}' ---")
 
-    # Step 1: Intent Gate (Y/N)
-    intent_valid = await _classify_intent(input_text)
+    with track_fallbacks() as fallbacks:
+        fast = await _run_fast_path(input_text, state.get("deadline")) if FAST_PATH_NLU else None
+        if fast is not None:
+            intent_valid, nlu_result, expanded_keywords = fast
+        else:
+            run = _run_merged if INTENT_PIPELINE_MODE == "merged" else _run_staged
+            intent_valid, nlu_result, expanded_keywords = await run(input_text, history, state.get("deadline"))
+    degraded = state.get("degraded", False) or bool(fallbacks)
+    if fallbacks:
+        log_debug(f"[Node: Intent & Keyword] Degraded: {fallbacks}")
 
     if intent_valid == "N":
         log_debug("[Node: Intent & Keyword] → N (무관한 발화). Skipping NLU.")
-        return {
-            "intent_valid": "N",
-            "intent": Intent.UNSUPPORTED,
-            "slots": {},
-            "expanded_keywords": [],
-            "final_response": NLUResponse(
-                request_id=str(uuid.uuid4())[:8],
-                intent=Intent.UNSUPPORTED,
-                needs_clarification=True,
-                generated_question="죄송합니다. 상품 찾기와 관련된 질문을 해주세요. 예: '볼펜 어디 있어?'",
-            ),
-        }
+        return {**_gate_rejected(), "degraded": degraded}
 
-    # Step 2: NLU Analysis (Y인 경우)
-    nlu_result = await _analyze_text(input_text, history=history)
-
-    # Step 3: Keyword Expansion (PRODUCT_LOCATION인 경우)
-    # ... existing logging ...
     log_debug(f"--- [Node: Intent] Intent={nlu_result.intent}, Item='{nlu_result.slots.item}' ---")
     
     from .config import log_pipeline
@@ -324,12 +491,6 @@ async def intent_keyword_node(state: PipelineState) -> dict:
         "query_rewrite": nlu_result.slots.query_rewrite
     })
 
-    expanded_keywords = []
-    if nlu_result.intent == Intent.PRODUCT_LOCATION:
-        item_name = nlu_result.slots.item or nlu_result.slots.query_rewrite
-        if item_name:
-            expanded_keywords = await _expand_search_keywords(item_name)
-
     return {
         "intent_valid": "Y",  # Assume valid if parsing succeeded
         "intent": nlu_result.intent,
@@ -343,4 +504,5 @@ async def intent_keyword_node(state: PipelineState) -> dict:
         },
         "expanded_keywords": expanded_keywords,
         "final_response": nlu_result,
+        "degraded": degraded,
     }
@@ -0,0 +1,190 @@
+# backend/ai_service/memo_store.py
+"""
+Persistent memo store for deterministic-enough LLM stages.
+_expand_search_keywords(item) and _infer_product_keywords(text) return stable lists for a
+given input, so their results are kept in a small SQLite file and reused across requests
+and restarts:
+
+    llm_memo(stage, key, input, value JSON)   key = sha1(model | prompt hash | normalized input)
+
+Changing the model or editing the prompt changes the key, so stale outputs are never served.
+Async callers use aget/aput, which run the SQLite work on a worker thread; the one shared
+connection is serialized by the store's lock.
+The store is pre-warmed (INSERT OR IGNORE, real LLM outputs win) from:
+    - poc/data/expansion_result.json  written by poc/kms/expand_keywords_comparison_gemini.py
+    - CATEGORIES in backend/database/category_matcher.py  (keyword -> [keyword, middle, major])
+
+Usage:
+    python -m backend.ai_service.memo_store          # pre-warm and print stats
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import MODEL_NAME, LLM_MEMO_PATH, log_debug
+from .response_cache import normalize_query
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+POC_EXPANSION_PATH = os.path.join(PROJECT_ROOT, "poc", "data", "expansion_result.json")
+
+EXPAND = "expand"  # _expand_search_keywords
+INFER = "infer"    # _infer_product_keywords
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def memo_key(model: str, prompt: str, text: str) -> str:
+    raw = f"{model}|{prompt_hash(prompt)}|{normalize_query(text)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class MemoStore:
+    """SQLite-backed memo table with an in-process dict in front of it."""
+
+    def __init__(self, path: str = LLM_MEMO_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_memo (
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                input TEXT,
+                value TEXT NOT NULL,
+                PRIMARY KEY (stage, key)
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._hot: Dict[Tuple[str, str], List] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, stage: str, prompt: str, text: str, model: str = MODEL_NAME) -> Optional[List]:
+        key = (stage, memo_key(model, prompt, text))
+        with self._lock:
+            value = self._hot.get(key)
+            if value is None:
+                row = self._conn.execute(
+                    "SELECT value FROM llm_memo WHERE stage = ? AND key = ?", key
+                ).fetchone()
+                if row is not None:
+                    value = self._hot[key] = json.loads(row[0])
+            self.stats["hits" if value is not None else "misses"] += 1
+        return list(value) if value is not None else None
+
+    def put(self, stage: str, prompt: str, text: str, value: List, model: str = MODEL_NAME):
+        key = (stage, memo_key(model, prompt, text))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_memo (stage, key, input, value) VALUES (?, ?, ?, ?)",
+                (*key, text, json.dumps(value, ensure_ascii=False)),
+            )
+            self._conn.commit()
+            self._hot[key] = list(value)
+
+    async def aget(self, stage: str, prompt: str, text: str, model: str = MODEL_NAME) -> Optional[List]:
+        """get() off the event loop."""
+        return await asyncio.to_thread(self.get, stage, prompt, text, model)
+
+    async def aput(self, stage: str, prompt: str, text: str, value: List, model: str = MODEL_NAME):
+        """put() off the event loop."""
+        await asyncio.to_thread(self.put, stage, prompt, text, value, model)
+
+    def put_missing(self, stage: str, prompt: str, items: Iterable[Tuple[str, List]],
+                    model: str = MODEL_NAME) -> int:
+        """Bulk insert without overwriting existing entries. Returns the number added."""
+        rows = [(stage, memo_key(model, prompt, text), text, json.dumps(value, ensure_ascii=False))
+                for text, value in items if text and value]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO llm_memo (stage, key, input, value) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_memo").fetchone()[0]
+
+
+# ─── Pre-warming ─────────────────────────────────────────────
+
+def category_expansions(categories: Dict[str, Dict[str, List[str]]]) -> List[Tuple[str, List[str]]]:
+    """Keyword -> [keyword, middle category, major category parts] (first category wins)."""
+    seen, items = set(), []
+    for major, middles in categories.items():
+        for middle, keywords in middles.items():
+            for kw in keywords:
+                if kw in seen:
+                    continue
+                seen.add(kw)
+                expanded = [kw]
+                for part in [middle, *major.split("/")]:
+                    if part not in expanded:
+                        expanded.append(part)
+                items.append((kw, expanded))
+    return items
+
+
+def poc_expansions(path: str = POC_EXPANSION_PATH) -> List[Tuple[str, List[str]]]:
+    """(keyword, expanded_keywords) pairs from the kms expansion experiment output, if present."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = []
+    for item in data:
+        kw = (item.get("extraction") or {}).get("keyword")
+        expanded = (item.get("expansion") or {}).get("expanded_keywords")
+        if kw and isinstance(expanded, list) and expanded:
+            items.append((kw, expanded))
+    return items
+
+
+def prewarm(store: MemoStore, poc_path: str = POC_EXPANSION_PATH) -> int:
+    """Seed keyword expansions; recorded LLM outputs take precedence over category keywords."""
+    from .prompts import KEYWORD_EXPANSION_PROMPT
+    from backend.database.category_matcher import CATEGORIES
+
+    added = store.put_missing(EXPAND, KEYWORD_EXPANSION_PROMPT, poc_expansions(poc_path))
+    added += store.put_missing(EXPAND, KEYWORD_EXPANSION_PROMPT, category_expansions(CATEGORIES))
+    log_debug(f"[Memo] Pre-warmed {added} keyword expansions ({len(store)} entries)")
+    return added
+
+
+# ─── Store Holder ────────────────────────────────────────────
+_store: Optional[MemoStore] = None
+_store_lock = threading.Lock()
+
+
+def get_memo_store() -> Optional[MemoStore]:
+    """Process-wide store (None when LLM_MEMO_PATH is empty); pre-warmed on first open."""
+    global _store
+    if _store is None and LLM_MEMO_PATH:
+        with _store_lock:
+            if _store is None:
+                try:
+                    store = MemoStore(LLM_MEMO_PATH)
+                    if len(store) == 0:
+                        prewarm(store)
+                    _store = store
+                except Exception as e:
+                    log_debug(f"[Memo] Store unavailable: {e}")
+                    return None
+    return _store
+
+
+if __name__ == "__main__":
+    store = MemoStore(LLM_MEMO_PATH)
+    prewarm(store)
+    print(f"✅ {len(store)} memo entries in {LLM_MEMO_PATH}")
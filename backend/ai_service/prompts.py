@@ -309,3 +309,29 @@ Candidates:
 Reasoning: "Jongee" sounds like "Jong-i" (Paper) in Korean. User wants Paper Tape.
 Output: {"selected_id": "F2", "reason": "'Jongee'는 '종이'의 발음 표기이며, 종이 테이프인 마스킹 테이프가 적합합니다."}
 """
+
+
+# ─── 7. Merged Prompt (Intent Gate + NLU + Keyword Expansion in one call) ─
+
+_EXPANSION_RULES = KEYWORD_EXPANSION_PROMPT.split("Input: {product_name}")[0]
+
+MERGED_PIPELINE_PROMPT = f"""
+# Task
+Do all three steps below for the customer utterance and answer with ONE JSON object:
+1. "intent_valid": "Y" or "N", following [Step 1].
+2. "intent", "slots", "needs_clarification", following [Step 2]. If intent_valid is "N",
+   use intent "UNSUPPORTED" with empty slots.
+3. "expanded_keywords": if intent is "PRODUCT_LOCATION", expand slots.item (or
+   slots.query_rewrite when item is null) following [Step 3]; otherwise [].
+The "Output" rules inside each step describe that step's field only; the answer is always
+the single JSON object above.
+
+# [Step 1] Intent Gate
+{INTENT_GATE_PROMPT}
+
+# [Step 2] NLU
+{NLU_SYSTEM_PROMPT}
+
+# [Step 3] Keyword Expansion
+{_EXPANSION_RULES}
+"""
@@ -1,38 +1,85 @@
 # backend/ai_service/reranker_node.py
 """
-Pipeline Node 3: LLM Re-ranker (Gemini 2.0 Flash)
+Pipeline Node 3: Re-ranker
 
-Uses Chain-of-Thought reasoning to select the best product from search candidates.
-Ported from: poc/kdg/poc_v5_experiment_phase_1.py
+Selects the best product from search candidates through a pluggable Reranker:
+    LLMReranker     Gemini 2.0 Flash with Chain-of-Thought reasoning
+                    (ported from poc/kdg/poc_v5_experiment_phase_1.py)
+    LocalReranker   CPU scoring: character bigram overlap with name / description,
+                    plus MiniLM cosine when sentence-transformers is installed
+    HybridReranker  local pick when its lead is decisive, Gemini otherwise
+RERANKER in config selects one. When the LLM call would overrun the request deadline, a
+lexical ranking (character bigram overlap of query and product name) picks the product instead.
+Benchmark: python -m backend.ai_service.benchmark_reranker
 
 Architecture: Supervisor → Intent & Keyword → Hybrid Searcher → [LLM Re-ranker]
 """
 
+import asyncio
 import json
+from abc import ABC, abstractmethod
+import threading
 import time
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 
-from .config import get_genai, MODEL_NAME, log_debug
+import numpy as np
+
+from .config import (
+    RERANKER, RERANK_LOCAL_MARGIN, RERANK_LOCAL_MIN_SCORE, get_model, log_debug, mark_degraded, track_fallbacks,
+)
 from .schemas import PipelineState, Intent
 from .prompts import RERANK_SYSTEM_PROMPT
+from .response_cache import normalize_query
+
+
+LEXICAL_MIN_SCORE = 0.5    # bigram Dice of query vs. name needed to select a product
+LEXICAL_MIN_MARGIN = 0.1   # lead over the runner-up
 
 
 # ─── Rerank Logic ────────────────────────────────────────────
 
-async def _advanced_rerank(user_query: str, candidates: List[Dict]) -> Dict:
+def _bigrams(text: str) -> set:
+    text = "".join(normalize_query(text).split())
+    return {text[i:i + 2] for i in range(len(text) - 1)} or ({text} if text else set())
+
+
+def _lexical_rerank(user_query: str, candidates: List[Dict], item: Optional[str] = None) -> Dict:
+    """
+    Deterministic fallback for _advanced_rerank: Dice overlap of character bigrams between
+    the item (or the query) and each product name. Selects only a clear winner; ties keep
+    the search order.
+    """
+    query = _bigrams(item or user_query)
+    scored = []
+    for c in candidates:
+        name = _bigrams(c.get("name", ""))
+        score = 2 * len(query & name) / (len(query) + len(name)) if query and name else 0.0
+        scored.append((score, c))
+    scored.sort(key=lambda x: x[0], reverse=True)  # stable: search order breaks ties
+
+    best_score, best = scored[0] if scored else (0.0, None)
+    runner_up = scored[1][0] if len(scored) > 1 else 0.0
+    if best is None or best_score < LEXICAL_MIN_SCORE or best_score - runner_up < LEXICAL_MIN_MARGIN:
+        return {"selected_id": None, "reason": "", "latency": 0.0, "fallback": "lexical"}
+
+    log_debug(f"[Reranker] Lexical fallback → {best.get('id')} '{best.get('name')}' ({best_score:.2f})")
+    return {
+        "selected_id": str(best.get("id")),
+        "reason": "요청하신 상품명과 가장 일치하는 상품입니다.",
+        "latency": 0.0,
+        "fallback": "lexical",
+    }
+
+
+async def _advanced_rerank(user_query: str, candidates: List[Dict], deadline: Optional[float] = None) -> Dict:
     """
     Rerank candidates using Gemini 2.0 Flash with CoT reasoning.
     Returns: {"selected_id": str|null, "reason": str, "latency": float}
+    Raises asyncio.TimeoutError when the call does not fit the deadline.
     """
     if not candidates:
         return {"selected_id": None, "reason": "후보 상품이 없습니다.", "latency": 0.0}
 
-    genai = get_genai()
-    model = genai.GenerativeModel(
-        MODEL_NAME,
-        generation_config={"response_mime_type": "application/json"},
-    )
-
     # Build candidate text
     candidate_text = ""
     for c in candidates:
@@ -61,7 +108,7 @@ async def _advanced_rerank(user_query: str, candidates: List[Dict]) -> Dict:
 
     try:
         start_time = time.time()
-        response = await model.generate_content_async(prompt)
+        response = await get_model("rerank").generate(prompt, deadline=deadline)
         latency = time.time() - start_time
 
         result = json.loads(response.text)
@@ -73,17 +120,219 @@ async def _advanced_rerank(user_query: str, candidates: List[Dict]) -> Dict:
         )
         return result
 
+    except asyncio.TimeoutError:
+        raise
     except Exception as e:
         log_debug(f"[Reranker] Error: {e}")
+        mark_degraded("rerank")
         return {"selected_id": None, "reason": f"리랭킹 오류: {str(e)}", "latency": 0.0}
 
 
+# ─── Pluggable Rerankers ─────────────────────────────────────
+
+def _query_term(user_query: str, slots: Optional[Dict]) -> str:
+    """What the candidates are matched against: NLU rewrite, item, or the raw query."""
+    slots = slots or {}
+    return slots.get("query_rewrite") or slots.get("item") or user_query
+
+
+class Reranker(ABC):
+    """rerank() returns {"selected_id": str|None, "reason": str, "latency": float, ...}."""
+
+    name = "base"
+
+    @abstractmethod
+    async def rerank(self, user_query: str, candidates: List[Dict], slots: Optional[Dict] = None,
+                     deadline: Optional[float] = None) -> Dict:
+        ...
+
+
+class LLMReranker(Reranker):
+    """Gemini CoT reranking; validates relevance even for a single candidate."""
+
+    name = "llm"
+
+    async def rerank(self, user_query, candidates, slots=None, deadline=None):
+        result = await _advanced_rerank(user_query, candidates, deadline=deadline)
+        result["reranker"] = self.name
+        return result
+
+
+def _load_embedder() -> Optional[Callable[[List[str]], np.ndarray]]:
+    """MiniLM encoder (vector store model), or None when sentence-transformers is missing."""
+    try:
+        from sentence_transformers import SentenceTransformer
+        from .vector_store import EMBEDDING_MODEL
+        model = SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        log_debug(f"[Reranker] MiniLM unavailable: {e} → lexical scores only")
+        return None
+    return lambda texts: model.encode(texts, normalize_embeddings=True)
+
+
+class LocalReranker(Reranker):
+    """
+    Scores every candidate in [0, 1] without a network call:
+
+        lexical = 0.5 * share of query bigrams found in the name
+                + 0.3 * Dice(query, name)
+                + 0.2 * share of query bigrams found in description / keywords / category
+        score   = lexical                          (no embedder)
+                = 0.5 * cosine + 0.5 * lexical     (MiniLM of query vs. name + description)
+
+    A product is selected only when score >= min_score and it leads the runner-up by margin;
+    the whole query must also appear in its name, with or without embeddings ("글루건 심"
+    never picks "글루건"). Otherwise selected_id is None and "decisive" is False.
+    Product embeddings are cached by text, so repeated candidates are encoded once.
+    Scoring (and the MiniLM encode) runs on a worker thread; MiniLM is only used once load()
+    has run (API startup warm-up), so the first request never waits for the model.
+    """
+
+    name = "local"
+    EMBEDDING_CACHE_SIZE = 4096
+
+    def __init__(self, min_score: float = RERANK_LOCAL_MIN_SCORE, margin: float = RERANK_LOCAL_MARGIN,
+                 embedder: Optional[Callable[[List[str]], np.ndarray]] = None, use_embeddings: bool = True):
+        self.min_score = min_score
+        self.margin = margin
+        self._embedder = embedder
+        self._embedder_loaded = embedder is not None or not use_embeddings
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # ─── Scoring ─────────────────────────────────────────────
+    def score(self, user_query: str, candidates: List[Dict],
+              slots: Optional[Dict] = None) -> List[Tuple[float, float, Dict]]:
+        """(score, share of query bigrams in the name, candidate) best first; search order breaks ties."""
+        term = _query_term(user_query, slots)
+        query = _bigrams(term)
+        cosines = self._cosines(term, candidates)
+        scored = []
+        for i, c in enumerate(candidates):
+            name = _bigrams(c.get("name", ""))
+            context = _bigrams(" ".join([
+                c.get("desc", "") or c.get("searchable_desc", "") or "",
+                " ".join(c.get("keywords") or []),
+                c.get("category_major", "") or "", c.get("category_middle", "") or "",
+            ]))
+            coverage = len(query & name) / len(query) if query and name else 0.0
+            if query:
+                lexical = (0.5 * coverage
+                           + 0.3 * 2 * len(query & name) / (len(query) + len(name))
+                           + 0.2 * len(query & context) / len(query))
+            else:
+                lexical = 0.0
+            score = lexical if cosines is None else 0.5 * max(float(cosines[i]), 0.0) + 0.5 * lexical
+            scored.append((round(score, 4), coverage, c))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored
+
+    def decide(self, scored: List[Tuple[float, float, Dict]]) -> Tuple[Optional[Dict], float, float]:
+        """(winner or None, best score, lead over the runner-up)."""
+        if not scored:
+            return None, 0.0, 0.0
+        best_score, coverage, best = scored[0]
+        lead = best_score - (scored[1][0] if len(scored) > 1 else 0.0)
+        if best_score >= self.min_score and lead >= self.margin and coverage == 1.0:
+            return best, best_score, lead
+        return None, best_score, lead
+
+    async def rerank(self, user_query, candidates, slots=None, deadline=None):
+        start = time.perf_counter()
+        scored = await asyncio.to_thread(self.score, user_query, candidates, slots)
+        best, best_score, lead = self.decide(scored)
+        latency = round(time.perf_counter() - start, 4)
+        log_debug(
+            f"[Reranker] Local → {best.get('id') if best else None} "
+            f"(score={best_score:.2f}, lead={lead:.2f}, {latency * 1000:.1f}ms)"
+        )
+        return {
+            "selected_id": str(best.get("id")) if best else None,
+            "reason": "요청하신 상품과 가장 일치하는 상품입니다." if best else "",
+            "latency": latency,
+            "reranker": self.name,
+            "decisive": best is not None,
+            "score": best_score,
+            "margin": round(lead, 4),
+        }
+
+    # ─── Embeddings ──────────────────────────────────────────
+    def load(self) -> bool:
+        """Load MiniLM once (startup warm-up); True when embeddings are used."""
+        if not self._embedder_loaded:
+            with self._lock:
+                if not self._embedder_loaded:
+                    self._embedder = _load_embedder()
+                    self._embedder_loaded = True
+        return self._embedder is not None
+
+    def _cosines(self, term: str, candidates: List[Dict]) -> Optional[np.ndarray]:
+        if not self._embedder_loaded or self._embedder is None or not candidates:
+            return None
+        texts = [normalize_query(term)] + [
+            normalize_query(f"{c.get('name', '')} {(c.get('desc') or c.get('searchable_desc') or '')[:100]}")
+            for c in candidates
+        ]
+        with self._lock:
+            missing = [t for t in dict.fromkeys(texts) if t not in self._vectors]
+        if missing:
+            vectors = np.asarray(self._embedder(missing), dtype=np.float32)
+            with self._lock:
+                if len(self._vectors) + len(missing) > self.EMBEDDING_CACHE_SIZE:
+                    self._vectors.clear()
+                for text, vector in zip(missing, vectors):
+                    n = float(np.linalg.norm(vector))
+                    self._vectors[text] = vector / n if n else vector
+        with self._lock:
+            matrix = np.stack([self._vectors[t] for t in texts])
+        return matrix[1:] @ matrix[0]
+
+
+class HybridReranker(Reranker):
+    """Local reranker first; Gemini only when the local lead is not decisive."""
+
+    name = "hybrid"
+
+    def __init__(self, local: Optional[LocalReranker] = None, llm: Optional[Reranker] = None):
+        self.local = local or LocalReranker()
+        self.llm = llm or LLMReranker()
+        self.stats = {"local": 0, "llm": 0}
+
+    async def rerank(self, user_query, candidates, slots=None, deadline=None):
+        result = await self.local.rerank(user_query, candidates, slots)
+        if result["decisive"]:
+            self.stats["local"] += 1
+            return result
+        self.stats["llm"] += 1
+        return await self.llm.rerank(user_query, candidates, slots, deadline=deadline)
+
+
+_RERANKERS = {"llm": LLMReranker, "local": LocalReranker, "hybrid": HybridReranker}
+
+
+# ─── Reranker Holder ─────────────────────────────────────────
+_rerankers: Dict[str, Reranker] = {}
+_rerankers_lock = threading.Lock()
+
+
+def get_reranker(mode: Optional[str] = None) -> Reranker:
+    """Process-wide reranker for the mode (default: RERANKER; unknown modes use "llm")."""
+    mode = mode or RERANKER
+    if mode not in _RERANKERS:
+        mode = "llm"
+    if mode not in _rerankers:
+        with _rerankers_lock:
+            if mode not in _rerankers:
+                _rerankers[mode] = _RERANKERS[mode]()
+    return _rerankers[mode]
+
+
 # ─── LangGraph Node Function ────────────────────────────────
 
 async def reranker_node(state: PipelineState) -> dict:
     """
-    LangGraph node: LLM Re-ranker
-    Selects the best product from search candidates using CoT reasoning.
+    LangGraph node: Re-ranker
+    Selects the best product from search candidates with the configured Reranker.
     """
     intent = state.get("intent")
     candidates = state.get("search_candidates", [])
@@ -96,14 +345,22 @@ async def reranker_node(state: PipelineState) -> dict:
     input_text = state["input_text"]
     log_debug(f"--- [Node: Reranker] Query='{input_text}', {len(candidates)} candidates ---")
 
-    # Always use LLM reranking to validate relevance (even for 1 candidate)
-    result = await _advanced_rerank(input_text, candidates)
+    # LLM validates relevance (even for 1 candidate) unless the local pick is decisive or out of budget
+    slots = state.get("slots") or {}
+    with track_fallbacks() as fallbacks:
+        try:
+            result = await get_reranker().rerank(input_text, candidates, slots, deadline=state.get("deadline"))
+        except asyncio.TimeoutError as e:
+            log_debug(f"[Reranker] {e or 'Timed out'} → lexical ranking")
+            mark_degraded("rerank")
+            result = _lexical_rerank(input_text, candidates, slots.get("item"))
     
     from .config import log_pipeline
     log_pipeline("Reranker", {"input_text": input_text, "candidate_count": len(candidates)}, {
         "selected_id": result.get("selected_id"),
+        "reranker": result.get("reranker"),
         "reason": result.get("reason"),
         "latency": result.get("latency")
     })
     
-    return {"rerank_result": result}
+    return {"rerank_result": result, "degraded": state.get("degraded", False) or bool(fallbacks)}
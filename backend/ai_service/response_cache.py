@@ -0,0 +1,241 @@
+# backend/ai_service/response_cache.py
+"""
+Response cache for the /api/query pipeline.
+Kiosk queries repeat a lot ("볼펜 어디 있어?"), so a finished QueryResponse is kept and
+replayed without any Gemini round trip:
+
+    exact tier     (normalized text without spaces, history fingerprint) -> response   LRU + TTL
+    semantic tier  MiniLM embedding of the normalized text, cosine >= threshold, same
+                   history fingerprint, the same numbers (prices) and the same catalog terms
+                   (fast-NLU dictionary words and latin tokens) in the query. Off by default
+                   (QUERY_CACHE_SEMANTIC_THRESHOLD=0): cosine alone does not separate
+                   "파란색 볼펜" from "빨간색 볼펜"; enable with a threshold such as 0.93.
+
+Entries are dropped when the catalog version changes (products moved / re-seeded).
+The semantic tier is skipped when sentence-transformers is not installed or the fast-NLU
+dictionary is unavailable.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL,
+    QUERY_CACHE_SEMANTIC_THRESHOLD,
+    log_debug,
+)
+
+HISTORY_TURNS = 6  # same window _analyze_text sends to the model
+
+_PUNCT = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_NUMBERS = re.compile(r"\d+")
+
+
+def normalize_query(text: str) -> str:
+    """NFKC, lowercase, punctuation removed, whitespace collapsed ("볼펜  어디 있어??" -> "볼펜 어디 있어")."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _PUNCT.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _exact_key(norm: str) -> str:
+    """Korean spacing is inconsistent in speech transcripts ("어디있어" / "어디 있어")."""
+    return norm.replace(" ", "")
+
+
+def history_fingerprint(history: Optional[List[Dict]]) -> str:
+    """Digest of the conversation turns the pipeline sees ("" for a fresh session)."""
+    if not history:
+        return ""
+    turns = [(h.get("role", ""), normalize_query(h.get("text", ""))) for h in history[-HISTORY_TURNS:]]
+    return hashlib.sha1(json.dumps(turns, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _default_embedder() -> Optional[Callable[[List[str]], np.ndarray]]:
+    """MiniLM encoder shared with the vector store's model name, or None if unavailable."""
+    try:
+        from sentence_transformers import SentenceTransformer
+        from .vector_store import EMBEDDING_MODEL
+        model = SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        log_debug(f"[Query Cache] Semantic tier disabled: {e}")
+        return None
+    return lambda texts: model.encode(texts, normalize_embeddings=True)
+
+
+def _default_term_extractor() -> Optional[Callable[[str], frozenset]]:
+    """Catalog terms of a query from the fast-NLU dictionary, or None if it cannot be built."""
+    from .fast_nlu import get_fast_nlu
+
+    analyzer = get_fast_nlu()
+    if analyzer is None:
+        log_debug("[Query Cache] Semantic tier disabled: no fast-NLU dictionary")
+        return None
+    return lambda text: (get_fast_nlu() or analyzer).terms(text)  # follows catalog rebuilds
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "fingerprint", "vector", "terms")
+
+    def __init__(self, value: Dict, expires: float, fingerprint: str, vector: Optional[np.ndarray],
+                 terms: Optional[frozenset] = None):
+        self.value = value
+        self.expires = expires
+        self.fingerprint = fingerprint
+        self.vector = vector
+        self.terms = terms
+
+
+class ResponseCache:
+    """Two-tier (exact / semantic) LRU+TTL cache of pipeline responses."""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL,
+                 semantic_threshold: float = QUERY_CACHE_SEMANTIC_THRESHOLD,
+                 embedder: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 term_extractor: Optional[Callable[[str], frozenset]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self.clock = clock
+        self.version = None
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._embedder = embedder
+        self._embedder_loaded = embedder is not None
+        self._term_extractor = term_extractor
+        self._terms_loaded = term_extractor is not None
+        self._embed_text = lru_cache(maxsize=256)(self._embed_uncached)
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+    # ─── Lookup ──────────────────────────────────────────────
+    def get(self, text: str, history: Optional[List[Dict]] = None, version=None) -> Optional[Dict]:
+        """Cached response for the query, or None (counted as a miss)."""
+        norm, fp = normalize_query(text), history_fingerprint(history)
+        key = (_exact_key(norm), fp)
+        now = self.clock()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > now:
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry.value
+
+        hit = self._semantic_lookup(norm, fp, now)
+        with self._lock:
+            if hit is not None:
+                self.stats["semantic_hits"] += 1
+                return hit
+            self.stats["misses"] += 1
+        return None
+
+    def _semantic_lookup(self, norm: str, fp: str, now: float) -> Optional[Dict]:
+        if self.semantic_threshold <= 0:
+            return None
+        terms = self._terms(norm)
+        if terms is None:
+            return None
+        with self._lock:
+            numbers = _NUMBERS.findall(norm)
+            candidates = [(key, e) for key, e in self._entries.items()
+                          if e.fingerprint == fp and e.vector is not None and e.expires > now
+                          and e.terms == terms and _NUMBERS.findall(key[0]) == numbers]
+        if not candidates:
+            return None
+        vector = self._embed_text(norm)
+        if vector is None:
+            return None
+        sims = np.stack([e.vector for _, e in candidates]) @ vector
+        best = int(np.argmax(sims))
+        if sims[best] < self.semantic_threshold:
+            return None
+        key, entry = candidates[best]
+        log_debug(f"[Query Cache] Semantic hit '{norm}' ≈ '{key[0]}' ({sims[best]:.3f})")
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry.value
+
+    # ─── Store ───────────────────────────────────────────────
+    def put(self, text: str, history: Optional[List[Dict]], value: Dict, version=None):
+        norm, fp = normalize_query(text), history_fingerprint(history)
+        if not norm:
+            return
+        key = (_exact_key(norm), fp)
+        vector = self._embed_text(norm) if self.semantic_threshold > 0 else None
+        terms = self._terms(norm) if vector is not None else None
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = _Entry(value, self.clock() + self.ttl, fp, vector, terms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def report(self) -> Dict:
+        """Hit/miss counters plus hit rate and size."""
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+            stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+            stats["entries"] = len(self._entries)
+            stats["semantic_enabled"] = self.semantic_threshold > 0 and self._embedder is not None
+        return stats
+
+    # ─── Internals ───────────────────────────────────────────
+    def _check_version(self, version):
+        """Drop everything when the catalog changed (caller holds the lock)."""
+        if version is not None and version != self.version:
+            if self.version is not None:
+                self._entries.clear()
+            self.version = version
+
+    def _terms(self, norm: str) -> Optional[frozenset]:
+        if not self._terms_loaded:
+            self._term_extractor = _default_term_extractor()
+            self._terms_loaded = True
+        return self._term_extractor(norm) if self._term_extractor is not None else None
+
+    def _embed_uncached(self, norm: str) -> Optional[np.ndarray]:
+        if not self._embedder_loaded:
+            self._embedder = _default_embedder()
+            self._embedder_loaded = True
+        if self._embedder is None:
+            return None
+        vector = np.asarray(self._embedder([norm])[0], dtype=np.float32)
+        n = float(np.linalg.norm(vector))
+        return vector / n if n else None
+
+
+# ─── Cache Holder ────────────────────────────────────────────
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache (None when QUERY_CACHE_SIZE is 0)."""
+    global _cache
+    if _cache is None and QUERY_CACHE_SIZE > 0:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -4,6 +4,7 @@ Data models for the AI Agent Pipeline.
 - PipelineState: LangGraph graph state
 - Domain models: Intent, NLUSlots, NLUResponse, Product
 - Result models: IntentGateResult, RerankResult
+- Gemini response_schema dicts for the structured NLU / merged calls
 """
 
 from typing import List, Optional, Dict, Any
@@ -77,6 +78,42 @@ class RerankResult(BaseModel):
     latency: float = Field(0.0, description="처리 시간 (초)")
 
 
+# ─── Gemini Response Schemas ─────────────────────────────────
+
+# Structured output of the NLU call (_analyze_text)
+NLU_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": ["PRODUCT_LOCATION", "OTHER_INQUIRY", "UNSUPPORTED"]},
+        "slots": {
+            "type": "object",
+            "properties": {
+                "item": {"type": "string", "nullable": True},
+                "attrs": {"type": "array", "items": {"type": "string"}},
+                "category_hint": {"type": "string", "nullable": True},
+                "query_rewrite": {"type": "string", "nullable": True},
+                "min_price": {"type": "integer", "nullable": True},
+                "max_price": {"type": "integer", "nullable": True},
+            },
+        },
+        "needs_clarification": {"type": "boolean"},
+    },
+    "required": ["intent", "slots", "needs_clarification"],
+}
+
+
+# Merged mode (_analyze_merged): gate + NLU + expansion in one object
+MERGED_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent_valid": {"type": "string", "enum": ["Y", "N"]},
+        **NLU_RESPONSE_SCHEMA["properties"],
+        "expanded_keywords": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["intent_valid", *NLU_RESPONSE_SCHEMA["required"], "expanded_keywords"],
+}
+
+
 # ─── LangGraph State ─────────────────────────────────────────
 
 class PipelineState(TypedDict):
@@ -85,6 +122,8 @@ class PipelineState(TypedDict):
     input_text: str               # 정규화된 사용자 입력
     session_id: str               # 세션 ID (대화 컨텍스트용)
     history: List[Dict]           # 대화 이력 [{"role": "user", "text": "..."}]
+    deadline: Optional[float]     # 응답 마감 시각 (time.monotonic, QUERY_LATENCY_BUDGET); None = 무제한
+    degraded: bool                # LLM 대신 로컬 폴백이 쓰인 응답 (응답 캐시에 저장하지 않음)
 
     # Intent & Keyword 결과
     intent_valid: str             # "Y" / "N"
@@ -25,6 +25,24 @@ from .config import log_debug
 
 # ─── Auxiliary Nodes ─────────────────────────────────────────
 
+DEFAULT_QUESTION = "어떤 종류의 상품을 찾으시나요?"
+
+
+def _template_question(slots: Dict, candidates: List[Dict]) -> str:
+    """Tail question without the LLM (used when it fails or the latency budget is spent)."""
+    item = slots.get("item")
+    middles = []
+    for c in candidates:
+        middle = c.get("category_middle")
+        if middle and middle not in middles:
+            middles.append(middle)
+    if item and len(middles) >= 2:
+        return f"'{item}' 관련 상품이 여러 종류 있어요. {', '.join(middles[:3])} 중 어떤 것을 찾으시나요?"
+    if item:
+        return f"어떤 {item}을(를) 찾으시나요? 용도나 크기를 알려주세요."
+    return DEFAULT_QUESTION
+
+
 async def ambiguity_check_node(state: PipelineState) -> dict:
     """Check if the search results are ambiguous and need clarification."""
     candidates = state.get("search_candidates", [])
@@ -57,7 +75,7 @@ async def ambiguity_check_node(state: PipelineState) -> dict:
 async def clarification_node(state: PipelineState) -> dict:
     """Generate a tail question for ambiguous queries."""
     from .prompts import TAIL_QUESTION_PROMPT
-    from .config import get_genai, MODEL_NAME
+    from .config import get_model
 
     log_debug("--- [Node: Clarification] Generating question ---")
 
@@ -79,18 +97,18 @@ async def clarification_node(state: PipelineState) -> dict:
         db_context=db_context,
     )
 
-    question = "어떤 종류의 상품을 찾으시나요?"  # Default
+    question = _template_question(slots, candidates)  # Default / out of budget
+    degraded = state.get("degraded", False)
 
     try:
-        genai = get_genai()
-        model = genai.GenerativeModel(MODEL_NAME)
-        response = await model.generate_content_async(prompt)
+        response = await get_model("clarification").generate(prompt, deadline=state.get("deadline"))
         generated = response.text.strip()
         if generated:
             question = generated
         log_debug(f"[Node: Clarification] Question: '{question[:60]}...'")
     except Exception as e:
         log_debug(f"[Node: Clarification] Error: {e}")
+        degraded = True
 
     # Update final response
     resp = state.get("final_response")
@@ -109,6 +127,7 @@ async def clarification_node(state: PipelineState) -> dict:
     return {
         "final_response": resp,
         "clarification_count": state.get("clarification_count", 0) + 1,
+        "degraded": degraded,
     }
 
 
@@ -25,6 +25,30 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='repla
 # Ensure project root is in path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+# (text, expected Y/N)
+INTENT_GATE_CASES = [
+    ("볼펜 어디 있어?", "Y"),
+    ("화장실 어디에요?", "Y"),
+    ("충전 케이블 찾아줘", "Y"),
+    ("오늘 날씨 어때?", "N"),
+    ("욕실이 미끄러워", "Y"),
+    ("안녕하세요", "N"),
+    ("매트 있어?", "Y"),
+    ("수납함 어디야?", "Y"),
+]
+
+# (text, expected intent, expected item substring or None)
+NLU_CASES = [
+    ("볼펜 어디 있어?", "PRODUCT_LOCATION", "볼펜"),
+    ("파란색 볼펜 있어?", "PRODUCT_LOCATION", "볼펜"),
+    ("충전 케이블 찾아줘", "PRODUCT_LOCATION", "충전 케이블"),
+    ("매트 있어?", "PRODUCT_LOCATION", "매트"),
+    ("수납함 어디야?", "PRODUCT_LOCATION", "수납함"),
+    ("5000원 이하 생일 선물", "PRODUCT_LOCATION", None),
+    ("화장실 바닥 미끄러운 거 방지하는 거", "PRODUCT_LOCATION", None),
+    ("배고파", "UNSUPPORTED", None),
+]
+
 
 async def test_intent_gate():
     """Test 1: Intent Gate (Y/N)"""
@@ -34,16 +58,7 @@ async def test_intent_gate():
     print("Test 1: Intent Gate (Y/N)")
     print("=" * 60)
 
-    test_cases = [
-        ("볼펜 어디 있어?", "Y"),
-        ("화장실 어디에요?", "Y"),
-        ("충전 케이블 찾아줘", "Y"),
-        ("오늘 날씨 어때?", "N"),
-        ("욕실이 미끄러워", "Y"),
-        ("안녕하세요", "N"),
-        ("매트 있어?", "Y"),
-        ("수납함 어디야?", "Y"),
-    ]
+    test_cases = INTENT_GATE_CASES
 
     passed = 0
     for text, expected in test_cases:
@@ -64,16 +79,7 @@ async def test_nlu_analysis():
     print("Test 2: NLU Analysis")
     print("=" * 60)
 
-    test_cases = [
-        ("볼펜 어디 있어?", "PRODUCT_LOCATION", "볼펜"),
-        ("파란색 볼펜 있어?", "PRODUCT_LOCATION", "볼펜"),
-        ("충전 케이블 찾아줘", "PRODUCT_LOCATION", "충전 케이블"),
-        ("매트 있어?", "PRODUCT_LOCATION", "매트"),
-        ("수납함 어디야?", "PRODUCT_LOCATION", "수납함"),
-        ("5000원 이하 생일 선물", "PRODUCT_LOCATION", None),
-        ("화장실 바닥 미끄러운 거 방지하는 거", "PRODUCT_LOCATION", None),
-        ("배고파", "UNSUPPORTED", None),
-    ]
+    test_cases = NLU_CASES
 
     passed = 0
     for text, expected_intent, expected_item in test_cases:
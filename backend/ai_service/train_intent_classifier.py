@@ -0,0 +1,58 @@
+# backend/ai_service/train_intent_classifier.py
+"""
+Train the local Intent Gate classifier (intent_classifier.py) and write INTENT_CLASSIFIER_PATH
+(backend/ai_service/intent_gate.joblib when unset; point INTENT_CLASSIFIER_PATH at it to enable the gate).
+
+    python -m backend.ai_service.train_intent_classifier [--out path] [--folds 5]
+
+Prints 5-fold held-out accuracy on the labelled gate sheet (poc/intent/daiso_poc_data.csv)
+and the share of utterances that would escalate to Gemini at INTENT_CLASSIFIER_THRESHOLD.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.ai_service.config import INTENT_CLASSIFIER_PATH, INTENT_CLASSIFIER_THRESHOLD
+from backend.ai_service.intent_classifier import (
+    CSV_LABEL,
+    CSV_TEXT,
+    POC_QUESTIONS_JSON,
+    DEFAULT_MODEL_PATH,
+    IntentClassifier,
+    answers_locally,
+    cross_val_predictions,
+    load_gate_csv,
+    load_training_data,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent gate classifier")
+    parser.add_argument("--out", default=INTENT_CLASSIFIER_PATH or DEFAULT_MODEL_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [r for r in load_gate_csv() if r[CSV_TEXT].strip()]
+    extra_texts, extra_labels = load_training_data(csv_path="", json_path=POC_QUESTIONS_JSON)
+    predictions = cross_val_predictions(rows, extra_texts, extra_labels, folds=args.folds)
+
+    correct = sum(label == r[CSV_LABEL] for r, (label, _) in zip(rows, predictions))
+    confident = [(r, label) for r, (label, conf) in zip(rows, predictions)
+                 if answers_locally(label, conf, INTENT_CLASSIFIER_THRESHOLD)]
+    confident_ok = sum(label == r[CSV_LABEL] for r, label in confident)
+    print(f"Held-out accuracy ({args.folds}-fold, {len(rows)} utterances): {correct / len(rows):.1%}")
+    print(f"Confident Y (p >= {INTENT_CLASSIFIER_THRESHOLD}): {len(confident)}/{len(rows)} "
+          f"answered locally, {confident_ok / max(1, len(confident)):.1%} correct; "
+          f"{len(rows) - len(confident)} escalate to Gemini")
+
+    texts, labels = load_training_data()
+    classifier = IntentClassifier.train(texts, labels)
+    classifier.save(args.out)
+    print(f"✅ Trained on {len(texts)} utterances ({labels.count('N')} N) → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ v1.2 - Using faster-whisper medium model
 import os
 import time
 import uuid
+import asyncio
 import tempfile
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -17,14 +18,22 @@ from .database.database import (
     search_products_flexible, get_all_products, get_related_products_for_context,
     get_map_zones, save_map_zone, delete_map_zone, get_product_by_id, init_database
 )
+from .database import async_db
+from .database.catalog import load_catalog, get_catalog, stop_catalog_refresher
+from .database.database import get_map_zones_version
 
 from backend.navigation.pathfinder import MapNavigator
+from backend.navigation.grid_store import find_grid_file, load_grid_file
+from backend.navigation.zone_index import build_zone_index, get_zone_index
+from backend.navigation.route_cache import build_route_cache, get_route_cache, ShortestPathTree
+from backend.navigation.floor_graph import build_floor_graph, get_floor_graph
+from backend.navigation.turn_by_turn import simplify_path, generate_turn_by_turn_steps, zone_landmarks
 
 import yaml
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, Literal, Union
+from typing import Dict, Optional, Literal, Union
 
 from backend.stt import QualityGate, PolicyGate, WhisperAdapter
 from backend.stt.types import STTResult, QualityGateResult, PolicyIntent
@@ -105,15 +114,41 @@ class NavigationRequest(BaseModel):
     floor: str
     target_product_id: int
     kiosk_id: Optional[str] = None
+    simplify: bool = True  # compact polyline + instructions; False returns every grid cell
 
 class Point(BaseModel):
     x: float
     y: float
 
+class RouteSegment(BaseModel):
+    floor: str
+    path: list[Point]
+    distance: float
+    connection: Optional[str] = None  # connection taken at the end of this segment
+    instructions: list[dict] = []
+
 class NavigationResponse(BaseModel):
     path: list[Point]
     distance: float
     floor: str
+    segments: list[RouteSegment] = []  # full route, one entry per floor (cross-floor routes)
+    instructions: list[dict] = []  # turn-by-turn steps for `path` (see navigation/turn_by_turn.py)
+
+class BatchNavigationRequest(BaseModel):
+    start_x: int
+    start_y: int
+    floor: str
+    target_product_ids: list[int]
+    kiosk_id: Optional[str] = None
+    simplify: bool = True
+
+class ProductRoute(NavigationResponse):
+    product_id: int
+    cost: float  # walking cost (pathfinder units, incl. floor transfers) used for ordering
+
+class BatchNavigationResponse(BaseModel):
+    routes: list[ProductRoute]  # ordered by walking cost, nearest first
+    failed: list[dict] = []     # {product_id, status_code, detail} for targets without a route
 
 
 # ============== Global State ==============
@@ -181,49 +216,80 @@ async def lifespan(app: FastAPI):
     init_database()
     print(f"✅ Database initialized")
 
+    # Load product catalog snapshot (request path reads products from memory)
+    load_catalog()
+
+    # Build in-memory BM25 index (search hot path no longer scans SQLite)
+    from backend.ai_service.config import LEXICAL_BACKEND
+    if LEXICAL_BACKEND != "fts5":
+        from .database.lexical_index import get_lexical_index
+        get_lexical_index()
+
+    # Build the Gemini models once (requests reuse their clients / connections)
+    try:
+        from backend.ai_service.config import build_models
+        print(f"✅ Gemini models ready: {', '.join(build_models())}")
+    except Exception as e:
+        print(f"⚠️ Gemini models not built at startup: {e}")
+
+    # Load the local intent gate classifier (answers confident Y/N without a Gemini call)
+    from backend.ai_service.intent_classifier import get_intent_classifier
+    if get_intent_classifier() is not None:
+        print("✅ Intent gate classifier ready")
+
+    # Open (and pre-warm) the LLM memo store so the first query does not pay for it
+    from backend.ai_service.memo_store import get_memo_store
+    memo = get_memo_store()
+    if memo is not None:
+        print(f"✅ LLM memo ready: {len(memo)} entries")
+
+    # Build the rule-based NLU fast path (catalog lexicon + Aho-Corasick automaton)
+    from backend.ai_service.config import FAST_PATH_NLU
+    if FAST_PATH_NLU:
+        from backend.ai_service.fast_nlu import get_fast_nlu
+        print(f"✅ Fast-path NLU ready: {len(get_fast_nlu().lexicon)} terms")
+
+    # Build the reranker (local scorer loads MiniLM now instead of on the first query)
+    from backend.ai_service.reranker_node import get_reranker
+    reranker = get_reranker()
+    local = getattr(reranker, "local", reranker)
+    if hasattr(local, "load"):
+        embeddings = "MiniLM + lexical" if local.load() else "lexical"
+        print(f"✅ Reranker ready: {reranker.name} ({embeddings})")
+
+    # Build zone index (parsed rects / centers / lookup dicts for routing)
+    zone_index = build_zone_index(get_map_zones(), get_map_zones_version())
+    print(f"✅ Zone index built: {len(zone_index.zones)} zones")
+
     # Initialize MapNavigator
     map_navigator = MapNavigator()
     grids_dir = Path(__file__).parent / "navigation" / "grids"
     
-    # Load B1 Grid
-    b1_path = grids_dir / "b1_grid.json"
-    if b1_path.exists():
-        try:
-            with open(b1_path, "r") as f:
-                data = json.load(f)
-                # Ensure grid_data is list of lists of ints
-                # grid_data might be flat or nested? MapProcessor saves nested list.
-                map_navigator.load_grid("B1", data["grid_data"])
-                print(f"✅ Loaded B1 navigation grid")
-                
-                # Update obstacles from DB
-                zones_b1 = get_map_zones("B1")
-                if zones_b1:
-                    map_navigator.update_obstacles("B1", zones_b1)
-        except Exception as e:
-            print(f"⚠️ Failed to load B1 grid: {e}")
-            
-    # Load B2 Grid
-    b2_path = grids_dir / "b2_grid.json"
-    if b2_path.exists():
+    # Load floor grids (binary .npz if generated, else legacy JSON) and apply zone obstacles
+    for floor in ("B1", "B2"):
+        grid_path = find_grid_file(grids_dir, floor.lower())
+        if not grid_path:
+            continue
         try:
-            with open(b2_path, "r") as f:
-                data = json.load(f)
-                map_navigator.load_grid("B2", data["grid_data"])
-                print(f"✅ Loaded B2 navigation grid")
-                
-                # Update obstacles from DB
-                zones_b2 = get_map_zones("B2")
-                if zones_b2:
-                    map_navigator.update_obstacles("B2", zones_b2)
+            map_navigator.load_grid(floor, load_grid_file(grid_path).grid)
+            print(f"✅ Loaded {floor} navigation grid ({Path(grid_path).name})")
+
+            # Update obstacles from DB
+            floor_zones = zone_index.to_dicts(floor)
+            if floor_zones:
+                map_navigator.update_obstacles(floor, floor_zones)
         except Exception as e:
-            print(f"⚠️ Failed to load B2 grid: {e}")
+            print(f"⚠️ Failed to load {floor} grid: {e}")
+
+    # Precompute shortest-path trees from kiosks / connections (routes from them become lookups)
+    _build_route_structures(zone_index)
 
     print("🎉 STT Pipeline API ready!\n")
     
     yield
     
     print("👋 Shutting down STT Pipeline API...")
+    stop_catalog_refresher()
 
 
 # ============== FastAPI App ==============
@@ -276,26 +342,31 @@ def health_check():
         "llm_model": "gemini-2.0-flash-exp"
     }
 
+@app.get("/api/query/cache")
+def query_cache_stats():
+    """Hit/miss counters of the /api/query response cache"""
+    from backend.ai_service.response_cache import get_response_cache
+    cache = get_response_cache()
+    return cache.report() if cache else {"enabled": False}
+
+@app.get("/api/query/llm")
+def query_llm_stats():
+    """Per-model call / hedge / timeout counters of the /api/query pipeline"""
+    from backend.ai_service.config import model_report, QUERY_LATENCY_BUDGET
+    return {"latency_budget": QUERY_LATENCY_BUDGET, "models": model_report()}
+
 @app.get("/api/map/zones")
 async def get_zones(floor: Optional[str] = None):
     try:
-        zones = get_map_zones(floor)
-        # Parse rect JSON string back to dict for response
-        for z in zones:
-            if 'rect' in z and isinstance(z['rect'], str):
-                try:
-                    z['rect'] = json.loads(z['rect'])
-                except:
-                    pass
-        return zones
+        # Served from the zone index (rects already parsed)
+        return get_zone_index().to_dicts(floor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/categories")
-def get_categories_endpoint():
+async def get_categories_endpoint():
     try:
-        from .database.database import get_all_categories
-        return get_all_categories()
+        return get_catalog().categories
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -309,11 +380,47 @@ class MapZoneCreate(BaseModel):
 class MapZoneDelete(BaseModel):
     id: int
 
+async def _refresh_zone_index(added: Optional[Dict] = None, removed: Optional[Dict] = None):
+    """
+    Rebuild the zone index right after an edit so route requests never hit the DB.
+    A shelf zone edit is applied to the grid in place (only the affected window is recomputed)
+    and only the route-cache trees whose paths cross that window are invalidated.
+    """
+    version = get_map_zones_version()
+    zone_index = build_zone_index(await async_db.get_map_zones(), version)
+    if not map_navigator:
+        return
+
+    route_cache = get_route_cache()
+    for zone, is_removal in ((removed, True), (added, False)):
+        if not zone or zone.get("type") != "zone":
+            continue
+        floor = zone["floor"]
+        if is_removal:
+            window = map_navigator.remove_zone_obstacle(floor, zone["id"])
+        else:
+            window = map_navigator.add_zone_obstacle(floor, zone)
+        if window and route_cache:
+            n = route_cache.invalidate(floor, window, costs_decreased=is_removal)
+            print(f"DEBUG: Zone {zone.get('name')} on {floor} -> window {window}, {n} cached trees invalidated")
+    _build_route_structures(zone_index, incremental=True)
+
+def _build_route_structures(zone_index, incremental: bool = False):
+    """Route cache (per-zone shortest-path trees) and the multi-floor graph on top of it."""
+    route_cache = get_route_cache() if incremental else None
+    if route_cache is not None and route_cache.navigator is map_navigator:
+        route_cache.build(zone_index)  # keeps valid trees, adds/drops sources
+    else:
+        route_cache = build_route_cache(map_navigator, zone_index, cache_dir=os.getenv("ROUTE_CACHE_DIR"))
+    build_floor_graph(route_cache, zone_index)
+
 @app.post("/api/map/zones")
 async def create_zone_endpoint(zone: MapZoneCreate):
     try:
         rect_json = json.dumps(zone.rect)
-        zone_id = save_map_zone(zone.floor, zone.name, rect_json, zone.color, zone.type)
+        zone_id = await async_db.save_map_zone(zone.floor, zone.name, rect_json, zone.color, zone.type)
+        await _refresh_zone_index(added={"id": zone_id, "floor": zone.floor, "name": zone.name,
+                                         "rect": rect_json, "type": zone.type})
         return {"id": zone_id, "success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -321,7 +428,10 @@ async def create_zone_endpoint(zone: MapZoneCreate):
 @app.delete("/api/map/zones/{zone_id}")
 async def delete_zone_endpoint(zone_id: int):
     try:
-        success = delete_map_zone(zone_id)
+        deleted = get_zone_index().get(zone_id)
+        success = await async_db.delete_map_zone(zone_id)
+        if success:
+            await _refresh_zone_index(removed=deleted.to_dict() if deleted else None)
         if not success:
             raise HTTPException(status_code=404, detail="Zone not found")
         return {"success": True}
@@ -456,16 +566,30 @@ async def query_ai_pipeline(req: QueryRequest):
     start_time = time.time()
     request_id = str(uuid.uuid4())[:8]
 
+    # Repeat / near-repeat queries are answered from the response cache (no LLM round trip)
+    from backend.ai_service.response_cache import get_response_cache
+    response_cache = get_response_cache()
+    catalog_version = get_catalog().version
+    if response_cache is not None:
+        cached = await asyncio.to_thread(response_cache.get, req.text, req.history, catalog_version)
+        if cached is not None:
+            processing_time_ms = int((time.time() - start_time) * 1000)
+            print(f"DEBUG: Query cache hit for '{req.text}' ({processing_time_ms}ms)")
+            return QueryResponse(request_id=request_id, processing_time_ms=processing_time_ms, **cached)
+
     try:
         from backend.ai_service.supervisor import agent_app
         from backend.ai_service.schemas import Intent, NLUResponse
+        from backend.ai_service.config import new_deadline
 
-        # Build pipeline input state
+        # Build pipeline input state (deadline bounds every LLM call of this request)
         input_state = {
             "request_id": request_id,
             "input_text": req.text,
             "session_id": req.session_id or str(uuid.uuid4())[:8],
             "history": req.history,
+            "deadline": new_deadline(),
+            "degraded": False,
             "intent_valid": "",
             "intent": Intent.UNSUPPORTED,
             "slots": {},
@@ -509,9 +633,7 @@ async def query_ai_pipeline(req: QueryRequest):
         elif result.get("search_candidates"):
             products = result["search_candidates"]
 
-        processing_time_ms = int((time.time() - start_time) * 1000)
-
-        return QueryResponse(
+        response = QueryResponse(
             request_id=request_id,
             intent_valid=result.get("intent_valid", "N"),
             intent=str(result.get("intent", "UNSUPPORTED")),
@@ -531,8 +653,17 @@ async def query_ai_pipeline(req: QueryRequest):
             products=products,
             needs_clarification=final.needs_clarification if final else False,
             generated_question=final.generated_question if final else None,
-            processing_time_ms=processing_time_ms,
         )
+        # Only answers that took the full LLM path are cached (a fallback would be replayed)
+        if result.get("degraded"):
+            print(f"DEBUG: Degraded answer for '{req.text}' not cached")
+        elif response_cache is not None:
+            await asyncio.to_thread(
+                response_cache.put, req.text, req.history,
+                response.model_dump(exclude={"request_id", "processing_time_ms"}), catalog_version,
+            )
+        response.processing_time_ms = int((time.time() - start_time) * 1000)
+        return response
 
     except Exception as e:
         import traceback
@@ -540,71 +671,56 @@ async def query_ai_pipeline(req: QueryRequest):
         raise HTTPException(status_code=500, detail=f"AI Pipeline error: {str(e)}")
 
 
-def get_zone_center(rect):
-    """Calculate center of a zone rect (dict or list of points)"""
-    import json
-    if isinstance(rect, str):
-        try:
-            rect = json.loads(rect)
-        except:
-            return None
-            
-    if isinstance(rect, list):
-        # Polygon: average of points
-        if not rect: return None
-        xs = [p['x'] for p in rect]
-        ys = [p['y'] for p in rect]
-        return {'x': sum(xs) / len(xs), 'y': sum(ys) / len(ys)}
-    else:
-        # Rect: center
-        try:
-            l = float(rect['left'].replace('%', ''))
-            t = float(rect['top'].replace('%', ''))
-            w = float(rect['width'].replace('%', ''))
-            h = float(rect['height'].replace('%', ''))
-            return {'x': l + w/2, 'y': t + h/2}
-        except:
-            return None
-
-@app.post("/api/navigation/route", response_model=NavigationResponse)
-async def calculate_route(req: NavigationRequest):
+def _grid_path_to_points(floor: str, path, simplify: bool = True, arrival: Optional[str] = None):
     """
-    Calculate path from start location to product location.
-    Supports Kiosk Start Points, Category Fallback, and Cross-Floor Navigation.
+    Grid cells -> map percentages for the frontend. With simplify, the path is reduced to a
+    line-of-sight polyline and turn-by-turn instructions are generated for it.
+    Returns (points, instructions).
     """
-    if not map_navigator:
-        raise HTTPException(status_code=503, detail="Navigation service not initialized")
+    grid_w = map_navigator.width.get(floor, 100)
+    grid_h = map_navigator.height.get(floor, 100)
+    if not simplify:
+        return [Point(x=(x / grid_w) * 100.0, y=(y / grid_h) * 100.0) for (x, y) in path], []
+
+    polyline = simplify_path(path, map_navigator.grids.get(floor))
+    points = [{"x": (x / grid_w) * 100.0, "y": (y / grid_h) * 100.0} for (x, y) in polyline]
+    instructions = generate_turn_by_turn_steps(
+        points, landmark=zone_landmarks(get_zone_index(), floor), arrival=arrival
+    )
+    return [Point(**p) for p in points], instructions
 
-    # 1. Resolve Start Location
+
+def _resolve_start(req, zones):
+    """Start (x%, y%, floor): the request's coordinates, or the kiosk start zone if kiosk_id is given."""
     start_x, start_y, start_floor = req.start_x, req.start_y, req.floor
-    
-    zones = get_map_zones() # Fetch all zones
-    
+
     if req.kiosk_id:
-        # Find start zone with name matching kiosk_id (or just containing it?)
-        # Let's assume exact match or "Entrance 1"
-        # Since kiosk_id from frontend might be simple "kiosk_1", user needs to name zone "kiosk_1"
-        # Or we search for type="start"
+        # Find start zone with name matching kiosk_id (user needs to name zone "kiosk_1"),
+        # falling back to any start zone on req.floor
         print(f"DEBUG: Looking for kiosk_id='{req.kiosk_id}'")
-        start_zone = next((z for z in zones if z['type'] == 'start' and z['name'] == req.kiosk_id), None)
+        start_zone = zones.find('start', req.kiosk_id)
         if not start_zone:
-             # Fallback: find ANY start zone on req.floor?
              print(f"DEBUG: Start zone '{req.kiosk_id}' not found. Trying fallback.")
-             start_zone = next((z for z in zones if z['type'] == 'start' and z['floor'] == req.floor), None)
+             floor_starts = zones.on_floor('start', req.floor)
+             start_zone = floor_starts[0] if floor_starts else None
              
         if start_zone:
-            print(f"DEBUG: Found start_zone: {start_zone['name']}")
-            center = get_zone_center(start_zone['rect'])
-            if center:
-                start_x, start_y = center['x'], center['y']
-                start_floor = start_zone['floor']
+            print(f"DEBUG: Found start_zone: {start_zone.name}")
+            if start_zone.center:
+                start_x, start_y = start_zone.center
+                start_floor = start_zone.floor
         else:
             print("DEBUG: No start zone found.")
 
+    return start_x, start_y, start_floor
+
+
+def _resolve_target(product_id: int, zones):
+    """Product location (x%, y%, floor), falling back to its category zone. Raises HTTPException."""
     # 2. Get Product Location
-    product = get_product_by_id(req.target_product_id)
+    product = get_catalog().get_product(product_id)
     if not product:
-        print(f"DEBUG: Product {req.target_product_id} not found")
+        print(f"DEBUG: Product {product_id} not found")
         raise HTTPException(status_code=404, detail="Product not found")
     
     target_floor = product.get("floor")
@@ -619,90 +735,185 @@ async def calculate_route(req: NavigationRequest):
         print(f"DEBUG: Product has no location. Checking category: {cat_major}, {cat_middle}")
         
         # Search for zone matching middle category first, then major
-        cat_zone = next((z for z in zones if z['type'] == 'category' and z['name'] == cat_middle), None)
-        if not cat_zone:
-            cat_zone = next((z for z in zones if z['type'] == 'category' and z['name'] == cat_major), None)
+        cat_zone = zones.find('category', cat_middle) or zones.find('category', cat_major)
             
         if cat_zone:
-            print(f"DEBUG: Found category zone: {cat_zone['name']}")
-            center = get_zone_center(cat_zone['rect'])
-            if center:
-                target_x, target_y = center['x'], center['y']
-                target_floor = cat_zone['floor']
+            print(f"DEBUG: Found category zone: {cat_zone.name}")
+            if cat_zone.center:
+                target_x, target_y = cat_zone.center
+                target_floor = cat_zone.floor
         else:
             print("DEBUG: Category zone not found")
 
     if target_x is None or target_y is None:
          print("DEBUG: 400 - Product location not mapped and no category zone found")
          raise HTTPException(status_code=400, detail="Product location not mapped and no category zone found")
+
+    return target_x, target_y, target_floor
+
+
+def _nearest_connection(zones, start_floor: str, target_floor: str, start_x: float, start_y: float):
+    """Center of the connection on start_floor closest to the start (single-leg cross-floor fallback)."""
+    if not zones.on_floor('connection', start_floor):
+         print(f"DEBUG: 400 - No connection found on {start_floor}")
+         raise HTTPException(status_code=400, detail=f"No connection found on {start_floor} to go to {target_floor}")
+    
+    nearest_conn = zones.nearest('connection', start_floor, start_x, start_y)
+            
+    if not nearest_conn:
+         print("DEBUG: 400 - Could not resolve connection location")
+         raise HTTPException(status_code=400, detail="Could not resolve connection location")
+    print(f"DEBUG: Found connection: {nearest_conn.name}")
+    return nearest_conn.center
+
+
+def _segments_response(segments, simplify: bool) -> NavigationResponse:
+    """NavigationResponse for a multi-floor route; path/floor/distance describe the first segment."""
+    route_segments = []
+    for seg, nxt in zip(segments, segments[1:] + [None]):
+        arrival = f"{seg.connection}을(를) 타고 {nxt.floor}층으로 이동하세요" if nxt else None
+        points, instructions = _grid_path_to_points(seg.floor, seg.path, simplify, arrival)
+        route_segments.append(RouteSegment(
+            floor=seg.floor,
+            path=points,
+            distance=len(seg.path) * 1.0,
+            connection=seg.connection,
+            instructions=instructions,
+        ))
+    first = route_segments[0]
+    return NavigationResponse(path=first.path, distance=first.distance, floor=first.floor,
+                              segments=route_segments, instructions=first.instructions)
+
+
+@app.post("/api/navigation/route", response_model=NavigationResponse)
+async def calculate_route(req: NavigationRequest):
+    """
+    Calculate path from start location to product location.
+    Supports Kiosk Start Points, Category Fallback, and Cross-Floor Navigation.
+    Zones come from the in-memory ZoneIndex and products from the catalog snapshot (no DB access).
+    """
+    if not map_navigator:
+        raise HTTPException(status_code=503, detail="Navigation service not initialized")
+
+    zones = get_zone_index()
+
+    # 1. Resolve Start Location
+    start_x, start_y, start_floor = _resolve_start(req, zones)
+
+    # 2-3. Product Location (or category zone)
+    target_x, target_y, target_floor = _resolve_target(req.target_product_id, zones)
          
     # 4. Cross-Floor Logic
     if start_floor != target_floor:
         print(f"DEBUG: Cross-floor navigation {start_floor} -> {target_floor}")
-        # Find connection to the target floor
-        # Assume connection zones are named "Elevator", "Escalator", etc.
-        # Find nearest connection on start_floor
-        connections = [z for z in zones if z['type'] == 'connection' and z['floor'] == start_floor]
-        if not connections:
-             print(f"DEBUG: 400 - No connection found on {start_floor}")
-             raise HTTPException(status_code=400, detail=f"No connection found on {start_floor} to go to {target_floor}")
-        
-        # Find nearest connection
-        nearest_conn = None
-        min_dist = float('inf')
-        
-        start_pt = {'x': start_x, 'y': start_y}
-        
-        for conn in connections:
-            center = get_zone_center(conn['rect'])
-            if not center: continue
-            dist = (start_pt['x'] - center['x'])**2 + (start_pt['y'] - center['y'])**2
-            if dist < min_dist:
-                min_dist = dist
-                nearest_conn = conn
-                
-        if nearest_conn:
-            print(f"DEBUG: Found connection: {nearest_conn['name']}")
-            center = get_zone_center(nearest_conn['rect'])
-            target_x, target_y = center['x'], center['y']
-            # We route on start_floor to the connection
-            calculation_floor = start_floor
-        else:
-             print("DEBUG: 400 - Could not resolve connection location")
-             raise HTTPException(status_code=400, detail="Could not resolve connection location")
-    else:
-        calculation_floor = start_floor
+        # Full route through the connection that minimizes total walking + transfer cost
+        floor_graph = get_floor_graph()
+        if floor_graph and floor_graph.connects(start_floor, target_floor):
+            segments = floor_graph.route(
+                start_floor, map_navigator.to_grid(start_floor, start_x, start_y),
+                target_floor, map_navigator.to_grid(target_floor, target_x, target_y),
+            )
+            if segments is None:
+                raise HTTPException(status_code=404, detail="No path found")
+            print(f"DEBUG: Route via {segments[0].connection}: {[len(seg.path) for seg in segments]}")
+            return _segments_response(segments, req.simplify)
+
+        # No linked connection on the target floor: route to the nearest connection on start_floor
+        target_x, target_y = _nearest_connection(zones, start_floor, target_floor, start_x, start_y)
+    calculation_floor = start_floor
 
     # 5. Calculate Path
     
-    # We need map dimensions to convert % to Grid.
-    grid_w = map_navigator.width.get(calculation_floor, 100)
-    grid_h = map_navigator.height.get(calculation_floor, 100)
+    # Map 0-100% to grid cells
+    start_node = map_navigator.to_grid(calculation_floor, start_x, start_y)
+    end_node = map_navigator.to_grid(calculation_floor, target_x, target_y)
     
-    # Map 0-100% to 0-grid_w/h
-    start_grid_x = int(start_x / 100.0 * grid_w)
-    start_grid_y = int(start_y / 100.0 * grid_h)
-    end_grid_x = int(target_x / 100.0 * grid_w)
-    end_grid_y = int(target_y / 100.0 * grid_h)
-    
-    path = map_navigator.find_path(calculation_floor, (start_grid_x, start_grid_y), (end_grid_x, end_grid_y))
+    # Kiosk / connection starts have a precomputed shortest-path tree; anything else runs A*
+    route_cache = get_route_cache()
+    path = route_cache.route(calculation_floor, start_node, end_node) if route_cache else None
+    if path is None:
+        path = map_navigator.find_path(calculation_floor, start_node, end_node)
     
     if path is None:
          raise HTTPException(status_code=404, detail="No path found")
          
     # Convert path back to % for Frontend
-    pixel_path_final = [
-        Point(
-            x=(x / grid_w) * 100.0,
-            y=(y / grid_h) * 100.0
-        )
-        for (x, y) in path
-    ]
+    pixel_path_final, instructions = _grid_path_to_points(calculation_floor, path, req.simplify)
     
     return NavigationResponse(
         path=pixel_path_final,
         distance=len(path) * 1.0, 
-        floor=calculation_floor
+        floor=calculation_floor,
+        instructions=instructions
+    )
+
+
+@app.post("/api/navigation/routes", response_model=BatchNavigationResponse)
+async def calculate_routes(req: BatchNavigationRequest):
+    """
+    Routes from one start to several products (e.g. the /api/query candidates), ordered by walking cost.
+    Same-floor targets share one multi-target Dijkstra from the start (or the kiosk's cached tree);
+    cross-floor targets are answered from the floor graph.
+    """
+    if not map_navigator:
+        raise HTTPException(status_code=503, detail="Navigation service not initialized")
+
+    zones = get_zone_index()
+    start_x, start_y, start_floor = _resolve_start(req, zones)
+    floor_graph = get_floor_graph()
+
+    results, failed = [], []
+    same_floor = []  # (product_id, end node on start_floor)
+    for product_id in dict.fromkeys(req.target_product_ids):
+        try:
+            target_x, target_y, target_floor = _resolve_target(product_id, zones)
+            if target_floor != start_floor:
+                if floor_graph and floor_graph.connects(start_floor, target_floor):
+                    segments = floor_graph.route(
+                        start_floor, map_navigator.to_grid(start_floor, start_x, start_y),
+                        target_floor, map_navigator.to_grid(target_floor, target_x, target_y),
+                    )
+                    if segments is None:
+                        raise HTTPException(status_code=404, detail="No path found")
+                    route = _segments_response(segments, req.simplify)
+                    results.append((sum(seg.cost for seg in segments), product_id, route))
+                    continue
+                target_x, target_y = _nearest_connection(zones, start_floor, target_floor, start_x, start_y)
+            same_floor.append((product_id, map_navigator.to_grid(start_floor, target_x, target_y)))
+        except HTTPException as e:
+            failed.append({"product_id": product_id, "status_code": e.status_code, "detail": e.detail})
+
+    if same_floor:
+        start_node = map_navigator.get_nearest_walkable(start_floor, map_navigator.to_grid(start_floor, start_x, start_y))
+        ends = {pid: map_navigator.get_nearest_walkable(start_floor, node) for pid, node in same_floor}
+        tree = None
+        if start_node is not None:
+            route_cache = get_route_cache()
+            tree = route_cache.tree(start_floor, start_node, exact=True) if route_cache else None
+            if tree is None:
+                # One Dijkstra from the start that stops once every target is settled
+                dist, parent = map_navigator.shortest_path_tree(
+                    start_floor, start_node, targets=[e for e in ends.values() if e is not None]
+                )
+                w = map_navigator.width[start_floor]
+                tree = ShortestPathTree(start_floor, start_node[1] * w + start_node[0], w, parent, dist)
+
+        for product_id, _ in same_floor:
+            end = ends[product_id]
+            path = tree.path_to(end) if tree is not None and end is not None else None
+            if path is None:
+                failed.append({"product_id": product_id, "status_code": 404, "detail": "No path found"})
+                continue
+            points, instructions = _grid_path_to_points(start_floor, path, req.simplify)
+            route = NavigationResponse(path=points, distance=len(path) * 1.0, floor=start_floor,
+                                       instructions=instructions)
+            results.append((tree.cost_to(end), product_id, route))
+
+    results.sort(key=lambda r: r[0])
+    return BatchNavigationResponse(
+        routes=[ProductRoute(product_id=pid, cost=round(cost, 1), **route.model_dump())
+                for cost, pid, route in results],
+        failed=failed,
     )
 
 
@@ -0,0 +1,41 @@
+"""
+Async Database Facade
+Awaitable versions of the query functions in database.py for FastAPI handlers.
+Each call runs on the bounded DB thread pool (database.run_db) using the pooled
+connections, so the event loop (and the /ws/stt websocket) never waits on disk I/O.
+
+Usage:
+    from backend.database import async_db
+    product = await async_db.get_product_by_id(42)
+"""
+import functools
+
+from . import database as _db
+
+
+def _awaitable(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await _db.run_db(fn, *args, **kwargs)
+    return wrapper
+
+
+# Products
+get_product_by_id = _awaitable(_db.get_product_by_id)
+get_all_products = _awaitable(_db.get_all_products)
+get_product_count = _awaitable(_db.get_product_count)
+get_all_categories = _awaitable(_db.get_all_categories)
+product_exists = _awaitable(_db.product_exists)
+insert_product = _awaitable(_db.insert_product)
+
+# Search
+search_products = _awaitable(_db.search_products)
+search_products_or = _awaitable(_db.search_products_or)
+search_products_flexible = _awaitable(_db.search_products_flexible)
+search_products_fts = _awaitable(_db.search_products_fts)
+get_related_products_for_context = _awaitable(_db.get_related_products_for_context)
+
+# Map zones
+get_map_zones = _awaitable(_db.get_map_zones)
+save_map_zone = _awaitable(_db.save_map_zone)
+delete_map_zone = _awaitable(_db.delete_map_zone)
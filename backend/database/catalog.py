@@ -0,0 +1,161 @@
+"""
+Catalog Snapshot - in-memory, read-only copy of the products table
+Products only change when seed/crawler scripts run, so the request path reads
+this snapshot instead of SQLite:
+
+    by_id[product_id]                         -> ProductRecord
+    by_category[(category_major, middle)]     -> [ProductRecord, ...]
+    by_floor[floor]                           -> [ProductRecord, ...]
+    categories                                -> {major: [middle, ...]}  (same shape as get_all_categories)
+
+A background thread polls the products write counter (products_version table, bumped by
+triggers) and rebuilds and swaps the snapshot when it changes, so the request path never
+reads SQLite. Writes to other tables (map_zones) do not reload it. Structures derived from
+the snapshot (BM25 index, fast-NLU dictionary) register with on_catalog_reload() and are
+rebuilt on that thread before the new snapshot is published. bump_catalog_version()
+reloads synchronously.
+"""
+import threading
+from typing import Callable, List, Dict, Optional, Tuple
+
+from . import database as _db
+
+RELOAD_CHECK_INTERVAL = 1.0  # seconds between products_version checks
+
+
+class ProductRecord:
+    """Compact product row."""
+    __slots__ = (
+        "id", "rank", "name", "price", "image_url", "image_name", "image_path",
+        "category_major", "category_middle", "shelf_id", "floor",
+        "location_x", "location_y", "created_at",
+    )
+
+    def __init__(self, row: Dict):
+        for field in self.__slots__:
+            setattr(self, field, row.get(field))
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class CatalogSnapshot:
+    """Immutable product catalog with O(1) lookups."""
+
+    def __init__(self, rows: List[Dict], version: int = 0, source_version: Optional[int] = None):
+        self.version = version
+        self.source_version = source_version  # products_version counter it was read at
+        self.products: List[ProductRecord] = [ProductRecord(r) for r in rows]  # ordered by rank
+        self.by_id: Dict[int, ProductRecord] = {}
+        self.by_category: Dict[Tuple[str, str], List[ProductRecord]] = {}
+        self.by_floor: Dict[str, List[ProductRecord]] = {}
+        self.categories: Dict[str, List[str]] = {}
+
+        for p in self.products:
+            self.by_id[p.id] = p
+            if p.category_major:
+                self.by_category.setdefault((p.category_major, p.category_middle), []).append(p)
+            if p.floor:
+                self.by_floor.setdefault(p.floor, []).append(p)
+
+        for major, middle in sorted(self.by_category, key=lambda k: (k[0], k[1] or "")):
+            middles = self.categories.setdefault(major, [])
+            if middle and middle not in middles:
+                middles.append(middle)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def get_product(self, product_id: int) -> Optional[Dict]:
+        p = self.by_id.get(product_id)
+        return p.to_dict() if p else None
+
+    def get_category_products(self, major: str, middle: Optional[str] = None) -> List[Dict]:
+        if middle is not None:
+            return [p.to_dict() for p in self.by_category.get((major, middle), [])]
+        return [p.to_dict() for (mj, _), ps in self.by_category.items() if mj == major for p in ps]
+
+    def get_floor_products(self, floor: str) -> List[Dict]:
+        return [p.to_dict() for p in self.by_floor.get(floor, [])]
+
+    def to_dicts(self) -> List[Dict]:
+        return [p.to_dict() for p in self.products]
+
+
+# ─── Snapshot Holder ─────────────────────────────────────────
+_snapshot: Optional[CatalogSnapshot] = None
+_version = 0
+_reload_lock = threading.Lock()
+_listeners: List[Callable[[CatalogSnapshot], None]] = []
+_refresher: Optional[threading.Thread] = None
+_stop_refresher = threading.Event()
+
+
+def on_catalog_reload(callback: Callable[[CatalogSnapshot], None]):
+    """Call callback(new_snapshot) on every reload, before the snapshot is published."""
+    _listeners.append(callback)
+
+
+def load_catalog() -> CatalogSnapshot:
+    """(Re)load the snapshot from SQLite, rebuild registered structures and swap it in."""
+    global _snapshot, _version
+    with _reload_lock:
+        source_version = _db.get_products_version()
+        rows = _db.get_all_products()
+        _version += 1
+        snapshot = CatalogSnapshot(rows, version=_version, source_version=source_version)
+        for callback in _listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"⚠️ Catalog reload listener failed: {e}")
+        _snapshot = snapshot
+    print(f"✅ Catalog snapshot v{snapshot.version}: {len(snapshot)} products")
+    _start_refresher()
+    return snapshot
+
+
+def bump_catalog_version() -> CatalogSnapshot:
+    """Force a reload (e.g. after an in-process products write)."""
+    return load_catalog()
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Current snapshot (loaded on first use; later reloads happen on the refresher thread)."""
+    snap = _snapshot
+    return snap if snap is not None else load_catalog()
+
+
+def refresh_catalog() -> bool:
+    """Reload when the products write counter moved since the snapshot was read; True if reloaded."""
+    snap = _snapshot
+    source_version = _db.get_products_version()
+    if snap is None or source_version is None or source_version == snap.source_version:
+        return False
+    load_catalog()
+    return True
+
+
+def _refresh_loop():
+    while not _stop_refresher.wait(RELOAD_CHECK_INTERVAL):
+        try:
+            refresh_catalog()
+        except Exception as e:
+            print(f"⚠️ Catalog refresh failed: {e}")
+
+
+def _start_refresher():
+    global _refresher
+    if _refresher is None or not _refresher.is_alive():
+        _stop_refresher.clear()
+        _refresher = threading.Thread(target=_refresh_loop, name="catalog-refresh", daemon=True)
+        _refresher.start()
+
+
+def stop_catalog_refresher():
+    """Stop the polling thread (tests / shutdown)."""
+    global _refresher
+    _stop_refresher.set()
+    if _refresher is not None:
+        _refresher.join()
+        _refresher = None
@@ -1,21 +1,86 @@
 """
 Database module for Daiso Category Search
 SQLite database operations
+
+Connections are pooled: one long-lived read connection per thread and a single
+shared writer guarded by a lock, all in WAL mode so readers never block on the writer.
+Async callers run queries through run_db() on a bounded thread pool.
 """
 import sqlite3
 import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional
 
+try:
+    from .tokenizer import words
+except ImportError:  # executed as a script (python database.py)
+    from tokenizer import words
+
 # Database path - relative to this file's location
 DB_PATH = os.path.join(os.path.dirname(__file__), 'products.db')
 
-def get_connection():
-    """Get SQLite connection"""
-    conn = sqlite3.connect(DB_PATH)
+# Pool settings
+MMAP_SIZE = 64 * 1024 * 1024      # 64MB memory-mapped reads
+CACHED_STATEMENTS = 256           # prepared statements kept per connection
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", "4"))
+
+def _connect(check_same_thread: bool = True):
+    conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS,
+                           check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
     return conn
 
+def get_connection():
+    """Get a new (unpooled) SQLite connection. Caller closes it."""
+    return _connect()
+
+
+# ─── Connection Pool ─────────────────────────────────────────
+_local = threading.local()
+_writer = None
+_writer_path = None
+_write_lock = threading.Lock()
+
+def read_connection() -> sqlite3.Connection:
+    """Per-thread read connection, opened once and reused."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != DB_PATH:
+        conn = _connect()
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+@contextmanager
+def write_connection():
+    """Serialized access to the single writer connection; commits on success, rolls back on error."""
+    global _writer, _writer_path
+    with _write_lock:
+        if _writer is None or _writer_path != DB_PATH:
+            _writer = _connect(check_same_thread=False)
+            _writer_path = DB_PATH
+        try:
+            yield _writer
+            _writer.commit()
+        except Exception:
+            _writer.rollback()
+            raise
+
+
+# ─── Async Executor ──────────────────────────────────────────
+_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="sqlite")
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking database function on the bounded DB thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
 def init_database():
     """Initialize database tables"""
     conn = get_connection()
@@ -100,81 +165,117 @@ def init_database():
         except sqlite3.OperationalError as e:
             print(f"Error adding type column to map_zones: {e}")
 
+    _init_products_fts(cursor)
+    _init_products_version(cursor)
+
     conn.commit()
     conn.close()
     print(f"✅ Database initialized: {DB_PATH}")
 
+def _init_products_fts(cursor):
+    """
+    FTS5 full-text index over product names (trigram tokenizer so Korean substrings match).
+    External-content table kept in sync with `products` by triggers.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")
+    exists = cursor.fetchone() is not None
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                name, content='products', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        # SQLite < 3.34 has no trigram tokenizer; search_products_fts falls back to LIKE
+        print(f"⚠️ FTS5 trigram index unavailable: {e}")
+        return
+
+    cursor.executescript('''
+        CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name);
+        END;
+    ''')
+    if not exists:
+        print("Building products_fts index...")
+        cursor.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+def _init_products_version(cursor):
+    """
+    Single-row counter bumped by triggers on every products write. The catalog snapshot
+    reloads when it changes (writes to other tables, e.g. map_zones, leave it alone).
+    """
+    cursor.executescript('''
+        CREATE TABLE IF NOT EXISTS products_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO products_version (id, version) VALUES (1, 0);
+        CREATE TRIGGER IF NOT EXISTS products_version_ai AFTER INSERT ON products BEGIN
+            UPDATE products_version SET version = version + 1 WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS products_version_ad AFTER DELETE ON products BEGIN
+            UPDATE products_version SET version = version + 1 WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS products_version_au AFTER UPDATE ON products BEGIN
+            UPDATE products_version SET version = version + 1 WHERE id = 1;
+        END;
+    ''')
+
+def get_products_version() -> Optional[int]:
+    """Write counter of the products table (None before init_database created it)."""
+    try:
+        row = read_connection().execute('SELECT version FROM products_version WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
 def insert_product(rank: int, name: str, price: int, image_url: str, 
                    image_name: str = None, image_path: str = None,
                    category_major: str = None, category_middle: str = None,
                    shelf_id: str = None, floor: str = None,
                    location_x: int = None, location_y: int = None) -> bool:
-    conn = get_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute('''
-            INSERT OR IGNORE INTO products (
-                rank, name, price, image_url, image_name, image_path,
-                category_major, category_middle, shelf_id, floor, location_x, location_y
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (rank, name, price, image_url, image_name, image_path,
-              category_major, category_middle, shelf_id, floor, location_x, location_y))
-        conn.commit()
-        return cursor.rowcount > 0
+        with write_connection() as conn:
+            cursor = conn.execute('''
+                INSERT OR IGNORE INTO products (
+                    rank, name, price, image_url, image_name, image_path,
+                    category_major, category_middle, shelf_id, floor, location_x, location_y
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (rank, name, price, image_url, image_name, image_path,
+                  category_major, category_middle, shelf_id, floor, location_x, location_y))
+            return cursor.rowcount > 0
     except Exception as e:
         print(f"❌ Insert error: {e}")
         return False
-    finally:
-        conn.close()
 
 def get_product_count() -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM products')
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return read_connection().execute('SELECT COUNT(*) FROM products').fetchone()[0]
 
 def get_all_products() -> List[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM products ORDER BY rank')
-    rows = cursor.fetchall()
-    conn.close()
+    rows = read_connection().execute('SELECT * FROM products ORDER BY rank').fetchall()
     return [dict(row) for row in rows]
 
 def product_exists(name: str) -> bool:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT 1 FROM products WHERE name = ?', (name,))
-    exists = cursor.fetchone() is not None
-    conn.close()
-    return exists
+    return read_connection().execute('SELECT 1 FROM products WHERE name = ?', (name,)).fetchone() is not None
 
 def get_product_by_id(product_id: int) -> Optional[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
-    row = cursor.fetchone()
-    conn.close()
+    row = read_connection().execute('SELECT * FROM products WHERE id = ?', (product_id,)).fetchone()
     return dict(row) if row else None
 
 def get_utterance_count() -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM test_utterances')
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return read_connection().execute('SELECT COUNT(*) FROM test_utterances').fetchone()[0]
 
 def get_all_categories() -> Dict[str, List[str]]:
     """Get hierarchy of major -> middle categories"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT DISTINCT category_major, category_middle FROM products WHERE category_major IS NOT NULL ORDER BY category_major, category_middle')
-    rows = cursor.fetchall()
-    conn.close()
+    rows = read_connection().execute('SELECT DISTINCT category_major, category_middle FROM products WHERE category_major IS NOT NULL ORDER BY category_major, category_middle').fetchall()
     
     categories = {}
     for row in rows:
@@ -191,33 +292,26 @@ def get_all_categories() -> Dict[str, List[str]]:
 
 def search_products(keyword: str) -> List[Dict]:
     """Search products by name (simple LIKE query, AND logic)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Split keyword by spaces to support multiple terms "blue pen" -> "%blue%" AND "%pen%"
-    terms = keyword.split()
+    # Split keyword into words to support multiple terms "blue pen" -> "%blue%" AND "%pen%"
+    terms = words(keyword)
+    if not terms:
+        return []
     query = "SELECT * FROM products WHERE " + " AND ".join(["name LIKE ?"] * len(terms))
     params = [f"%{term}%" for term in terms]
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
+    rows = read_connection().execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
 
 def search_products_or(keyword: str) -> List[Dict]:
     """Search products by name (OR logic — matches ANY term)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    terms = keyword.split()
+    terms = words(keyword)
     if not terms:
-        conn.close()
         return []
     query = "SELECT * FROM products WHERE " + " OR ".join(["name LIKE ?"] * len(terms))
     params = [f"%{term}%" for term in terms]
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
+    rows = read_connection().execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
 
@@ -237,7 +331,7 @@ def search_products_flexible(keyword: str) -> List[Dict]:
         return results
     
     # 3) Try each term individually
-    terms = keyword.split()
+    terms = words(keyword)
     seen_ids = set()
     all_results = []
     for term in terms:
@@ -251,6 +345,47 @@ def search_products_flexible(keyword: str) -> List[Dict]:
     return all_results
 
 
+def search_products_fts(query: str, limit: int = 50) -> List[Dict]:
+    """
+    Ranked full-text search via the FTS5 trigram index, ordered by bm25().
+    Terms of 3+ characters are OR-ed in a single MATCH (docs matching more terms rank higher).
+    Trigram MATCH cannot see 1-2 character terms ("볼펜"), so when MATCH finds nothing
+    (or every term is short) one LIKE pass ranks rows by the number of matched terms.
+    """
+    terms = list(dict.fromkeys(words(query)))
+    if not terms:
+        return []
+
+    long_terms = [t for t in terms if len(t) >= 3]
+    cursor = read_connection().cursor()
+    rows = []
+    try:
+        if long_terms:
+            match_expr = " OR ".join('"' + t.replace('"', '""') + '"' for t in long_terms)
+            cursor.execute('''
+                SELECT p.*, bm25(products_fts) AS fts_score
+                FROM products_fts JOIN products p ON p.id = products_fts.rowid
+                WHERE products_fts MATCH ?
+                ORDER BY fts_score
+                LIMIT ?
+            ''', (match_expr, limit))
+            rows = cursor.fetchall()
+        if not rows:
+            hits = " + ".join(["(name LIKE ?)"] * len(terms))
+            cursor.execute(f'''
+                SELECT *, -({hits}) AS fts_score FROM products
+                WHERE fts_score < 0
+                ORDER BY fts_score, rank
+                LIMIT ?
+            ''', [f"%{t}%" for t in terms] + [limit])
+            rows = cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        # products_fts missing (old SQLite / init_database not run)
+        print(f"⚠️ FTS search failed ({e}), using LIKE search")
+        return search_products_flexible(query)[:limit]
+    return [dict(row) for row in rows]
+
+
 def get_related_products_for_context(keyword: str, limit: int = 5) -> str:
     """
     Search products and return a formatted string for LLM context.
@@ -269,34 +404,39 @@ def get_related_products_for_context(keyword: str, limit: int = 5) -> str:
 
 
 # Map Zone Operations
+# Bumped on every in-process zone edit so caches (navigation ZoneIndex) know to rebuild.
+_map_zones_version = 0
+
+def get_map_zones_version() -> int:
+    return _map_zones_version
+
+def _bump_map_zones_version():
+    global _map_zones_version
+    _map_zones_version += 1
+
 def get_map_zones(floor: Optional[str] = None) -> List[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
+    conn = read_connection()
     if floor:
-        cursor.execute('SELECT * FROM map_zones WHERE floor = ?', (floor,))
+        rows = conn.execute('SELECT * FROM map_zones WHERE floor = ?', (floor,)).fetchall()
     else:
-        cursor.execute('SELECT * FROM map_zones')
-    rows = cursor.fetchall()
-    conn.close()
+        rows = conn.execute('SELECT * FROM map_zones').fetchall()
     return [dict(row) for row in rows]
 
 def save_map_zone(floor: str, name: str, rect: str, color: str, zone_type: str = 'zone') -> int:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO map_zones (floor, name, rect, color, type) VALUES (?, ?, ?, ?, ?)', 
-                   (floor, name, rect, color, zone_type))
-    conn.commit()
-    last_id = cursor.lastrowid
-    conn.close()
+    with write_connection() as conn:
+        cursor = conn.execute('INSERT INTO map_zones (floor, name, rect, color, type) VALUES (?, ?, ?, ?, ?)', 
+                              (floor, name, rect, color, zone_type))
+        last_id = cursor.lastrowid
+    _bump_map_zones_version()
     return last_id
 
 def delete_map_zone(zone_id: int) -> bool:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM map_zones WHERE id = ?', (zone_id,))
-    conn.commit()
-    conn.close()
-    return cursor.rowcount > 0
+    with write_connection() as conn:
+        cursor = conn.execute('DELETE FROM map_zones WHERE id = ?', (zone_id,))
+        deleted = cursor.rowcount > 0
+    if deleted:
+        _bump_map_zones_version()
+    return deleted
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+Lexical Index - In-process BM25 over the products table
+Built from the catalog snapshot (at API startup or on first use) and rebuilt when the
+snapshot version changes; queries never touch the database.
+
+    term -> posting list [(doc_idx, tf), ...]
+    doc_idx -> product row, document length
+    term -> idf (precomputed)
+"""
+import math
+import heapq
+import threading
+from typing import List, Dict, Optional, Tuple
+
+from .catalog import on_catalog_reload
+from .tokenizer import tokenize
+
+
+class BM25Index:
+    """Okapi BM25 inverted index over product names."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: List[Dict] = []
+        self._doc_len: List[int] = []
+        self._norm: List[float] = []          # k1 * (1 - b + b * dl / avgdl), per doc
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._idf: Dict[str, float] = {}
+        self._avgdl = 0.0
+
+    def build(self, products: List[Dict]) -> "BM25Index":
+        docs, doc_len = [], []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for p in products:
+            tokens = tokenize(p.get("name", ""))
+            if not tokens:
+                continue
+            doc_idx = len(docs)
+            docs.append(p)
+            doc_len.append(len(tokens))
+
+            tf: Dict[str, int] = {}
+            for t in tokens:
+                tf[t] = tf.get(t, 0) + 1
+            for term, freq in tf.items():
+                postings.setdefault(term, []).append((doc_idx, freq))
+
+        n = len(docs)
+        avgdl = (sum(doc_len) / n) if n else 0.0
+
+        self._docs = docs
+        self._doc_len = doc_len
+        self._avgdl = avgdl
+        self._norm = [self.k1 * (1 - self.b + self.b * dl / avgdl) for dl in doc_len] if n else []
+        self._postings = postings
+        # Lucene-style idf (always positive)
+        self._idf = {
+            term: math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in postings.items()
+        }
+        return self
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """Return {doc_idx: bm25_score} for every document matching at least one query term."""
+        scores: Dict[int, float] = {}
+        k1_plus_1 = self.k1 + 1
+        norm = self._norm
+        for term in set(tokenize(query)):
+            plist = self._postings.get(term)
+            if not plist:
+                continue
+            idf = self._idf[term]
+            for doc_idx, tf in plist:
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + idf * tf * k1_plus_1 / (tf + norm[doc_idx])
+        return scores
+
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """Ranked search. Returns product dicts with an added 'bm25_score'."""
+        scores = self.score(query)
+        if not scores:
+            return []
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [dict(self._docs[doc_idx], bm25_score=round(s, 4)) for doc_idx, s in top]
+
+
+# Singleton (tied to a catalog snapshot version)
+_index_instance: Optional[BM25Index] = None
+_index_version = -1
+_index_lock = threading.Lock()
+
+
+def get_lexical_index() -> BM25Index:
+    """Return the process-wide BM25 index, (re)building it when the catalog snapshot changed."""
+    global _index_instance, _index_version
+    from .catalog import get_catalog
+    catalog = get_catalog()
+    if _index_instance is None or _index_version < catalog.version:
+        with _index_lock:
+            if _index_instance is None or _index_version < catalog.version:
+                _index_instance = _build(catalog)
+                _index_version = catalog.version
+    return _index_instance
+
+
+def rebuild_lexical_index() -> BM25Index:
+    """Reload the catalog and rebuild the index (call after seed/crawler scripts changed products)."""
+    from .catalog import bump_catalog_version
+    bump_catalog_version()
+    return get_lexical_index()
+
+
+def _build(catalog) -> BM25Index:
+    index = BM25Index().build(catalog.to_dicts())
+    print(f"✅ Lexical index built: {len(index)} products, {len(index._postings)} terms")
+    return index
+
+
+def _rebuild_on_reload(catalog):
+    """Catalog refresher thread: rebuild an index in use before the new snapshot goes live."""
+    global _index_instance, _index_version
+    if _index_instance is None:
+        return
+    index = _build(catalog)
+    with _index_lock:
+        _index_instance, _index_version = index, catalog.version
+
+
+on_catalog_reload(_rebuild_on_reload)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    idx = get_lexical_index()
+    for q in sys.argv[1:] or ["볼펜", "욕실 매트", "충전 케이블"]:
+        t0 = time.perf_counter()
+        hits = idx.search(q, limit=5)
+        us = (time.perf_counter() - t0) * 1e6
+        print(f"'{q}' ({us:.0f}us) → {[(h['name'], h['bm25_score']) for h in hits]}")
@@ -0,0 +1,84 @@
+"""
+Korean Tokenizer - shared by every lexical search path
+(backend BM25 index, SQLite LIKE search, poc/lyg ivhl LocalBM25)
+
+Whitespace splitting misses compounds ("욕실매트" vs "욕실 매트"), so Hangul runs
+are additionally indexed as syllable bigrams/trigrams:
+
+    "욕실매트"  → 욕실매트, 욕실, 실매, 매트, 욕실매, 실매트
+    "욕실 매트" → 욕실, 매트
+
+Both share 욕실/매트, so either spelling matches the other in a single BM25 pass.
+Optional jamo decomposition adds jamo trigrams for typo tolerance ("매투" ~ "매트").
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+_RUN_RE = re.compile(r"[가-힣]+|[0-9a-z]+")  # script runs inside a word ("usb충전기" → usb, 충전기)
+
+# Hangul syllable decomposition (U+AC00 .. U+D7A3)
+_HANGUL_BASE = 0xAC00
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+NGRAM_SIZES = (2, 3)
+JAMO_PREFIX = "#"  # keeps jamo grams from colliding with syllable grams
+
+
+def words(text: str) -> List[str]:
+    """Lowercased word-level split (Latin/digit/Hangul runs)."""
+    return _WORD_RE.findall((text or "").lower())
+
+
+def to_jamo(text: str) -> str:
+    """Decompose Hangul syllables into jamo; other characters pass through."""
+    out = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code < 11172:
+            cho, rest = divmod(code, 588)
+            jung, jong = divmod(rest, 28)
+            out.append(_CHOSEONG[cho])
+            out.append(_JUNGSEONG[jung])
+            if jong:
+                out.append(_JONGSEONG[jong])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _ngrams(run: str, sizes: Tuple[int, ...]) -> List[str]:
+    grams = []
+    for n in sizes:
+        if len(run) > n:  # len == n is the word itself
+            grams.extend(run[i:i + n] for i in range(len(run) - n + 1))
+    return grams
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_cached(text: str, jamo: bool) -> Tuple[str, ...]:
+    tokens: List[str] = []
+    for word in words(text):
+        tokens.append(word)
+        for run in _RUN_RE.findall(word):
+            if run != word:
+                tokens.append(run)
+            if not ("가" <= run[0] <= "힣"):
+                continue
+            tokens.extend(_ngrams(run, NGRAM_SIZES))
+            if jamo and len(run) > 1:
+                tokens.extend(JAMO_PREFIX + g for g in _ngrams(to_jamo(run), (3,)))
+    return tuple(tokens)
+
+
+def tokenize(text: str, jamo: bool = False) -> List[str]:
+    """
+    Index/query terms: whole words, their script runs, plus syllable bigrams/trigrams of Hangul runs
+    (plus jamo trigrams when jamo=True). Results are LRU-cached per input string.
+    """
+    if not text:
+        return []
+    return list(_tokenize_cached(text, jamo))
@@ -0,0 +1,87 @@
+"""
+Pathfinder Benchmark - times MapNavigator.find_path on the real floor grids and a synthetic grid
+
+    python -m backend.navigation.benchmark_pathfinder [--runs 20] [--size 1000]
+
+Real grids are loaded from navigation/grids/ (.npz or .json) (zone obstacles are not applied, so the
+database is never opened). The synthetic grid is a size x size open floor with shelf rows.
+"""
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .pathfinder import MapNavigator
+    from .grid_store import find_grid_file, load_grid_file
+except ImportError:
+    from pathfinder import MapNavigator
+    from grid_store import find_grid_file, load_grid_file
+
+GRIDS_DIR = Path(__file__).parent / "grids"
+
+
+def synthetic_grid(size: int) -> np.ndarray:
+    """Open floor with horizontal shelf rows (gaps every 50 cells) - a store-like worst case."""
+    grid = np.zeros((size, size), dtype=np.uint8)
+    for y in range(20, size - 20, 20):
+        grid[y:y + 4, 10:size - 10] = 1
+        for gap in range(30, size - 30, 50):
+            grid[y:y + 4, gap:gap + 6] = 0
+    return grid
+
+
+def random_walkable(navigator: MapNavigator, floor: str, rng: random.Random):
+    grid = navigator.grids[floor]
+    ys, xs = np.nonzero(grid == 0)
+    i = rng.randrange(len(xs))
+    return int(xs[i]), int(ys[i])
+
+
+def bench_floor(navigator: MapNavigator, floor: str, runs: int, seed: int = 0):
+    rng = random.Random(seed)
+    pairs = [(random_walkable(navigator, floor, rng), random_walkable(navigator, floor, rng)) for _ in range(runs)]
+    times, lengths = [], []
+    for start, end in pairs:
+        t0 = time.perf_counter()
+        path = navigator.find_path(floor, start, end)
+        times.append((time.perf_counter() - t0) * 1000)
+        lengths.append(len(path) if path else 0)
+    h, w = navigator.grids[floor].shape
+    print(f"{floor:>10} {w}x{h}: median {statistics.median(times):8.2f}ms  "
+          f"max {max(times):8.2f}ms  avg path {statistics.mean(lengths):7.1f} cells  ({runs} routes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark A* route calculation")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--size", type=int, default=1000, help="synthetic grid side length")
+    args = parser.parse_args()
+
+    navigator = MapNavigator()
+    for name in ("B1", "B2"):
+        path = find_grid_file(GRIDS_DIR, name.lower())
+        if not path:
+            print(f"⚠️ No grid file for {name} in {GRIDS_DIR}, skipping")
+            continue
+        navigator.load_grid(name, load_grid_file(path).grid)
+        navigator.update_obstacles(name, [])  # distance map -> centering penalty, as at API startup
+        bench_floor(navigator, name, args.runs)
+
+    t0 = time.perf_counter()
+    navigator.load_grid("synthetic", synthetic_grid(args.size))
+    navigator.update_obstacles("synthetic", [])
+    print(f"Synthetic {args.size}x{args.size} grid prepared in {(time.perf_counter() - t0) * 1000:.0f}ms")
+    bench_floor(navigator, "synthetic", max(1, args.runs // 4))
+
+    # Large floors route through the HPA* cluster graph; compare with exact A*
+    if navigator.hierarchies.pop("synthetic", None) is not None:
+        print("(above: HPA*; below: exact A*)")
+        bench_floor(navigator, "synthetic", max(1, args.runs // 4))
+
+
+if __name__ == "__main__":
+    main()
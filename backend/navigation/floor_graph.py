@@ -0,0 +1,214 @@
+"""
+Floor Graph - layered multi-floor routing over connection zones
+Each connection zone (type='connection') is a portal. Portals with the same name on
+different floors (e.g. 'Elevator' on B1 and B2) are linked with a transfer cost, and
+portals on the same floor are linked by their walking cost. A full route is a small
+Dijkstra over the portals:
+
+    start ──walk──▶ portal (start floor) ──transfer──▶ portal (next floor) ──walk──▶ target
+
+Walking costs come from the route cache's per-connection shortest-path trees, so a
+multi-floor query is a handful of array lookups plus the parent-pointer walks for the
+chosen legs. Costs use the pathfinder's units (10 per cell + centering penalty).
+"""
+import heapq
+import math
+import threading
+from typing import List, Dict, Optional, Tuple
+
+DEFAULT_TRANSFER_COST = 200.0
+TRANSFER_COSTS = {  # keyword in connection name (lowercase) -> transfer cost
+    "elevator": 300.0, "엘리베이터": 300.0,
+    "escalator": 150.0, "에스컬레이터": 150.0,
+    "stair": 200.0, "계단": 200.0,
+}
+
+
+def transfer_cost(name: Optional[str]) -> float:
+    """Cost of changing floors through a connection, by the kind named in the zone name."""
+    lowered = (name or "").lower()
+    for keyword, cost in TRANSFER_COSTS.items():
+        if keyword in lowered:
+            return cost
+    return DEFAULT_TRANSFER_COST
+
+
+class Portal:
+    """A connection zone with its precomputed shortest-path tree."""
+    __slots__ = ("zone", "floor", "node", "tree", "cost_grid")
+
+    def __init__(self, zone, node: Tuple[int, int], tree, cost_grid):
+        self.zone = zone
+        self.floor = zone.floor
+        self.node = node
+        self.tree = tree
+        self.cost_grid = cost_grid
+
+    def cost_to(self, node: Tuple[int, int]) -> float:
+        """Walking cost portal -> node."""
+        return self.tree.cost_to(node)
+
+    def cost_from(self, node: Tuple[int, int]) -> float:
+        """
+        Walking cost node -> portal. Moves are charged on the cell entered, so reversing a path
+        swaps which endpoint is charged: cost(a->b) = cost(b->a) - cell_cost[a] + cell_cost[b].
+        """
+        d = self.tree.cost_to(node)
+        if not math.isfinite(d):
+            return d
+        w = self.tree.width
+        return d - self.cost_grid[node[1] * w + node[0]] + self.cost_grid[self.tree.source]
+
+    def path_to(self, node: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        return self.tree.path_to(node)
+
+    def path_from(self, node: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        path = self.tree.path_to(node)
+        return path[::-1] if path else None
+
+
+class RouteSegment:
+    """Part of a route on one floor; `connection` is the portal taken at its end (None on the last floor)."""
+    __slots__ = ("floor", "path", "cost", "connection")
+
+    def __init__(self, floor: str, path: List[Tuple[int, int]], cost: float, connection: Optional[str] = None):
+        self.floor = floor
+        self.path = path
+        self.cost = cost
+        self.connection = connection
+
+
+class FloorGraph:
+    """Portals and their links, built from the zone index and route cache."""
+
+    def __init__(self, route_cache, zone_index):
+        self.version = zone_index.version
+        self.navigator = route_cache.navigator
+        self.portals: List[Portal] = []
+        self.by_floor: Dict[str, List[int]] = {}
+        self.links: Dict[int, List[Tuple[int, float]]] = {}
+
+        nav = self.navigator
+        for floor in nav.grids:
+            for zone in zone_index.on_floor("connection", floor):
+                if not zone.center:
+                    continue
+                tree = route_cache.tree(floor, nav.to_grid(floor, *zone.center), exact=True)
+                if tree is None:
+                    continue
+                y, x = divmod(tree.source, tree.width)
+                self.by_floor.setdefault(floor, []).append(len(self.portals))
+                self.portals.append(Portal(zone, (x, y), tree, nav.cost_grids[floor]))
+
+        # Intra-floor walking links and same-name transfer links
+        by_name: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.portals):
+            edges = self.links.setdefault(i, [])
+            for j in self.by_floor[p.floor]:
+                if j != i:
+                    d = p.cost_to(self.portals[j].node)
+                    if math.isfinite(d):
+                        edges.append((j, d))
+            by_name.setdefault(p.zone.name, []).append(i)
+        for group in by_name.values():
+            for i in group:
+                for j in group:
+                    if self.portals[i].floor != self.portals[j].floor:
+                        self.links[i].append((j, transfer_cost(self.portals[i].zone.name)))
+
+    def connects(self, floor_a: str, floor_b: str) -> bool:
+        return any(
+            self.portals[j].floor == floor_b
+            for i in self.by_floor.get(floor_a, ()) for j, _ in self.links[i]
+        )
+
+    def route(self, start_floor: str, start: Tuple[int, int],
+              target_floor: str, target: Tuple[int, int]) -> Optional[List[RouteSegment]]:
+        """Cheapest route across floors as per-floor segments, or None if no portal chain connects them."""
+        nav = self.navigator
+        if start_floor not in nav.grids or target_floor not in nav.grids:
+            return None
+        start = nav.get_nearest_walkable(start_floor, start)
+        target = nav.get_nearest_walkable(target_floor, target)
+        if start is None or target is None:
+            return None
+
+        # Dijkstra over portals, seeded with the walk from start to each start-floor portal
+        dist: Dict[int, float] = {}
+        prev: Dict[int, Optional[int]] = {}
+        heap = []
+        for i in self.by_floor.get(start_floor, ()):
+            d = self.portals[i].cost_from(start)
+            if math.isfinite(d):
+                dist[i], prev[i] = d, None
+                heap.append((d, i))
+        heapq.heapify(heap)
+        done = set()
+        while heap:
+            d, i = heapq.heappop(heap)
+            if i in done:
+                continue
+            done.add(i)
+            for j, w in self.links[i]:
+                nd = d + w
+                if nd < dist.get(j, math.inf):
+                    dist[j], prev[j] = nd, i
+                    heapq.heappush(heap, (nd, j))
+
+        best, best_cost = None, math.inf
+        for i in self.by_floor.get(target_floor, ()):
+            if i in dist:
+                total = dist[i] + self.portals[i].cost_to(target)
+                if total < best_cost:
+                    best, best_cost = i, total
+        if best is None:
+            return None
+
+        chain = []
+        i = best
+        while i is not None:
+            chain.append(i)
+            i = prev[i]
+        chain.reverse()
+        return self._segments(chain, start_floor, start, target)
+
+    def _segments(self, chain: List[int], start_floor: str, start: Tuple[int, int],
+                  target: Tuple[int, int]) -> List[RouteSegment]:
+        portals = self.portals
+        first = portals[chain[0]]
+        path = first.path_from(start)
+        segments = [RouteSegment(start_floor, path, first.cost_from(start))]
+        for a, b in zip(chain, chain[1:]):
+            pa, pb = portals[a], portals[b]
+            if pa.floor == pb.floor:
+                # Walk between two portals on the same floor
+                seg = segments[-1]
+                seg.path = seg.path + pa.path_to(pb.node)[1:]
+                seg.cost += pa.cost_to(pb.node)
+            else:
+                segments[-1].connection = pa.zone.name
+                segments.append(RouteSegment(pb.floor, [pb.node], 0.0))
+        last = portals[chain[-1]]
+        seg = segments[-1]
+        seg.path = seg.path + last.path_to(target)[1:]
+        seg.cost += last.cost_to(target)
+        return segments
+
+
+# ─── Graph Holder ────────────────────────────────────────────
+_graph: Optional[FloorGraph] = None
+_lock = threading.Lock()
+
+
+def build_floor_graph(route_cache, zone_index) -> FloorGraph:
+    global _graph
+    graph = FloorGraph(route_cache, zone_index)
+    with _lock:
+        if _graph is None or graph.version >= _graph.version:
+            _graph = graph
+    print(f"✅ Floor graph built: {len(graph.portals)} portals on {len(graph.by_floor)} floors")
+    return graph
+
+
+def get_floor_graph() -> Optional[FloorGraph]:
+    return _graph
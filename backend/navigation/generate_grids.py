@@ -9,6 +9,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 FRONTEND_IMAGES_DIR = os.path.join(BASE_DIR, "frontend", "src", "assets", "images")
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "grids")
 
+GRID_SIZE = 10
+
 def generate_grids():
     log_file = os.path.join(os.path.dirname(__file__), "grid_gen_log.txt")
     with open(log_file, "w", encoding="utf-8") as log:
@@ -28,6 +30,7 @@ def generate_grids():
         for m in maps:
             img_path = os.path.join(FRONTEND_IMAGES_DIR, m['filename'])
             output_path = os.path.join(OUTPUT_DIR, f"{m['name']}_grid.json")
+            npz_path = os.path.join(OUTPUT_DIR, f"{m['name']}_grid.npz")
             
             log_print(f"Processing {m['name']} map from {img_path}...")
             
@@ -37,10 +40,11 @@ def generate_grids():
                 
             try:
                 # Grid size 10 means 1 pixel on grid = 10 pixels on map
-                processor = MapProcessor(img_path, grid_size=10)
+                processor = MapProcessor(img_path, grid_size=GRID_SIZE)
                 processor.load_and_process()
                 processor.save_grid(output_path)
-                log_print(f"✅ Saved grid to {output_path}")
+                processor.save_grid(npz_path)
+                log_print(f"✅ Saved grid to {output_path} and {npz_path}")
             except Exception as e:
                 import traceback
                 log_print(f"❌ Error processing {m['name']}: {e}")
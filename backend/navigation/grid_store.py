@@ -0,0 +1,63 @@
+"""
+Grid Store - binary navigation grid files
+`{floor}_grid.npz` holds the routing grid as a bit-packed array, so the API loads
+grids with no JSON parsing:
+
+    width, height        source map size in pixels
+    grid_size            map pixels per grid cell
+    packed               np.packbits(grid, axis=None)  (0 = walkable, 1 = obstacle)
+    shape                [rows, cols]
+
+The legacy `{floor}_grid.json` (nested grid_data list) is still readable.
+"""
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+
+class GridFile:
+    """Routing grid of one floor map."""
+
+    def __init__(self, grid: np.ndarray, grid_size: int, width: int, height: int):
+        self.grid = grid  # uint8, 0 = walkable, 1 = obstacle
+        self.grid_size = grid_size
+        self.width = width
+        self.height = height
+
+
+def save_grid_file(path: str, grid: np.ndarray, grid_size: int, width: int, height: int):
+    grid = np.asarray(grid, dtype=np.uint8)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(
+        path,
+        width=np.int32(width),
+        height=np.int32(height),
+        grid_size=np.int32(grid_size),
+        packed=np.packbits(grid != 0, axis=None),
+        shape=np.array(grid.shape, dtype=np.int32),
+    )
+
+
+def load_grid_file(path: str) -> GridFile:
+    """Load a .npz grid file, or a legacy .json grid."""
+    if str(path).endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        grid = np.array(data["grid_data"], dtype=np.uint8)
+        return GridFile(grid, data.get("grid_size", 10), data.get("width", 0), data.get("height", 0))
+
+    with np.load(path) as data:
+        rows, cols = data["shape"].tolist()
+        grid = np.unpackbits(data["packed"], count=rows * cols).reshape(rows, cols)
+        return GridFile(grid, int(data["grid_size"]), int(data["width"]), int(data["height"]))
+
+
+def find_grid_file(grids_dir, name: str) -> Optional[str]:
+    """Preferred grid file for a floor: binary .npz, falling back to legacy .json."""
+    for ext in (".npz", ".json"):
+        path = os.path.join(str(grids_dir), f"{name}_grid{ext}")
+        if os.path.exists(path):
+            return path
+    return None
@@ -3,6 +3,25 @@ import numpy as np
 import json
 import os
 
+try:
+    from .grid_store import save_grid_file
+except ImportError:
+    from grid_store import save_grid_file
+
+WALKABLE_RATIO = 0.9  # cell is walkable only if >= 90% of its pixels are white
+
+
+def block_reduce(binary: np.ndarray, grid_size: int) -> np.ndarray:
+    """
+    Mean over non-overlapping grid_size x grid_size blocks (partial blocks at the
+    right/bottom edge are dropped, as the map is cut into whole cells).
+    """
+    grid_h = binary.shape[0] // grid_size
+    grid_w = binary.shape[1] // grid_size
+    blocks = binary[:grid_h * grid_size, :grid_w * grid_size]
+    return blocks.reshape(grid_h, grid_size, grid_w, grid_size).mean(axis=(1, 3))
+
+
 class MapProcessor:
     def __init__(self, image_path: str, grid_size: int = 10):
         self.image_path = image_path
@@ -11,8 +30,10 @@ class MapProcessor:
         self.height = 0
         self.width = 0
         self.map_img = None
+        self.binary = None
 
     def load_and_process(self):
+        """Build the routing grid (self.grid_size) from the thresholded image."""
         if not os.path.exists(self.image_path):
             raise FileNotFoundError(f"Image not found: {self.image_path}")
 
@@ -28,46 +49,34 @@ class MapProcessor:
         # Assuming white/light gray background is walkable.
         # Threshold: anything lighter than 200 is walkable (255), else obstacle (0).
         # Inverted logic for grid: 0 = walkable, 1 = obstacle.
-        
+
         # Simple thresholding
         _, binary = cv2.threshold(self.map_img, 200, 255, cv2.THRESH_BINARY)
-        
-        # Create grid
-        grid_h = self.height // self.grid_size
-        grid_w = self.width // self.grid_size
-        
-        self.grid = np.zeros((grid_h, grid_w), dtype=int)
-        
-        for y in range(grid_h):
-            for x in range(grid_w):
-                # Extract cell
-                cell = binary[y*self.grid_size:(y+1)*self.grid_size, 
-                              x*self.grid_size:(x+1)*self.grid_size]
-                
-                # If cell contains significant black pixels, mark as obstacle
-                # "Significant" could be > 10% black pixels?
-                # Or if *any* pixel is an obstacle? To be safe, maybe > 30%?
-                # Obstacle pixel value is 0 (black) in 'binary' image from threshold.
-                # Walkable is 255 (white).
-                
-                # Count non-zero (white pixels)
-                white_pixels = cv2.countNonZero(cell)
-                total_pixels = cell.shape[0] * cell.shape[1]
-                
-                # If white ratio is low, it's an obstacle.
-                # obstacle if < 90% white? meaning > 10% black.
-                if (white_pixels / total_pixels) < 0.9:
-                    self.grid[y, x] = 1 # Obstacle
-                else:
-                    self.grid[y, x] = 0 # Walkable
-
-        print(f"Grid generated: {grid_w}x{grid_h}")
+        self.binary = binary
+
+        self.grid = self.process_resolution(self.grid_size)
+
+        grid_h, grid_w = self.grid.shape
+        print(f"Grid generated: {grid_w}x{grid_h} (grid_size={self.grid_size})")
         return self.grid
 
+    def process_resolution(self, grid_size: int) -> np.ndarray:
+        """Grid at grid_size: obstacle (1) if < 90% of the cell's pixels are white."""
+        if self.binary is None:
+            raise ValueError("Map not loaded. Call load_and_process() first.")
+        white_ratio = block_reduce(self.binary != 0, grid_size)
+        return (white_ratio < WALKABLE_RATIO).astype(np.uint8)
+
     def save_grid(self, output_path: str):
+        """Save as .npz (bit-packed) or legacy .json."""
         if self.grid is None:
             raise ValueError("Grid not generated. Call load_and_process() first.")
-        
+
+        if output_path.endswith(".npz"):
+            save_grid_file(output_path, self.grid, self.grid_size, self.width, self.height)
+            print(f"Grid saved to {output_path}")
+            return
+
         # Save as JSON
         data = {
             "width": self.width,
@@ -77,7 +86,7 @@ class MapProcessor:
             "grid_rows": self.grid.shape[0],
             "grid_data": self.grid.tolist()
         }
-        
+
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         with open(output_path, 'w') as f:
             json.dump(data, f)
@@ -88,7 +97,7 @@ if __name__ == "__main__":
     # Adjust path as needed for local testing
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
     img_path = os.path.join(base_dir, "frontend", "src", "assets", "images", "map_b1.jpg")
-    
+
     if os.path.exists(img_path):
         processor = MapProcessor(img_path, grid_size=20)
         grid = processor.load_and_process()
@@ -1,22 +1,418 @@
 import heapq
+import json
 import math
+from array import array
+from collections import deque
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
+
+try:
+    import cv2
+except ImportError:  # OpenCV is optional here; distance_transform_l1 has a NumPy path
+    cv2 = None
+
+try:
+    from scipy.sparse import csr_matrix as _csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _sp_dijkstra
+except ImportError:  # ClusterGraph falls back to a pure Python local search
+    _csr_matrix = _sp_dijkstra = None
+
+STRAIGHT_COST = 10       # cost of one 4-connected move (before centering penalty)
+HEURISTIC_WEIGHT = 10    # heuristic = HEURISTIC_WEIGHT * Manhattan distance
+INF = float('inf')
+CENTERING_DIST = 10      # cells; the centering penalty only depends on distances below this
+
+HPA_CLUSTER_SIZE = 32    # cells per cluster side for hierarchical search
+HPA_MIN_CELLS = 250_000  # floors at least this large (e.g. 500x500) route through the cluster graph
+HPA_ENTRANCE_SPLIT = 6   # entrances at least this wide get a transition at each end
+
+
+def _l1_transform_1d(g: np.ndarray, axis: int) -> np.ndarray:
+    """Exact 1-D L1 distance transform along `axis`: f[i] = min_j (g[j] + |i - j|)."""
+    n = g.shape[axis]
+    shape = [1, 1]
+    shape[axis] = n
+    idx = np.arange(n, dtype=g.dtype).reshape(shape)
+    forward = np.minimum.accumulate(g - idx, axis=axis) + idx
+    backward = np.flip(np.minimum.accumulate(np.flip(g + idx, axis=axis), axis=axis), axis=axis) - idx
+    return np.minimum(forward, backward)
+
+
+def distance_transform_l1(grid: np.ndarray) -> np.ndarray:
+    """
+    4-connected (Manhattan) distance from every cell to the nearest obstacle (grid == 1).
+    Same values as a BFS seeded from all obstacles; cells with no obstacle on the floor get a large value.
+    """
+    h, w = grid.shape
+    if h == 0 or w == 0:
+        return np.zeros((h, w), dtype=np.float32)
+    if cv2 is not None:
+        walkable = (grid == 0).astype(np.uint8)  # distanceTransform measures distance to zero pixels
+        return cv2.distanceTransform(walkable, cv2.DIST_L1, 3).astype(np.float32)
+    # L1 is separable: transform rows, then columns
+    big = np.float32(h + w)
+    g = np.where(grid != 0, np.float32(0), big).astype(np.float32)
+    return _l1_transform_1d(_l1_transform_1d(g, axis=1), axis=0)
+
+
+def _cell_costs(grid: np.ndarray, dist: Optional[np.ndarray]) -> np.ndarray:
+    """Cost of entering each cell: 10 + centering penalty, -1 for obstacles."""
+    if dist is not None:
+        # Penalty for being close to obstacles (Centering):
+        # (max_d - min(dist, max_d)) * weight, max useful dist 10, weight 2.0
+        max_d = float(CENTERING_DIST)
+        penalty = (max_d - np.minimum(dist, max_d)) * 2.0
+        cost = STRAIGHT_COST + penalty.astype(np.float64)
+    else:
+        cost = np.full(grid.shape, float(STRAIGHT_COST))
+    cost[grid != 0] = -1.0
+    return cost
+
+
+def _union_box(boxes: List[Tuple[int, int, int, int]]) -> Optional[Tuple[int, int, int, int]]:
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def parse_zone_rect(rect) -> Optional[Dict]:
+    """Zone rect as a dict with left/top/width/height (JSON string, dict, or "k: v, ..." string)."""
+    if isinstance(rect, dict):
+        return rect
+    if isinstance(rect, list):
+        return None  # polygon zones are not rasterized as obstacles
+    try:
+        return json.loads(rect)
+    except (ValueError, TypeError):
+        # Fallback manual parsing: "left: 10%, top: 20%, width: 5%, height: 10%"
+        r = {}
+        for p in rect.split(','):
+            k, v = p.split(':')
+            r[k.strip()] = v.strip()
+        return r
+
+
+class ClusterGraph:
+    """
+    HPA* abstraction of one floor (hierarchical pathfinding over fixed-size clusters).
+
+    The grid is cut into cluster_size x cluster_size clusters. Along every shared border,
+    each maximal run of cells walkable on both sides is an entrance with one transition
+    (two, at the run ends, for long runs). Transition cells are the abstract nodes:
+        inter edges: across a border (cost of the entered cell)
+        intra edges: node to node inside one cluster (shortest path confined to the cluster)
+    A query links start/goal into their clusters, runs A* on the abstract graph and refines
+    each hop with a search confined to a single cluster. Paths are near-optimal.
+    """
+
+    def __init__(self, cost: array, width: int, height: int, cluster_size: int = HPA_CLUSTER_SIZE):
+        self.w, self.h, self.cs = width, height, cluster_size
+        self.cols = -(-width // cluster_size)
+        self.rows = -(-height // cluster_size)
+        self.cost = cost
+        self.transitions: Dict[Tuple[int, str], List[Tuple[int, int]]] = {}  # (cluster, 'E'|'S') -> [(cell, cell across)]
+        self.intra: Dict[int, Dict[int, Dict[int, float]]] = {}  # cluster -> node -> {node: cost}
+        self.inter: Dict[int, List[Tuple[int, float]]] = {}      # node -> [(node across border, cost)]
+        self._matrices: Dict[int, object] = {}                   # cluster -> local sparse graph (scipy)
+        self.rebuild()
+
+    def __len__(self) -> int:
+        return self.rows * self.cols
+
+    def rebuild(self):
+        self._matrices.clear()
+        for cid in range(len(self)):
+            self._build_borders(cid)
+        for cid in range(len(self)):
+            self._build_intra(cid)
+        self._link()
+
+    def update(self, cost: array, boxes: List[Tuple[int, int, int, int]]) -> int:
+        """
+        Refresh after cell costs changed inside `boxes` (x1, y1, x2, y2, exclusive ends).
+        Only touched clusters and their direct neighbours are recomputed; returns how many.
+        """
+        self.cost = cost
+        cs, cols = self.cs, self.cols
+        dirty = set()
+        for x1, y1, x2, y2 in boxes:
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(self.w, x2), min(self.h, y2)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            for cy in range(y1 // cs, (y2 - 1) // cs + 1):
+                for cx in range(x1 // cs, (x2 - 1) // cs + 1):
+                    dirty.add(cy * cols + cx)
+        if not dirty:
+            return 0
+
+        affected = set(dirty)
+        for cid in dirty:
+            self._matrices.pop(cid, None)
+            cy, cx = divmod(cid, cols)
+            self._build_borders(cid)
+            if cx > 0:
+                self._build_borders(cid - 1)
+                affected.add(cid - 1)
+            if cy > 0:
+                self._build_borders(cid - cols)
+                affected.add(cid - cols)
+            if cx + 1 < cols:
+                affected.add(cid + 1)
+            if cy + 1 < self.rows:
+                affected.add(cid + cols)
+        for cid in affected:
+            self._build_intra(cid)
+        self._link()
+        return len(affected)
+
+    # ─── Construction ────────────────────────────────────────
+    def cluster_of(self, cell: int) -> int:
+        y, x = divmod(cell, self.w)
+        return (y // self.cs) * self.cols + x // self.cs
+
+    def _bounds(self, cid: int) -> Tuple[int, int, int, int]:
+        cy, cx = divmod(cid, self.cols)
+        x0, y0 = cx * self.cs, cy * self.cs
+        return x0, y0, min(x0 + self.cs, self.w), min(y0 + self.cs, self.h)
+
+    def _build_borders(self, cid: int):
+        x0, y0, x1, y1 = self._bounds(cid)
+        w = self.w
+        if x1 < w:
+            self.transitions[(cid, 'E')] = self._entrances([(y * w + x1 - 1, y * w + x1) for y in range(y0, y1)])
+        if y1 < self.h:
+            self.transitions[(cid, 'S')] = self._entrances([((y1 - 1) * w + x, y1 * w + x) for x in range(x0, x1)])
+
+    def _entrances(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        cost = self.cost
+        out, run = [], []
+        for a, b in pairs + [(-1, -1)]:
+            if a >= 0 and cost[a] >= 0 and cost[b] >= 0:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) >= HPA_ENTRANCE_SPLIT:
+                    out += [run[0], run[-1]]
+                else:
+                    out.append(run[len(run) // 2])
+                run = []
+        return out
+
+    def _nodes(self, cid: int) -> List[int]:
+        cy, cx = divmod(cid, self.cols)
+        t = self.transitions
+        nodes = [a for a, _ in t.get((cid, 'E'), ())] + [a for a, _ in t.get((cid, 'S'), ())]
+        if cx > 0:
+            nodes += [b for _, b in t.get((cid - 1, 'E'), ())]
+        if cy > 0:
+            nodes += [b for _, b in t.get((cid - self.cols, 'S'), ())]
+        return list(dict.fromkeys(nodes))
+
+    def _build_intra(self, cid: int):
+        nodes = self._nodes(cid)
+        edges: Dict[int, Dict[int, float]] = {n: {} for n in nodes}
+        if len(nodes) > 1:
+            dist, _ = self._local(cid, nodes)
+            local = [self._to_local(cid, n) for n in nodes]
+            for i, a in enumerate(nodes):
+                for j, b in enumerate(nodes):
+                    d = dist[i][local[j]]
+                    if i != j and d != INF:
+                        edges[a][b] = float(d)
+        self.intra[cid] = edges
+
+    def _link(self):
+        cost = self.cost
+        inter: Dict[int, List[Tuple[int, float]]] = {}
+        for pairs in self.transitions.values():
+            for a, b in pairs:
+                inter.setdefault(a, []).append((b, cost[b]))
+                inter.setdefault(b, []).append((a, cost[a]))
+        self.inter = inter
+
+    # ─── Local search (confined to one cluster) ──────────────
+    def _to_local(self, cid: int, cell: int) -> int:
+        x0, y0, x1, _ = self._bounds(cid)
+        y, x = divmod(cell, self.w)
+        return (y - y0) * (x1 - x0) + (x - x0)
+
+    def _to_global(self, cid: int, local: int) -> int:
+        x0, y0, x1, _ = self._bounds(cid)
+        ly, lx = divmod(local, x1 - x0)
+        return (y0 + ly) * self.w + x0 + lx
+
+    def _local(self, cid: int, sources: List[int], predecessors: bool = False):
+        """Dijkstra inside cluster `cid` from each source cell -> (dist[k][n], pred[k][n] or None), local indices."""
+        local_src = [self._to_local(cid, s) for s in sources]
+        if _sp_dijkstra is not None:
+            matrix = self._matrices.get(cid)
+            if matrix is None:
+                matrix = self._matrices[cid] = self._local_matrix(cid)
+            if predecessors:
+                return _sp_dijkstra(matrix, directed=True, indices=local_src, return_predecessors=True)
+            return _sp_dijkstra(matrix, directed=True, indices=local_src), None
+
+        # Pure Python fallback
+        x0, y0, x1, y1 = self._bounds(cid)
+        cw, ch = x1 - x0, y1 - y0
+        w = self.w
+        cost = [self.cost[(y0 + i // cw) * w + x0 + i % cw] for i in range(cw * ch)]
+        dists, preds = [], []
+        for s in local_src:
+            dist = [INF] * (cw * ch)
+            pred = [-9999] * (cw * ch)
+            dist[s] = 0.0
+            heap = [(0.0, s)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                ly, lx = divmod(u, cw)
+                for v in (u + cw if ly + 1 < ch else -1, u - cw if ly > 0 else -1,
+                          u + 1 if lx + 1 < cw else -1, u - 1 if lx > 0 else -1):
+                    if v >= 0 and cost[v] >= 0 and d + cost[v] < dist[v]:
+                        dist[v] = d + cost[v]
+                        pred[v] = u
+                        heapq.heappush(heap, (dist[v], v))
+            dists.append(dist)
+            preds.append(pred)
+        return dists, (preds if predecessors else None)
+
+    def _local_matrix(self, cid: int):
+        x0, y0, x1, y1 = self._bounds(cid)
+        cost = np.frombuffer(self.cost, dtype=np.float64).reshape(self.h, self.w)[y0:y1, x0:x1].ravel()
+        idx = np.arange(cost.size).reshape(y1 - y0, x1 - x0)
+        walkable = cost >= 0
+        rows, cols, data = [], [], []
+        for src, dst in ((idx[:, :-1], idx[:, 1:]), (idx[:-1, :], idx[1:, :])):
+            both = walkable[src] & walkable[dst]
+            s, d = src[both], dst[both]
+            rows += [s, d]
+            cols += [d, s]
+            data += [cost[d], cost[s]]  # edge weight = cost of the entered cell
+        return _csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(cost.size, cost.size),
+        )
+
+    def _refine(self, cid: int, a: int, b: int) -> Optional[List[int]]:
+        """Cell path a -> b inside cluster `cid`."""
+        _, pred = self._local(cid, [a], predecessors=True)
+        pred = pred[0]
+        cur, start = self._to_local(cid, b), self._to_local(cid, a)
+        path = [cur]
+        while cur != start:
+            cur = int(pred[cur])
+            if cur < 0:
+                return None
+            path.append(cur)
+        path.reverse()
+        return [self._to_global(cid, c) for c in path]
+
+    # ─── Query ───────────────────────────────────────────────
+    def find_path(self, source: int, target: int) -> Optional[List[int]]:
+        """Cell path source -> target (both walkable), or None."""
+        cost, w = self.cost, self.w
+        s_c, t_c = self.cluster_of(source), self.cluster_of(target)
+        ds = self._local(s_c, [source])[0][0]
+        dt = self._local(t_c, [target])[0][0]
+
+        # Direct path inside a shared cluster; the abstract search must beat it
+        best = float(ds[self._to_local(s_c, target)]) if s_c == t_c else INF
+        best_node = None
+
+        # Walking node -> target is the reverse search with the endpoint charges swapped
+        goal_cost = {}
+        for n in self.intra[t_c]:
+            d = dt[self._to_local(t_c, n)]
+            if d != INF:
+                goal_cost[n] = d - cost[n] + cost[target]
+
+        tx, ty = target % w, target // w
+        g: Dict[int, float] = {}
+        parent: Dict[int, int] = {}
+        heap = []
+        for n in self.intra[s_c]:
+            d = ds[self._to_local(s_c, n)]
+            if d != INF:
+                g[n], parent[n] = float(d), -1
+                heap.append((d + HEURISTIC_WEIGHT * (abs(n % w - tx) + abs(n // w - ty)), float(d), n))
+        heapq.heapify(heap)
+
+        closed = set()
+        while heap:
+            f, d, n = heapq.heappop(heap)
+            if f >= best:
+                break
+            if n in closed:
+                continue
+            closed.add(n)
+            if n in goal_cost and d + goal_cost[n] < best:
+                best, best_node = d + goal_cost[n], n
+            for m, step in list(self.intra[self.cluster_of(n)].get(n, {}).items()) + self.inter.get(n, []):
+                nd = d + step
+                if nd < g.get(m, INF):
+                    g[m], parent[m] = nd, n
+                    heapq.heappush(heap, (nd + HEURISTIC_WEIGHT * (abs(m % w - tx) + abs(m // w - ty)), nd, m))
+
+        if best == INF:
+            return None
+        if best_node is None:
+            return self._refine(s_c, source, target)
+
+        chain = [best_node]
+        while parent[chain[-1]] != -1:
+            chain.append(parent[chain[-1]])
+        hops = [source] + chain[::-1] + [target]
+
+        cells = [source]
+        for a, b in zip(hops, hops[1:]):
+            if a == b:
+                continue
+            ca, cb = self.cluster_of(a), self.cluster_of(b)
+            if ca != cb:
+                cells.append(b)  # inter edge: neighbouring cells across a border
+            else:
+                cells.extend(self._refine(ca, a, b)[1:])
+        return cells
+
+
 class MapNavigator:
     def __init__(self):
-        self.grids: Dict[str, List[List[int]]] = {} # floor -> grid
-        self.width: Dict[str, int] = {}
+        self.grids: Dict[str, np.ndarray] = {} # floor -> uint8 grid (0=walkable, 1=obstacle)
+        self.base_grids: Dict[str, np.ndarray] = {} # floor -> pristine grid as loaded (before zones)
+        self.zone_counts: Dict[str, np.ndarray] = {} # floor -> number of zone boxes covering each cell
+        self.zone_boxes: Dict[str, Dict] = {} # floor -> zone id -> applied grid box
         self.width: Dict[str, int] = {}
         self.height: Dict[str, int] = {}
-        self.distance_grids: Dict[str, List[List[float]]] = {} # floor -> distance map
+        self.distance_grids: Dict[str, np.ndarray] = {} # floor -> float32 distance map
+        self.cost_grids: Dict[str, array] = {} # floor -> flat per-cell traversal cost (-1 = obstacle)
+        self.component_grids: Dict[str, Optional[array]] = {} # floor -> flat connected-component labels
+        self.hierarchies: Dict[str, ClusterGraph] = {} # floor -> HPA* cluster graph (large floors only)
 
-    def load_grid(self, floor: str, grid_data: List[List[int]]):
-        """Loads a grid for a specific floor. 0=walkable, 1=obstacle."""
-        self.grids[floor] = grid_data
-        self.height[floor] = len(grid_data)
-        self.width[floor] = len(grid_data[0]) if grid_data else 0
+    def load_grid(self, floor: str, grid_data):
+        """Loads a grid (nested list or array) for a specific floor. 0=walkable, 1=obstacle."""
+        grid = np.array(grid_data, dtype=np.uint8)
+        if grid.ndim != 2:
+            grid = grid.reshape(len(grid), -1) if grid.size else np.zeros((0, 0), dtype=np.uint8)
+        self.grids[floor] = grid
+        self.base_grids[floor] = grid.copy()
+        self.zone_counts[floor] = np.zeros(grid.shape, dtype=np.int16)
+        self.zone_boxes[floor] = {}
+        self.height[floor], self.width[floor] = grid.shape
+        self.distance_grids.pop(floor, None)
+        self._prepare_search(floor)
         print(f"Loaded grid for {floor}: {self.width[floor]}x{self.height[floor]}")
 
+    def to_grid(self, floor: str, x_pct: float, y_pct: float) -> Tuple[int, int]:
+        """Map percentage coordinates (0-100) to a grid cell on `floor`."""
+        grid_w = self.width.get(floor, 100)
+        grid_h = self.height.get(floor, 100)
+        return int(x_pct / 100.0 * grid_w), int(y_pct / 100.0 * grid_h)
+
     def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
         # Manhattan distance
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -40,7 +436,7 @@ class MapNavigator:
             ]
         
         grid = self.grids.get(floor)
-        if not grid:
+        if grid is None:
             return []
 
         h, w = self.height[floor], self.width[floor]
@@ -51,135 +447,217 @@ class MapNavigator:
             # Check bounds
             if 0 <= nx < w and 0 <= ny < h:
                 # Check obstacle (0=walkable, 1=obstacle)
-                if grid[ny][nx] == 0:
+                if grid[ny, nx] == 0:
                     neighbors.append((nx, ny))
                     
         return neighbors
 
+    def _zone_key(self, zone: Dict):
+        return zone.get('id') if zone.get('id') is not None else zone.get('name')
+
+    def _zone_box(self, floor: str, zone: Dict) -> Optional[Tuple[int, int, int, int]]:
+        """Grid box (x1, y1, x2, y2, exclusive ends) covered by a type='zone' rect, inflated by the padding."""
+        h, w = self.height[floor], self.width[floor]
+        
+        # Inflation radius (in grid cells). 1 cell approx 10-20cm depending on scale.
+        # grid_size=10 means 1px on grid = 10px on map. 
+        # If map is 2000px wide, grid is 200.
+        padding = 1 
+
+        r = parse_zone_rect(zone['rect'])
+        if r is None:
+            return None
+
+        l_pct = float(str(r['left']).replace('%', ''))
+        t_pct = float(str(r['top']).replace('%', ''))
+        w_pct = float(str(r['width']).replace('%', ''))
+        h_pct = float(str(r['height']).replace('%', ''))
+
+        # Convert to grid coords
+        x1 = int(l_pct / 100 * w)
+        y1 = int(t_pct / 100 * h)
+        x2 = int((l_pct + w_pct) / 100 * w)
+        y2 = int((t_pct + h_pct) / 100 * h)
+
+        # Clamp
+        x1 = max(0, x1 - padding)
+        y1 = max(0, y1 - padding)
+        x2 = min(w, x2 + padding)
+        y2 = min(h, y2 + padding)
+        return (x1, y1, x2, y2) if x2 > x1 and y2 > y1 else None
+
     def update_obstacles(self, floor: str, zones: List[Dict]):
         """
         Updates the grid with obstacles from zone definitions.
         Only considers zones with type='zone' (shelves/structures).
         Inflates obstacles slightly to separate path from walls.
+        Zones are tracked per id on top of the pristine base grid, so they can later be
+        added/removed one at a time (add_zone_obstacle / remove_zone_obstacle).
         """
         if floor not in self.grids:
             print(f"⚠️ Grid for floor {floor} not loaded, cannot update obstacles.")
             return
 
-        grid = self.grids[floor]
-        h, w = self.height[floor], self.width[floor]
-        
-        # Inflation radius (in grid cells). 1 cell approx 10-20cm depending on scale.
-        # grid_size=10 means 1px on grid = 10px on map. 
-        # If map is 2000px wide, grid is 200.
-        padding = 1 
+        counts = self.zone_counts[floor]
+        boxes = self.zone_boxes[floor]
 
         count = 0
+        # Changed regions (plus centering margin) for the cluster graph; without a previous
+        # distance map every cell's cost changes, so the whole graph is rebuilt
+        dirty = [] if floor in self.distance_grids else None
         for zone in zones:
             if zone.get('type') != 'zone':
                 continue
             
             try:
-                # Parse rect: "left: 10%, top: 20%, width: 5%, height: 10%"
-                # Format from DB might be JSON string or dict. 
-                # In api.py it uses string replace.
-                rect_str = zone['rect']
-                # If it's a dict
-                if isinstance(rect_str, dict):
-                     r = rect_str
-                else:
-                    # Simple parsing if it's the specific format
-                    import json
-                    try:
-                        r = json.loads(rect_str)
-                    except:
-                        # Fallback manual parsing
-                        parts = rect_str.split(',')
-                        r = {}
-                        for p in parts:
-                            k, v = p.split(':')
-                            r[k.strip()] = v.strip()
-
-                l_pct = float(str(r['left']).replace('%', ''))
-                t_pct = float(str(r['top']).replace('%', ''))
-                w_pct = float(str(r['width']).replace('%', ''))
-                h_pct = float(str(r['height']).replace('%', ''))
-
-                # Convert to grid coords
-                x1 = int(l_pct / 100 * w)
-                y1 = int(t_pct / 100 * h)
-                x2 = int((l_pct + w_pct) / 100 * w)
-                y2 = int((t_pct + h_pct) / 100 * h)
-
-                # Clamp
-                x1 = max(0, x1 - padding)
-                y1 = max(0, y1 - padding)
-                x2 = min(w, x2 + padding)
-                y2 = min(h, y2 + padding)
-
-                # Mark as obstacle
-                for y in range(y1, y2):
-                    for x in range(x1, x2):
-                        grid[y][x] = 1
+                box = self._zone_box(floor, zone)
+                if box is None:
+                    continue
+
+                # Mark as obstacle (replacing an earlier box for the same zone)
+                key = self._zone_key(zone)
+                old = boxes.pop(key, None)
+                if old != box:  # re-applying an unchanged zone leaves its cells as they are
+                    for changed, delta in ((old, -1), (box, 1)):
+                        if changed is None:
+                            continue
+                        x1, y1, x2, y2 = changed
+                        counts[y1:y2, x1:x2] += delta
+                        if dirty is not None:
+                            m = CENTERING_DIST
+                            dirty.append((x1 - m, y1 - m, x2 + m, y2 + m))
+                boxes[key] = box
                 count += 1
             except Exception as e:
                 print(f"⚠️ Failed to process zone {zone.get('name')}: {e}")
+
+        grid = self.grids[floor]
+        np.bitwise_or(self.base_grids[floor], counts > 0, out=grid, casting='unsafe')
         
-        # Calculate distance transform (Distance Map) for centering
-        # BFS from all obstacles to find distance to nearest obstacle
-        dist_grid = [[float('inf')] * w for _ in range(h)]
-        queue = []
-        
-        # Initialize queue with all obstacles
-        for y in range(h):
-            for x in range(w):
-                if grid[y][x] == 1:
-                    dist_grid[y][x] = 0
-                    queue.append((x, y))
-        
-        # BFS
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        head = 0
-        while head < len(queue):
-            cx, cy = queue[head]
-            head += 1
-            
-            curr_dist = dist_grid[cy][cx]
-            
-            for dx, dy in directions:
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < w and 0 <= ny < h:
-                    if dist_grid[ny][nx] == float('inf'):
-                        dist_grid[ny][nx] = curr_dist + 1
-                        queue.append((nx, ny))
-                        
-        self.distance_grids[floor] = dist_grid
+        # Distance to nearest obstacle (used to keep paths centered in aisles)
+        self.distance_grids[floor] = distance_transform_l1(grid)
+        self._prepare_search(floor, dirty)
         print(f"✅ Updated grid for {floor} with {count} obstacles and distance map")
 
+    def add_zone_obstacle(self, floor: str, zone: Dict) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Apply one new/edited zone incrementally. Returns the window (x1, y1, x2, y2) whose
+        cell costs changed, or None if nothing changed.
+        """
+        if floor not in self.grids or zone.get('type') != 'zone':
+            return None
+        box = self._zone_box(floor, zone)
+        key = self._zone_key(zone)
+        old = self.zone_boxes[floor].get(key)
+        if box == old:
+            return None
+        windows = []
+        if old is not None:
+            windows.append(self.remove_zone_obstacle(floor, key))
+        if box is not None:
+            x1, y1, x2, y2 = box
+            self.zone_counts[floor][y1:y2, x1:x2] += 1
+            self.zone_boxes[floor][key] = box
+            windows.append(self._refresh_window(floor, box))
+        return _union_box([w for w in windows if w])
+
+    def remove_zone_obstacle(self, floor: str, zone_key) -> Optional[Tuple[int, int, int, int]]:
+        """Remove a zone's obstacle (by id); base-grid walls and overlapping zones stay blocked."""
+        box = self.zone_boxes.get(floor, {}).pop(zone_key, None)
+        if box is None:
+            return None
+        x1, y1, x2, y2 = box
+        self.zone_counts[floor][y1:y2, x1:x2] -= 1
+        return self._refresh_window(floor, box)
+
+    def _refresh_window(self, floor: str, box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """
+        Re-rasterize `box` against the base grid and recompute distances/costs only where they
+        can change: costs within CENTERING_DIST of the box (the returned window), using a
+        distance transform over a window twice that margin (every obstacle closer than
+        CENTERING_DIST to a window cell lies inside it). Beyond the margin the penalty is 0 anyway.
+        """
+        h, w = self.height[floor], self.width[floor]
+        x1, y1, x2, y2 = box
+        grid = self.grids[floor]
+        grid[y1:y2, x1:x2] = self.base_grids[floor][y1:y2, x1:x2] | (self.zone_counts[floor][y1:y2, x1:x2] > 0)
+
+        m = CENTERING_DIST
+        ix1, iy1, ix2, iy2 = max(0, x1 - m), max(0, y1 - m), min(w, x2 + m), min(h, y2 + m)
+        ox1, oy1, ox2, oy2 = max(0, x1 - 2 * m), max(0, y1 - 2 * m), min(w, x2 + 2 * m), min(h, y2 + 2 * m)
+
+        dist = self.distance_grids.get(floor)
+        if dist is None:
+            dist = self.distance_grids[floor] = distance_transform_l1(grid)
+        else:
+            window = distance_transform_l1(grid[oy1:oy2, ox1:ox2])
+            dist[iy1:iy2, ix1:ix2] = window[iy1 - oy1:iy2 - oy1, ix1 - ox1:ix2 - ox1]
+
+        cost = np.frombuffer(self.cost_grids[floor], dtype=np.float64).reshape(h, w)
+        cost[iy1:iy2, ix1:ix2] = _cell_costs(grid[iy1:iy2, ix1:ix2], dist[iy1:iy2, ix1:ix2])
+
+        self._update_components(floor)
+        hierarchy = self.hierarchies.get(floor)
+        if hierarchy is not None:
+            hierarchy.update(self.cost_grids[floor], [(ix1, iy1, ix2, iy2)])
+        return ix1, iy1, ix2, iy2
+
+    def _prepare_search(self, floor: str, dirty: Optional[List[Tuple[int, int, int, int]]] = None):
+        """
+        Precompute flat per-cell search data for `floor` (cell index = y * w + x):
+        - traversal cost of entering each cell (10 + centering penalty, -1 = obstacle)
+        - 4-connected component labels, so unreachable targets exit immediately
+        - the HPA* cluster graph on large floors; with `dirty` boxes only touched clusters are rebuilt
+        """
+        grid = self.grids[floor]
+        cost = _cell_costs(grid, self.distance_grids.get(floor))
+        self.cost_grids[floor] = array('d', cost.ravel().tobytes())
+        self._update_components(floor)
+
+        hierarchy = self.hierarchies.get(floor)
+        if hierarchy is not None and dirty is not None and (hierarchy.w, hierarchy.h) == (grid.shape[1], grid.shape[0]):
+            rebuilt = hierarchy.update(self.cost_grids[floor], dirty)
+            print(f"Cluster graph for {floor}: rebuilt {rebuilt}/{len(hierarchy)} clusters")
+        elif hierarchy is not None or grid.size >= HPA_MIN_CELLS:
+            self.build_hierarchy(floor, hierarchy.cs if hierarchy else HPA_CLUSTER_SIZE)
+
+    def _update_components(self, floor: str):
+        grid = self.grids[floor]
+        if cv2 is not None and grid.size:
+            _, labels = cv2.connectedComponents((grid == 0).astype(np.uint8), connectivity=4)
+            self.component_grids[floor] = array('l', labels.astype(np.int64).ravel().tolist())
+        else:
+            self.component_grids[floor] = None
+
+    def build_hierarchy(self, floor: str, cluster_size: int = HPA_CLUSTER_SIZE) -> ClusterGraph:
+        """Build (or rebuild) the HPA* cluster graph for `floor`; find_path uses it from then on."""
+        graph = ClusterGraph(self.cost_grids[floor], self.width[floor], self.height[floor], cluster_size)
+        self.hierarchies[floor] = graph
+        return graph
+
     def get_nearest_walkable(self, floor: str, node: Tuple[int, int], max_radius: int = 30) -> Optional[Tuple[int, int]]:
-        """Finds the nearest walkable node using BFS"""
+        """Finds the nearest walkable node using BFS (8-connected, within max_radius)"""
         grid = self.grids.get(floor)
-        if not grid: return None
+        if grid is None: return None
         
         h, w = self.height[floor], self.width[floor]
+        cost = self.cost_grids[floor]
         x, y = node
         
         # If valid and walkable, return itself
-        if 0 <= x < w and 0 <= y < h and grid[y][x] == 0:
+        if 0 <= x < w and 0 <= y < h and cost[y * w + x] >= 0:
             return node
             
-        # BFS
-        queue = [(x, y)]
-        visited = set([(x, y)])
-        
-        # Directions: Start with cardinal, then diagonal
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+        # BFS. Directions: Start with cardinal, then diagonal
+        directions = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+        queue = deque([(x, y)])
+        visited = {(x, y)}
         
         while queue:
-            cx, cy = queue.pop(0)
+            cx, cy = queue.popleft()
             
             # Check if this node is walkable
-            if 0 <= cx < w and 0 <= cy < h and grid[cy][cx] == 0:
+            if 0 <= cx < w and 0 <= cy < h and cost[cy * w + cx] >= 0:
                 print(f"DEBUG: Moved node {node} -> {(cx, cy)} (nearest walkable)")
                 return (cx, cy)
             
@@ -188,10 +666,10 @@ class MapNavigator:
                 continue
 
             for dx, dy in directions:
-                nx, ny = cx + dx, cy + dy
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    queue.append((nx, ny))
+                nxt = (cx + dx, cy + dy)
+                if nxt not in visited:
+                    visited.add(nxt)
+                    queue.append(nxt)
         
         return None
 
@@ -199,6 +677,10 @@ class MapNavigator:
         """
         Finds path from start (x, y) to end (x, y) on the given floor using A*.
         Returns list of (x, y) coordinates.
+
+        4-connected moves; entering a cell costs its precomputed traversal cost
+        (10 + centering penalty). Heuristic: 10 * Manhattan distance (admissible and
+        consistent since every move costs >= 10), so a closed set is safe.
         """
         if floor not in self.grids:
             print(f"DEBUG: Grid for {floor} missing")
@@ -214,62 +696,123 @@ class MapNavigator:
         if not end_node:
             print("DEBUG: End node is in obstacle and no walkable neighbor found")
             return None
-        
-        # Priority queue: (f_score, node)
-        open_set = []
-        heapq.heappush(open_set, (0, start_node))
-        
-        came_from = {}
-        
-        # g_score[node] is cost from start to node
-        g_score = {start_node: 0}
-        
-        # f_score[node] is g_score + heuristic
-        f_score = {start_node: self.heuristic(start_node, end_node)}
-        
+
+        w, h = self.width[floor], self.height[floor]
+        cost = self.cost_grids[floor]
+        source = start_node[1] * w + start_node[0]
+        target = end_node[1] * w + end_node[0]
+
+        # Early exits: same cell, or start/end in different connected regions
+        if source == target:
+            return [start_node]
+        labels = self.component_grids.get(floor)
+        if labels is not None and labels[source] != labels[target]:
+            print("DEBUG: Start and end are not connected")
+            return None
+
+        hierarchy = self.hierarchies.get(floor)
+        if hierarchy is not None:
+            cells = hierarchy.find_path(source, target)
+            return [(c % w, c // w) for c in cells] if cells else None
+
+        n = w * h
+        tx, ty = end_node
+        g_score = array('d', [INF]) * n
+        came_from = array('l', [-1]) * n
+        closed = bytearray(n)
+
+        g_score[source] = 0.0
+        open_set = [(HEURISTIC_WEIGHT * (abs(start_node[0] - tx) + abs(start_node[1] - ty)), source)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+
         while open_set:
-            current = heapq.heappop(open_set)[1]
-            
-            if current == end_node:
-                # Reconstruct path
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(start_node)
-                path.reverse()
-                return path
-            
-            # Use allow_diagonal=False for straighter paths
-            for neighbor in self.get_neighbors(current, floor, allow_diagonal=False):
-                # Distance calculation
-                # Straight move cost = 10, Diagonal = 14
-                dx = abs(neighbor[0] - current[0])
-                dy = abs(neighbor[1] - current[1])
-                move_cost = 14 if (dx + dy) == 2 else 10
-                
-                tentative_g_score = g_score[current] + move_cost
-                
-                # Add penalty for being close to obstacles (Centering)
-                if floor in self.distance_grids:
-                    dist = self.distance_grids[floor][neighbor[1]][neighbor[0]]
-                    # Max distance heuristic: e.g. 20. 
-                    # If dist is small (close to wall), penalty is high.
-                    # If dist is large (center), penalty is low.
-                    # Penalty = (Max - dist) * weight
-                    # We want to encourage high dist. 
-                    # Let's say max useful dist is 10.
-                    max_d = 10.0
-                    capped_dist = min(dist, max_d)
-                    penalty = (max_d - capped_dist) * 2.0 # Weight 2.0
-                    tentative_g_score += penalty
-
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+            _, current = heappop(open_set)
+            if closed[current]:
+                continue  # stale heap entry
+            if current == target:
+                return self._reconstruct(came_from, target, w)
+            closed[current] = 1
+
+            cy, cx = divmod(current, w)
+            g_current = g_score[current]
+            for neighbor, nx, ny in (
+                (current + w, cx, cy + 1) if cy + 1 < h else (-1, 0, 0),
+                (current - w, cx, cy - 1) if cy > 0 else (-1, 0, 0),
+                (current + 1, cx + 1, cy) if cx + 1 < w else (-1, 0, 0),
+                (current - 1, cx - 1, cy) if cx > 0 else (-1, 0, 0),
+            ):
+                if neighbor < 0 or closed[neighbor]:
+                    continue
+                step = cost[neighbor]
+                if step < 0:
+                    continue  # obstacle
+                tentative_g_score = g_current + step
+                if tentative_g_score < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
-                    f = tentative_g_score + self.heuristic(neighbor, end_node) * 10
-                    f_score[neighbor] = f
-                    heapq.heappush(open_set, (f, neighbor))
+                    f = tentative_g_score + HEURISTIC_WEIGHT * (abs(nx - tx) + abs(ny - ty))
+                    heappush(open_set, (f, neighbor))
                     
         return None # No path found
 
+    def shortest_path_tree(self, floor: str, source: Tuple[int, int],
+                           targets: Optional[List[Tuple[int, int]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Single-source Dijkstra from `source` (must be walkable) over the same per-cell costs as find_path.
+        Returns flat (dist float32, parent int32) arrays; parent -1 marks the source and unreachable cells.
+        With `targets`, the search stops once all of them are settled (multi-target query); cells
+        not settled by then may hold tentative distances.
+        """
+        w, h = self.width[floor], self.height[floor]
+        cost = self.cost_grids[floor]
+        n = w * h
+        dist = array('d', [INF]) * n
+        parent = array('l', [-1]) * n
+        closed = bytearray(n)
+
+        src = source[1] * w + source[0]
+        dist[src] = 0.0
+        heap = [(0.0, src)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        remaining = {y * w + x for x, y in targets} if targets is not None else None
+
+        while heap:
+            d, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            cy, cx = divmod(current, w)
+            for neighbor in (
+                current + w if cy + 1 < h else -1,
+                current - w if cy > 0 else -1,
+                current + 1 if cx + 1 < w else -1,
+                current - 1 if cx > 0 else -1,
+            ):
+                if neighbor < 0 or closed[neighbor]:
+                    continue
+                step = cost[neighbor]
+                if step < 0:
+                    continue
+                nd = d + step
+                if nd < dist[neighbor]:
+                    dist[neighbor] = nd
+                    parent[neighbor] = current
+                    heappush(heap, (nd, neighbor))
+
+        return (np.frombuffer(dist, dtype=np.float64).astype(np.float32),
+                np.array(parent, dtype=np.int32))
+
+    @staticmethod
+    def _reconstruct(came_from, target: int, w: int) -> List[Tuple[int, int]]:
+        path = []
+        current = target
+        while current != -1:
+            y, x = divmod(current, w)
+            path.append((x, y))
+            current = came_from[current]
+        path.reverse()
+        return path
@@ -0,0 +1,224 @@
+"""
+Route Cache - precomputed shortest-path trees rooted at kiosks and floor connections
+Start points (type='start') and connections (type='connection') are a small fixed set,
+so one Dijkstra per such zone per floor is run up front (startup / zone edit) and a
+route from one of them becomes a parent-pointer walk, O(path length):
+
+    trees[(floor, source_cell)] -> ShortestPathTree(parent int32[h*w], dist float32[h*w])
+
+Cells are flat indices (y * w + x) on the navigation grid. With a cache_dir the arrays are
+written as .npy files (keyed by a digest of the floor's cost grid) and memory-mapped back,
+so several stores/processes share them without holding copies in RAM.
+
+Zone edits invalidate trees selectively (invalidate): an added shelf only raises costs inside
+its window, so only the cells whose tree path crosses the window are marked stale (route()
+falls back to A* for those); a removed shelf can shorten any path that reaches it, so those
+trees are recomputed on their next use. Trees on other floors are never touched.
+"""
+import hashlib
+import os
+import threading
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+SOURCE_TYPES = ("start", "connection")
+
+
+class ShortestPathTree:
+    """Dijkstra result for one source cell on one floor."""
+    __slots__ = ("floor", "source", "width", "parent", "dist", "stale")
+
+    def __init__(self, floor: str, source: int, width: int, parent: np.ndarray, dist: np.ndarray):
+        self.floor = floor
+        self.source = source
+        self.width = width
+        self.parent = parent
+        self.dist = dist
+        self.stale: Optional[np.ndarray] = None  # cells whose path crosses a since-blocked window
+
+    def cost_to(self, node: Tuple[int, int]) -> float:
+        return float(self.dist[node[1] * self.width + node[0]])
+
+    def path_to(self, node: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Path from the source to `node` (list of (x, y)), or None if unreachable or stale."""
+        w = self.width
+        cell = node[1] * w + node[0]
+        if cell != self.source and self.parent[cell] < 0:
+            return None
+        if self.stale is not None and self.stale[cell]:
+            return None
+        path = []
+        parent = self.parent
+        while cell != -1:
+            y, x = divmod(cell, w)
+            path.append((x, y))
+            cell = int(parent[cell])
+        path.reverse()
+        return path
+
+    def crossing(self, box: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Mask of cells whose tree path passes through `box` (x1, y1, x2, y2): each cell ORs in
+        its ancestors' flags by pointer jumping, O(n log depth) instead of walking every path.
+        """
+        x1, y1, x2, y2 = box
+        hit = np.zeros(len(self.parent), dtype=bool)
+        hit.reshape(-1, self.width)[y1:y2, x1:x2] = True
+        anc = np.array(self.parent, dtype=np.int64)
+        idx = np.flatnonzero(anc >= 0)
+        while len(idx):
+            up = anc[idx]
+            hit[idx] |= hit[up]
+            anc[idx] = anc[up]
+            idx = idx[anc[idx] >= 0]
+        return hit
+
+
+class RouteCache:
+    """Shortest-path trees for every start/connection zone on every loaded floor."""
+
+    def __init__(self, navigator, cache_dir: Optional[str] = None, version: int = 0):
+        self.navigator = navigator
+        self.cache_dir = cache_dir
+        self.version = version
+        self.trees: Dict[Tuple[str, int], ShortestPathTree] = {}
+        self.outdated: set = set()  # keys recomputed on next use
+
+    def build(self, zone_index) -> "RouteCache":
+        """
+        Run one Dijkstra per start/connection zone center (snapped to the nearest walkable cell).
+        Existing trees are kept, so after a zone edit only new sources are computed and trees of
+        deleted sources are dropped.
+        """
+        nav = self.navigator
+        self.version = max(self.version, zone_index.version)
+        wanted = set()
+        for floor in nav.grids:
+            digest = self._digest(floor)
+            for zone_type in SOURCE_TYPES:
+                for zone in zone_index.on_floor(zone_type, floor):
+                    if not zone.center:
+                        continue
+                    node = nav.get_nearest_walkable(floor, nav.to_grid(floor, *zone.center))
+                    if node is None:
+                        print(f"⚠️ Route cache: {zone.name} on {floor} has no walkable cell nearby")
+                        continue
+                    cell = node[1] * nav.width[floor] + node[0]
+                    wanted.add((floor, cell))
+                    if (floor, cell) not in self.trees:
+                        self.trees[(floor, cell)] = self._tree(floor, node, cell, digest)
+        for key in set(self.trees) - wanted:
+            del self.trees[key]
+        self.outdated &= wanted
+        return self
+
+    def tree(self, floor: str, node: Tuple[int, int], exact: bool = False) -> Optional[ShortestPathTree]:
+        """
+        Tree rooted at `node` (after snapping to walkable), if one was precomputed. Outdated trees
+        are recomputed here; `exact` also recomputes trees with stale cells (callers reading
+        costs for arbitrary cells, e.g. the floor graph).
+        """
+        nav = self.navigator
+        if floor not in nav.grids:
+            return None
+        node = nav.get_nearest_walkable(floor, node)
+        if node is None:
+            return None
+        key = (floor, node[1] * nav.width[floor] + node[0])
+        tree = self.trees.get(key)
+        if tree is not None and (key in self.outdated or (exact and tree.stale is not None)):
+            tree = self.trees[key] = self._tree(floor, node, key[1], self._digest(floor))
+            self.outdated.discard(key)
+        return tree
+
+    def invalidate(self, floor: str, box: Tuple[int, int, int, int], costs_decreased: bool) -> int:
+        """
+        Invalidate trees after the cell costs inside `box` changed (see module docstring).
+        Returns the number of trees affected.
+        """
+        x1, y1, x2, y2 = box
+        affected = 0
+        for key, tree in list(self.trees.items()):
+            if key[0] != floor:
+                continue
+            sy, sx = divmod(tree.source, tree.width)
+            if x1 <= sx < x2 and y1 <= sy < y2:
+                # Source itself may now be blocked; build() re-snaps it
+                del self.trees[key]
+                self.outdated.discard(key)
+                affected += 1
+            elif costs_decreased:
+                # Reached cells next to the window can now be shortcut through it
+                near = np.asarray(tree.dist).reshape(-1, tree.width)[
+                    max(0, y1 - 1):y2 + 1, max(0, x1 - 1):x2 + 1]
+                if np.isfinite(near).any():
+                    self.outdated.add(key)
+                    affected += 1
+            elif key not in self.outdated:
+                hit = tree.crossing(box) & np.isfinite(tree.dist)
+                if hit.any():
+                    tree.stale = hit if tree.stale is None else tree.stale | hit
+                    affected += 1
+        return affected
+
+    def route(self, floor: str, start: Tuple[int, int], end: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Cached path start -> end, or None when start is not a cached source (caller falls back to A*)."""
+        tree = self.tree(floor, start)
+        if tree is None:
+            return None
+        end_node = self.navigator.get_nearest_walkable(floor, end)
+        if end_node is None:
+            return None
+        return tree.path_to(end_node)
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def nbytes(self) -> int:
+        return sum(t.parent.nbytes + t.dist.nbytes for t in self.trees.values())
+
+    # ─── Storage ─────────────────────────────────────────────
+    def _digest(self, floor: str) -> str:
+        """Identifies the cost grid a tree was computed on (stale files are simply never loaded)."""
+        nav = self.navigator
+        h = hashlib.sha1(memoryview(nav.cost_grids[floor]).cast("B"))
+        h.update(f"{nav.width[floor]}x{nav.height[floor]}".encode())
+        return h.hexdigest()[:16]
+
+    def _tree(self, floor: str, node: Tuple[int, int], cell: int, digest: str) -> ShortestPathTree:
+        width = self.navigator.width[floor]
+        if not self.cache_dir:
+            dist, parent = self.navigator.shortest_path_tree(floor, node)
+            return ShortestPathTree(floor, cell, width, parent, dist)
+
+        base = os.path.join(self.cache_dir, f"{floor}_{cell}_{digest}")
+        parent_path, dist_path = base + ".parent.npy", base + ".dist.npy"
+        if not (os.path.exists(parent_path) and os.path.exists(dist_path)):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            dist, parent = self.navigator.shortest_path_tree(floor, node)
+            np.save(parent_path, parent)
+            np.save(dist_path, dist)
+        return ShortestPathTree(floor, cell, width,
+                                np.load(parent_path, mmap_mode="r"),
+                                np.load(dist_path, mmap_mode="r"))
+
+
+# ─── Cache Holder ────────────────────────────────────────────
+_cache: Optional[RouteCache] = None
+_lock = threading.Lock()
+
+
+def build_route_cache(navigator, zone_index, cache_dir: Optional[str] = None) -> RouteCache:
+    """Precompute trees for the zone index's start/connection zones and make the cache current."""
+    global _cache
+    cache = RouteCache(navigator, cache_dir=cache_dir, version=zone_index.version).build(zone_index)
+    with _lock:
+        if _cache is None or cache.version >= _cache.version:
+            _cache = cache
+    print(f"✅ Route cache built: {len(cache)} trees ({cache.nbytes() / 1024:.0f} KB)")
+    return cache
+
+
+def get_route_cache() -> Optional[RouteCache]:
+    return _cache
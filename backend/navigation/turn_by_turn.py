@@ -0,0 +1,198 @@
+"""
+Turn-by-Turn - path simplification and step-by-step guidance
+(see document/qr_turnbyturn_navigation.md, 3.2)
+
+find_path returns every grid cell on the route. Before it goes to the client:
+
+    1. simplify_path:  Ramer–Douglas–Peucker over the cell path, keeping a shortcut only if it
+                       has line of sight on the occupancy grid (never cuts through shelves)
+    2. generate_turn_by_turn_steps: turn detection on the polyline with distances and, when a
+                       zone is nearby, a landmark name ("문구 앞에서 우회전하세요")
+
+A typical route shrinks from ~100 cells to a handful of vertices.
+"""
+import math
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+SIMPLIFY_EPSILON = 1.0       # max deviation in grid cells for RDP
+TURN_ANGLE_DEG = 30.0        # heading change below this is treated as going straight
+METERS_PER_PERCENT = 0.3     # 1% of the map ≈ 0.3m (store size estimate)
+LANDMARK_RADIUS = 5.0        # max distance (map %) from a turn to the zone used as its landmark
+
+TURN_LABELS = {
+    "turn_right": {"text": "우회전하세요", "icon": "➡️"},
+    "turn_left": {"text": "좌회전하세요", "icon": "⬅️"},
+}
+
+
+# ─── Simplification ──────────────────────────────────────────
+def line_of_sight(grid: np.ndarray, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    """True if every cell the segment a-b passes through is walkable (sampled at half-cell steps)."""
+    (x0, y0), (x1, y1) = a, b
+    n = 2 * max(abs(x1 - x0), abs(y1 - y0)) + 1
+    xs = np.rint(np.linspace(x0, x1, n)).astype(np.intp)
+    ys = np.rint(np.linspace(y0, y1, n)).astype(np.intp)
+    return not grid[ys, xs].any()
+
+
+def simplify_path(path: List[Tuple[int, int]], grid: Optional[np.ndarray] = None,
+                  epsilon: float = SIMPLIFY_EPSILON) -> List[Tuple[int, int]]:
+    """
+    Ramer–Douglas–Peucker on a grid path. A span collapses to its end points only if all
+    intermediate cells are within `epsilon` of the chord and (given a grid) the chord is clear.
+    """
+    if len(path) < 3:
+        return list(path)
+    pts = np.asarray(path, dtype=np.float64)
+    keep = np.zeros(len(path), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, len(path) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        seg = pts[j] - pts[i]
+        rel = pts[i + 1:j] - pts[i]
+        norm = math.hypot(seg[0], seg[1])
+        if norm == 0:
+            dists = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dists = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / norm
+        k = int(np.argmax(dists))
+        if dists[k] <= epsilon and (grid is None or line_of_sight(grid, path[i], path[j])):
+            continue
+        mid = i + 1 + k
+        keep[mid] = True
+        stack.append((i, mid))
+        stack.append((mid, j))
+
+    return [path[i] for i in np.flatnonzero(keep)]
+
+
+# ─── Instructions ────────────────────────────────────────────
+def get_direction(from_pt: Dict, to_pt: Dict) -> str:
+    """두 점 사이의 이동 방향 계산"""
+    dx = to_pt["x"] - from_pt["x"]
+    dy = to_pt["y"] - from_pt["y"]
+
+    if abs(dx) > abs(dy):
+        return "right" if dx > 0 else "left"
+    else:
+        return "down" if dy > 0 else "up"
+
+
+def get_turn_type(prev_pt: Dict, turn_pt: Dict, next_pt: Dict) -> str:
+    """Turn at turn_pt from the heading change (screen coordinates: y grows downward)."""
+    ax, ay = turn_pt["x"] - prev_pt["x"], turn_pt["y"] - prev_pt["y"]
+    bx, by = next_pt["x"] - turn_pt["x"], next_pt["y"] - turn_pt["y"]
+    angle = math.degrees(math.atan2(ax * by - ay * bx, ax * bx + ay * by))
+    if abs(angle) < TURN_ANGLE_DEG:
+        return "straight"
+    return "turn_right" if angle > 0 else "turn_left"
+
+
+def _straight_step(step_num: int, direction: str, point_index: int, dist: int) -> Dict:
+    return {
+        "step": step_num,
+        "instruction": f"직진하세요 (약 {max(dist, 1)}m)",
+        "icon": "⬆️",
+        "direction": direction,
+        "point_index": point_index,
+        "distance_m": max(dist, 1),
+    }
+
+
+def generate_turn_by_turn_steps(path: List[Dict], landmark=None, arrival: Optional[str] = None) -> List[Dict]:
+    """
+    경로 좌표 배열(% 단위 polyline)을 턴바이턴 안내 단계로 변환.
+    `landmark(x, y)` optionally names a zone near a turn point (or returns None);
+    `arrival` replaces the final step text (e.g. taking a connection to the next floor).
+    """
+    if len(path) < 2:
+        return [{"step": 1, "instruction": "목적지 근처입니다!", "icon": "🎯",
+                 "direction": "arrived", "point_index": 0, "distance_m": 0}]
+
+    steps = []
+    segment_start_idx = 0
+    walked = 0.0
+
+    for i in range(1, len(path) - 1):
+        walked += math.hypot(path[i]["x"] - path[i - 1]["x"], path[i]["y"] - path[i - 1]["y"])
+        turn = get_turn_type(path[i - 1], path[i], path[i + 1])
+        if turn == "straight":
+            continue
+
+        # 직진 구간 추가
+        direction = get_direction(path[segment_start_idx], path[segment_start_idx + 1])
+        steps.append(_straight_step(len(steps) + 1, direction, segment_start_idx,
+                                    round(walked * METERS_PER_PERCENT)))
+
+        # 회전 안내 추가
+        turn_info = TURN_LABELS[turn]
+        name = landmark(path[i]["x"], path[i]["y"]) if landmark else None
+        steps.append({
+            "step": len(steps) + 1,
+            "instruction": f"{name} 앞에서 {turn_info['text']}" if name else turn_info["text"],
+            "icon": turn_info["icon"],
+            "direction": get_direction(path[i], path[i + 1]),
+            "point_index": i,
+            "distance_m": 0,
+            "landmark": name,
+        })
+        segment_start_idx = i
+        walked = 0.0
+
+    # 마지막 직진 구간
+    walked += math.hypot(path[-1]["x"] - path[-2]["x"], path[-1]["y"] - path[-2]["y"])
+    dist = round(walked * METERS_PER_PERCENT)
+    if dist > 0:
+        direction = get_direction(path[segment_start_idx], path[segment_start_idx + 1])
+        steps.append(_straight_step(len(steps) + 1, direction, segment_start_idx, dist))
+
+    # 도착
+    steps.append({
+        "step": len(steps) + 1,
+        "instruction": arrival or "목적지에 도착했습니다! 🎉",
+        "icon": "🎯",
+        "direction": "arrived",
+        "point_index": len(path) - 1,
+        "distance_m": 0,
+    })
+    return steps
+
+
+def _zone_bounds(zone) -> Optional[Tuple[float, float, float, float]]:
+    """(left, top, right, bottom) in map % for a rect or polygon zone."""
+    rect = zone.rect
+    try:
+        if isinstance(rect, list):
+            xs = [p["x"] for p in rect]
+            ys = [p["y"] for p in rect]
+            return min(xs), min(ys), max(xs), max(ys)
+        l = float(str(rect["left"]).replace("%", ""))
+        t = float(str(rect["top"]).replace("%", ""))
+        w = float(str(rect["width"]).replace("%", ""))
+        h = float(str(rect["height"]).replace("%", ""))
+        return l, t, l + w, t + h
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def zone_landmarks(zone_index, floor: str, radius: float = LANDMARK_RADIUS):
+    """
+    Landmark lookup for generate_turn_by_turn_steps: the shelf zone on `floor` whose outline
+    is closest to the point, if within `radius` (zones are large, so centers are a poor proxy).
+    """
+    bounds = [(z.name, b) for z in zone_index.on_floor("zone", floor) if (b := _zone_bounds(z))]
+
+    def landmark(x: float, y: float) -> Optional[str]:
+        best, best_d = None, radius
+        for name, (l, t, r, b) in bounds:
+            d = math.hypot(max(l - x, 0.0, x - r), max(t - y, 0.0, y - b))
+            if d <= best_d:
+                best, best_d = name, d
+        return best
+    return landmark
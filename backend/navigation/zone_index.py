@@ -0,0 +1,172 @@
+"""
+Zone Index - precomputed lookup structures over map_zones for navigation
+Built once at startup and rebuilt only when zones are edited, so route requests
+never query the database or re-parse rect JSON.
+
+    by_type_name[(type, name)]   -> [Zone, ...]
+    by_type_floor[(type, floor)] -> [Zone, ...]
+    nearest(type, floor, x, y)   -> closest zone center (bucketed spatial grid)
+
+All coordinates are map percentages (0-100), as stored in map_zones.rect.
+"""
+import json
+import threading
+from typing import List, Dict, Optional, Tuple
+
+BUCKET_SIZE = 10.0  # spatial grid cell size in map percent
+
+
+def parse_rect(rect):
+    """Parse a map_zones.rect value (JSON string, dict or list of points)."""
+    if isinstance(rect, str):
+        try:
+            return json.loads(rect)
+        except (ValueError, TypeError):
+            return None
+    return rect
+
+
+def get_zone_center(rect) -> Optional[Dict[str, float]]:
+    """Calculate center of a zone rect (dict or list of points)"""
+    rect = parse_rect(rect)
+    if not rect:
+        return None
+
+    if isinstance(rect, list):
+        # Polygon: average of points
+        try:
+            xs = [p['x'] for p in rect]
+            ys = [p['y'] for p in rect]
+        except (KeyError, TypeError):
+            return None
+        return {'x': sum(xs) / len(xs), 'y': sum(ys) / len(ys)}
+    else:
+        # Rect: center
+        try:
+            l = float(str(rect['left']).replace('%', ''))
+            t = float(str(rect['top']).replace('%', ''))
+            w = float(str(rect['width']).replace('%', ''))
+            h = float(str(rect['height']).replace('%', ''))
+            return {'x': l + w/2, 'y': t + h/2}
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class Zone:
+    """A map zone with its rect parsed and center precomputed."""
+    __slots__ = ("id", "floor", "name", "type", "color", "rect", "center", "created_at")
+
+    def __init__(self, row: Dict):
+        self.id = row.get("id")
+        self.floor = row.get("floor")
+        self.name = row.get("name")
+        self.type = row.get("type") or "zone"
+        self.color = row.get("color")
+        self.created_at = row.get("created_at")
+        self.rect = parse_rect(row.get("rect"))
+        c = get_zone_center(self.rect)
+        self.center: Optional[Tuple[float, float]] = (c['x'], c['y']) if c else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id, "floor": self.floor, "name": self.name,
+            "rect": self.rect, "color": self.color, "type": self.type,
+            "created_at": self.created_at,
+        }
+
+
+class _SpatialGrid:
+    """Uniform bucket grid over zone centers for nearest-neighbour queries."""
+
+    def __init__(self, zones: List[Zone], cell: float = BUCKET_SIZE):
+        self.cell = cell
+        self.buckets: Dict[Tuple[int, int], List[Zone]] = {}
+        for z in zones:
+            if z.center:
+                self.buckets.setdefault(self._key(*z.center), []).append(z)
+        self.max_ring = int(100 / cell) + 1
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell), int(y // self.cell)
+
+    def nearest(self, x: float, y: float) -> Optional[Zone]:
+        if not self.buckets:
+            return None
+        cx, cy = self._key(x, y)
+        best, best_d = None, float("inf")
+        for r in range(self.max_ring + 1):
+            for bx in range(cx - r, cx + r + 1):
+                for by in range(cy - r, cy + r + 1):
+                    if max(abs(bx - cx), abs(by - cy)) != r:
+                        continue  # ring only
+                    for z in self.buckets.get((bx, by), ()):
+                        d = (z.center[0] - x) ** 2 + (z.center[1] - y) ** 2
+                        if d < best_d:
+                            best, best_d = z, d
+            # Anything in ring r+1 is at least r cells away
+            if best is not None and best_d <= (r * self.cell) ** 2:
+                break
+        return best
+
+
+class ZoneIndex:
+    """Immutable index over all map zones."""
+
+    def __init__(self, rows: List[Dict], version: int = 0):
+        self.version = version
+        self.zones: List[Zone] = [Zone(r) for r in rows]
+        self.by_type_name: Dict[Tuple[str, str], List[Zone]] = {}
+        self.by_type_floor: Dict[Tuple[str, str], List[Zone]] = {}
+        self.by_id: Dict[int, Zone] = {z.id: z for z in self.zones if z.id is not None}
+        for z in self.zones:
+            self.by_type_name.setdefault((z.type, z.name), []).append(z)
+            self.by_type_floor.setdefault((z.type, z.floor), []).append(z)
+        self._spatial: Dict[Tuple[str, str], _SpatialGrid] = {
+            key: _SpatialGrid(zs) for key, zs in self.by_type_floor.items()
+        }
+
+    def get(self, zone_id: int) -> Optional[Zone]:
+        return self.by_id.get(zone_id)
+
+    def find(self, zone_type: str, name: Optional[str], floor: Optional[str] = None) -> Optional[Zone]:
+        """First zone of the given type and name (optionally restricted to a floor)."""
+        for z in self.by_type_name.get((zone_type, name), ()):
+            if floor is None or z.floor == floor:
+                return z
+        return None
+
+    def on_floor(self, zone_type: str, floor: str) -> List[Zone]:
+        return self.by_type_floor.get((zone_type, floor), [])
+
+    def nearest(self, zone_type: str, floor: str, x: float, y: float) -> Optional[Zone]:
+        """Zone of the given type on `floor` whose center is closest to (x, y)."""
+        grid = self._spatial.get((zone_type, floor))
+        return grid.nearest(x, y) if grid else None
+
+    def to_dicts(self, floor: Optional[str] = None) -> List[Dict]:
+        return [z.to_dict() for z in self.zones if floor is None or z.floor == floor]
+
+
+# ─── Index Holder ────────────────────────────────────────────
+_index: Optional[ZoneIndex] = None
+_lock = threading.Lock()
+
+
+def build_zone_index(rows: List[Dict], version: int) -> ZoneIndex:
+    """Build an index from map_zones rows and make it current."""
+    global _index
+    index = ZoneIndex(rows, version=version)
+    with _lock:
+        if _index is None or version >= _index.version:
+            _index = index
+    return index
+
+
+def get_zone_index() -> ZoneIndex:
+    """Current index; rebuilt from the database if zones were edited since it was built."""
+    from backend.database.database import get_map_zones, get_map_zones_version
+    version = get_map_zones_version()
+    index = _index
+    if index is None or index.version != version:
+        index = build_zone_index(get_map_zones(), version)
+    return index
@@ -0,0 +1,93 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.database import catalog, database
+from backend.database.catalog import CatalogSnapshot
+
+class TestCatalogSnapshot(unittest.TestCase):
+    def setUp(self):
+        rows = [
+            {"id": 1, "rank": 1, "name": "볼펜", "category_major": "문구/팬시", "category_middle": "필기구", "floor": "B1"},
+            {"id": 2, "rank": 2, "name": "욕실매트", "category_major": "청소/욕실", "category_middle": "욕실용품", "floor": "B2"},
+            {"id": 3, "rank": 3, "name": "연필", "category_major": "문구/팬시", "category_middle": "필기구", "floor": "B1"},
+            {"id": 4, "rank": 4, "name": "노트", "category_major": "문구/팬시", "category_middle": "노트/메모"},
+        ]
+        self.catalog = CatalogSnapshot(rows, version=1)
+
+    def test_lookup_by_id(self):
+        self.assertEqual(self.catalog.get_product(2)["name"], "욕실매트")
+        self.assertIsNone(self.catalog.get_product(99))
+
+    def test_indexes(self):
+        self.assertEqual([p["id"] for p in self.catalog.get_category_products("문구/팬시", "필기구")], [1, 3])
+        self.assertEqual(len(self.catalog.get_category_products("문구/팬시")), 3)
+        self.assertEqual([p["id"] for p in self.catalog.get_floor_products("B1")], [1, 3])
+
+    def test_categories_hierarchy(self):
+        self.assertEqual(self.catalog.categories, {
+            "문구/팬시": ["노트/메모", "필기구"],
+            "청소/욕실": ["욕실용품"],
+        })
+
+    def test_records_are_slotted(self):
+        with self.assertRaises(AttributeError):
+            self.catalog.by_id[1].extra = 1
+
+class TestCatalogReload(unittest.TestCase):
+    """products.db copy in a temp dir; the write counter drives reloads."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patches = [
+            mock.patch.object(database, "DB_PATH", os.path.join(self.tmp.name, "products.db")),
+            mock.patch.object(catalog, "_snapshot", None),
+            mock.patch.object(catalog, "_listeners", []),
+            mock.patch.object(catalog, "RELOAD_CHECK_INTERVAL", 0.01),
+        ]
+        for p in self.patches:
+            p.start()
+        database.init_database()
+        database.insert_product(1, "볼펜", 1000, "")
+
+    def tearDown(self):
+        catalog.stop_catalog_refresher()
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_reload_only_on_products_writes(self):
+        snap = catalog.load_catalog()
+        self.assertFalse(catalog.refresh_catalog())
+
+        with database.write_connection() as conn:  # map editor writes the same file
+            conn.execute("INSERT INTO map_zones (floor, name, rect) VALUES ('B1', 'a', '{}')")
+        self.assertFalse(catalog.refresh_catalog())
+
+        database.insert_product(2, "연필", 500, "")
+        self.assertTrue(catalog.refresh_catalog())
+        self.assertEqual(len(catalog.get_catalog()), 2)
+        self.assertGreater(catalog.get_catalog().version, snap.version)
+
+    def test_refresher_rebuilds_listeners_before_publish(self):
+        seen = []
+        catalog.on_catalog_reload(lambda snap: seen.append((snap.version, catalog._snapshot)))
+        first = catalog.load_catalog()
+        database.insert_product(2, "연필", 500, "")
+        for _ in range(200):
+            if catalog.get_catalog() is not first:
+                break
+            time.sleep(0.01)
+        new = catalog.get_catalog()
+        self.assertEqual(len(new), 2)
+        self.assertEqual(seen[-1], (new.version, first))  # old snapshot still live during rebuild
+
+
+if __name__ == '__main__':
+    unittest.main()
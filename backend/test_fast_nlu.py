@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service import intent_keyword_node as node
+from backend.ai_service.fast_nlu import AhoCorasick, FastPathNLU
+from backend.ai_service.schemas import Intent
+
+CATEGORIES = {
+    "문구/팬시": {"필기구": ["볼펜", "연필"], "노트/메모": ["노트"]},
+    "주방용품": {"주방잡화": ["수세미", "행주"]},
+    "공구/디지털": {"전기용품": ["케이블", "충전기"]},
+}
+PRODUCTS = [
+    {"name": "규조토 욕실매트 대형", "category_major": "청소/욕실"},
+    {"name": "망사 수세미 3개입", "category_major": "주방용품"},
+    {"name": "3색 볼펜 0.7mm", "category_major": "문구/팬시"},
+]
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_overlapping_matches(self):
+        ac = AhoCorasick()
+        for w in ["he", "she", "his", "hers"]:
+            ac.add(w)
+        ac.build()
+        self.assertEqual(sorted(ac.iter("ushers")), [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+
+class TestFastPathNLU(unittest.TestCase):
+    def setUp(self):
+        self.nlu = FastPathNLU(PRODUCTS, CATEGORIES)
+
+    def slots(self, text):
+        result = self.nlu.analyze(text)
+        return None if result is None else result.slots
+
+    def test_simple_lookups(self):
+        slots = self.slots("볼펜 어디 있어?")
+        self.assertEqual((slots.item, slots.category_hint), ("볼펜", "문구/팬시"))
+        self.assertEqual(self.nlu.analyze("볼펜어디있어").intent, Intent.PRODUCT_LOCATION)
+        slots = self.slots("규조토 욕실매트 어딨어요")
+        self.assertEqual((slots.item, slots.category_hint), ("규조토 욕실매트", None))  # name words: no hint
+        self.assertEqual(self.slots("그 노트는 어디에 있어요?").item, "노트")
+
+        slots = self.slots("파란색 볼펜 있어?")
+        self.assertEqual((slots.item, slots.attrs, slots.query_rewrite), ("볼펜", ["파란색"], "파란색 볼펜"))
+
+    def test_price_constraints(self):
+        slots = self.slots("5,000원 이하 수세미 있어요?")
+        self.assertEqual((slots.item, slots.max_price, slots.min_price), ("수세미", 5000, None))
+        self.assertEqual(self.slots("3천원 이상 행주").min_price, 3000)
+        slots = self.slots("1000원짜리 볼펜 있어?")
+        self.assertEqual((slots.min_price, slots.max_price), (None, 1000))
+
+    def test_unknown_modifier(self):
+        self.assertEqual(self.slots("충전 케이블 찾아줘").item, "충전 케이블")
+        self.assertIsNone(self.slots("충전 케이블"))  # no lookup phrase
+
+    def test_not_confident(self):
+        for text in ["오늘 날씨 어때?", "볼펜이랑 노트 어디 있어", "화장실 어디에요?",
+                     "볼펜 환불하고 싶어요", "5000원 이하 생일 선물", "배고파", ""]:
+            self.assertIsNone(self.nlu.analyze(text), text)
+
+
+class TestFastPathInNode(unittest.TestCase):
+    def _run_node(self, text, gate_answer):
+        staged = mock.AsyncMock(side_effect=AssertionError("LLM path called"))
+        gate = mock.AsyncMock(return_value=gate_answer)
+        expand = mock.AsyncMock(return_value=["볼펜", "필기구"])
+        with mock.patch.object(node, "get_fast_nlu", return_value=FastPathNLU(PRODUCTS, CATEGORIES)), \
+                mock.patch.object(node, "FAST_PATH_NLU", True), \
+                mock.patch.multiple(node, _run_staged=staged, _classify_intent=gate,
+                                    _expand_search_keywords=expand):
+            result = asyncio.run(node.intent_keyword_node({"input_text": text, "history": []}))
+        gate.assert_awaited_once()
+        return result
+
+    def test_fast_path_skips_nlu_but_not_gate(self):
+        result = self._run_node("볼펜 어디 있어?", "Y")
+        self.assertEqual((result["intent_valid"], result["slots"]["item"]), ("Y", "볼펜"))
+        self.assertEqual(result["expanded_keywords"], ["볼펜", "필기구"])
+        self.assertEqual(result["final_response"].model_name, "fast-path")
+
+        # Off-topic utterance that happens to contain a catalog word
+        result = self._run_node("볼펜 어디 있어?", "N")
+        self.assertEqual((result["intent_valid"], result["intent"]), ("N", Intent.UNSUPPORTED))
+
+    def test_not_confident_uses_llm_path(self):
+        fallback = mock.AsyncMock(return_value=("N", None, []))
+        with mock.patch.object(node, "get_fast_nlu", return_value=FastPathNLU(PRODUCTS, CATEGORIES)), \
+                mock.patch.object(node, "FAST_PATH_NLU", True), \
+                mock.patch.object(node, "_run_staged", fallback):
+            result = asyncio.run(node.intent_keyword_node({"input_text": "오늘 날씨 어때?", "history": []}))
+        self.assertEqual(result["intent_valid"], "N")
+        fallback.assert_awaited_once()
+
+if __name__ == '__main__':
+    unittest.main()
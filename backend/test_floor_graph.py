@@ -0,0 +1,63 @@
+import sys
+import os
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.navigation.pathfinder import MapNavigator
+from backend.navigation.route_cache import RouteCache
+from backend.navigation.floor_graph import FloorGraph, transfer_cost
+from backend.navigation.zone_index import ZoneIndex
+
+
+def _zone(zid, floor, name, zone_type, left, top):
+    rect = f'{{"left": "{left}%", "top": "{top}%", "width": "0%", "height": "0%"}}'
+    return {"id": zid, "floor": floor, "name": name, "type": zone_type, "rect": rect}
+
+
+class TestFloorGraph(unittest.TestCase):
+    def setUp(self):
+        # Two open 50x50 floors. Elevator A is closer to the start on F1, but Elevator B
+        # is next to the target on F2 and gives the cheaper total route.
+        self.navigator = MapNavigator()
+        for floor in ("F1", "F2"):
+            self.navigator.load_grid(floor, [[0] * 50 for _ in range(50)])
+        self.zones = ZoneIndex([
+            _zone(1, "F1", "Elevator A", "connection", 10, 10),
+            _zone(2, "F2", "Elevator A", "connection", 10, 10),
+            _zone(3, "F1", "Elevator B", "connection", 40, 40),
+            _zone(4, "F2", "Elevator B", "connection", 40, 40),
+        ], version=1)
+        cache = RouteCache(self.navigator).build(self.zones)
+        self.graph = FloorGraph(cache, self.zones)
+
+    def _cost(self, floor, path):
+        cost, w = self.navigator.cost_grids[floor], self.navigator.width[floor]
+        return sum(cost[y * w + x] for x, y in path[1:])
+
+    def test_picks_connection_with_lowest_total_cost(self):
+        self.assertTrue(self.graph.connects("F1", "F2"))
+        segments = self.graph.route("F1", (8, 8), "F2", (22, 22))
+        self.assertEqual([s.floor for s in segments], ["F1", "F2"])
+        self.assertEqual(segments[0].connection, "Elevator B")
+        self.assertIsNone(segments[1].connection)
+        self.assertEqual(segments[0].path[0], (8, 8))
+        self.assertEqual(segments[0].path[-1], (20, 20))
+        self.assertEqual(segments[1].path[0], (20, 20))
+        self.assertEqual(segments[1].path[-1], (22, 22))
+
+    def test_segment_costs_match_astar(self):
+        segments = self.graph.route("F1", (30, 5), "F2", (3, 40))
+        for seg in segments:
+            astar = self.navigator.find_path(seg.floor, seg.path[0], seg.path[-1])
+            self.assertAlmostEqual(seg.cost, self._cost(seg.floor, astar), places=3)
+            self.assertAlmostEqual(seg.cost, self._cost(seg.floor, seg.path), places=3)
+
+    def test_transfer_cost_by_name(self):
+        self.assertGreater(transfer_cost("Elevator"), transfer_cost("에스컬레이터"))
+        self.assertEqual(transfer_cost("somewhere"), 200.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
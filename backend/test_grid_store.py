@@ -0,0 +1,38 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from backend.navigation.grid_store import save_grid_file, load_grid_file
+from backend.navigation.map_processor import block_reduce
+
+
+class TestGridStore(unittest.TestCase):
+    def test_block_reduce_matches_per_cell_loop(self):
+        rng = np.random.default_rng(0)
+        binary = (rng.random((57, 83)) < 0.8).astype(np.uint8) * 255
+        gs = 10
+        expected = np.zeros((57 // gs, 83 // gs))
+        for y in range(expected.shape[0]):
+            for x in range(expected.shape[1]):
+                cell = binary[y * gs:(y + 1) * gs, x * gs:(x + 1) * gs]
+                expected[y, x] = np.count_nonzero(cell) / cell.size
+        np.testing.assert_allclose(block_reduce(binary != 0, gs), expected)
+
+    def test_npz_roundtrip(self):
+        rng = np.random.default_rng(1)
+        grid = (rng.random((102, 86)) < 0.3).astype(np.uint8)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "b1_grid.npz")
+            save_grid_file(path, grid, 10, 863, 1024)
+            loaded = load_grid_file(path)
+        self.assertEqual((loaded.width, loaded.height, loaded.grid_size), (863, 1024, 10))
+        np.testing.assert_array_equal(loaded.grid, grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import os
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service import intent_keyword_node as node
+from backend.ai_service.intent_classifier import IntentClassifier, load_training_data
+
+
+class _FakeGate:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    async def generate(self, contents, deadline=None):
+        self.calls += 1
+        return mock.Mock(text=self.answer)
+
+
+class TestIntentClassifier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        texts, labels = load_training_data()
+        cls.classifier = IntentClassifier.train(texts, labels)
+
+    def test_training_data(self):
+        texts, labels = load_training_data()
+        self.assertEqual(len(texts), len(labels))
+        self.assertEqual(set(labels), {"Y", "N"})
+
+    def test_predictions(self):
+        self.assertEqual(self.classifier.predict("볼펜 어디 있어?")[0], "Y")
+        self.assertEqual(self.classifier.predict("충전 케이블 찾아줘")[0], "Y")
+        self.assertEqual(self.classifier.predict("오늘 날씨 어때?")[0], "N")
+        self.assertEqual(self.classifier.predict("   "), ("N", 1.0))
+
+    def test_save_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gate.joblib")
+            self.classifier.save(path)
+            loaded = IntentClassifier.load(path)
+        text = "수납함 어디야?"
+        self.assertEqual(loaded.predict(text), self.classifier.predict(text))
+
+    def test_gate_uses_local_answer_or_escalates(self):
+        gate = _FakeGate("N")
+        with mock.patch.object(node, "get_intent_classifier", return_value=self.classifier), \
+                mock.patch.object(node, "get_model", return_value=gate), \
+                mock.patch.object(node, "INTENT_CLASSIFIER_THRESHOLD", 0.5):
+            self.assertEqual(asyncio.run(node._classify_intent("볼펜 어디 있어?")), "Y")
+        self.assertEqual(gate.calls, 0)
+
+        with mock.patch.object(node, "get_intent_classifier", return_value=self.classifier), \
+                mock.patch.object(node, "get_model", return_value=gate), \
+                mock.patch.object(node, "INTENT_CLASSIFIER_THRESHOLD", 1.01):
+            self.assertEqual(asyncio.run(node._classify_intent("볼펜 어디 있어?")), "N")
+        self.assertEqual(gate.calls, 1)
+
+    def test_local_n_always_escalates(self):
+        self.assertEqual(self.classifier.predict("오늘 날씨 어때?")[0], "N")
+        gate = _FakeGate("Y")
+        with mock.patch.object(node, "get_intent_classifier", return_value=self.classifier), \
+                mock.patch.object(node, "get_model", return_value=gate), \
+                mock.patch.object(node, "INTENT_CLASSIFIER_THRESHOLD", 0.0):
+            self.assertEqual(asyncio.run(node._classify_intent("오늘 날씨 어때?")), "Y")
+        self.assertEqual(gate.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
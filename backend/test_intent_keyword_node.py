@@ -0,0 +1,116 @@
+import sys
+import os
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service import intent_keyword_node as node
+from backend.ai_service.schemas import Intent, NLUResponse, NLUSlots
+
+ROUND_TRIP = 0.05
+
+
+def setUpModule():
+    # These tests exercise the LLM stages; keep the fast path from answering on its own.
+    patcher = mock.patch.object(node, "FAST_PATH_NLU", False)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+
+
+class TestSpeculativeIntentKeyword(unittest.TestCase):
+    """Stage functions replaced by timed stand-ins for Gemini round trips."""
+
+    def setUp(self):
+        self.calls = []
+        self.cancelled = []
+
+    def _patch(self, gate="Y", item="볼펜"):
+        async def classify(text, deadline=None):
+            await asyncio.sleep(ROUND_TRIP)
+            return gate
+
+        async def analyze(text, history=None, on_item=None, deadline=None):
+            self.calls.append("nlu")
+            try:
+                await asyncio.sleep(ROUND_TRIP)
+                if on_item:
+                    on_item(item)  # item slot streamed in
+                await asyncio.sleep(ROUND_TRIP)
+            except asyncio.CancelledError:
+                self.cancelled.append("nlu")
+                raise
+            return NLUResponse(request_id="t", intent=Intent.PRODUCT_LOCATION, slots=NLUSlots(item=item))
+
+        async def expand(name, deadline=None):
+            self.calls.append(f"expand:{name}")
+            await asyncio.sleep(ROUND_TRIP)
+            return [name, "필기구"]
+
+        return mock.patch.multiple(node, _classify_intent=classify, _analyze_text=analyze,
+                                   _expand_search_keywords=expand)
+
+    def _run(self, speculative):
+        state = {"input_text": "볼펜 어디 있어?", "history": []}
+        with mock.patch.object(node, "SPECULATIVE_NLU", speculative):
+            start = time.perf_counter()
+            result = asyncio.run(node.intent_keyword_node(state))
+            return result, time.perf_counter() - start
+
+    def test_speculative_saves_round_trips(self):
+        with self._patch():
+            sequential, t_seq = self._run(False)
+            speculative, t_spec = self._run(True)
+        self.assertEqual(speculative["expanded_keywords"], sequential["expanded_keywords"])
+        self.assertEqual(speculative["slots"], sequential["slots"])
+        self.assertLess(t_spec, t_seq - ROUND_TRIP)
+
+    def test_gate_n_cancels_nlu_and_expansion(self):
+        with self._patch(gate="N"):
+            result, _ = self._run(True)
+        self.assertEqual(result["intent_valid"], "N")
+        self.assertEqual(result["expanded_keywords"], [])
+        self.assertEqual(self.cancelled, ["nlu"])
+
+
+class _FakeModel:
+    def __init__(self, text):
+        self.text = text
+
+    async def generate(self, contents, deadline=None):
+        return mock.Mock(text=self.text, usage_metadata=None)
+
+
+class TestMergedMode(unittest.TestCase):
+    def _model(self, text):
+        return lambda name: _FakeModel(text)
+
+    def test_single_call_fills_all_stages(self):
+        raw = ('{"intent_valid": "Y", "intent": "PRODUCT_LOCATION", "slots": {"item": "볼펜", "attrs": [], '
+               '"max_price": 3000}, "needs_clarification": false, "expanded_keywords": ["볼펜", "필기구"]}')
+        with mock.patch.object(node, "get_model", self._model(raw)), \
+                mock.patch.object(node, "INTENT_PIPELINE_MODE", "merged"):
+            result = asyncio.run(node.intent_keyword_node({"input_text": "3000원 이하 볼펜", "history": []}))
+        self.assertEqual(result["intent_valid"], "Y")
+        self.assertEqual(result["slots"]["item"], "볼펜")
+        self.assertEqual(result["slots"]["max_price"], 3000)
+        self.assertEqual(result["expanded_keywords"], ["볼펜", "필기구"])
+
+    def test_gate_n_and_fallback(self):
+        raw = '{"intent_valid": "N", "intent": "UNSUPPORTED", "slots": {}, "needs_clarification": false, "expanded_keywords": []}'
+        with mock.patch.object(node, "get_model", self._model(raw)):
+            valid, _, expanded = asyncio.run(node._run_merged("날씨 어때", []))
+        self.assertEqual((valid, expanded), ("N", []))
+
+        staged = mock.AsyncMock(return_value=("Y", None, ["x"]))
+        with mock.patch.object(node, "get_model", self._model("not json at all")), \
+                mock.patch.object(node, "_run_staged", staged):
+            self.assertEqual(asyncio.run(node._run_merged("볼펜", [])), ("Y", None, ["x"]))
+        staged.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
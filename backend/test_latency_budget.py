@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service import config
+from backend.ai_service import intent_keyword_node as node
+from backend.ai_service import reranker_node, supervisor
+from backend.ai_service.schemas import Intent
+
+CANDIDATES = [
+    {"id": 1, "name": "욕실 발매트", "category_middle": "욕실용품"},
+    {"id": 2, "name": "규조토 욕실매트", "category_middle": "욕실용품"},
+    {"id": 3, "name": "주방 매트", "category_middle": "주방잡화"},
+]
+
+
+class _NeverCalled:
+    async def generate_content_async(self, contents, stream=False):
+        raise AssertionError("LLM called with the budget spent")
+
+
+class TestBudgetFallbacks(unittest.TestCase):
+    """With the deadline already passed, every stage answers locally without the LLM."""
+
+    def setUp(self):
+        self.patches = [
+            mock.patch.dict(config._models, clear=True),
+            mock.patch.object(node, "get_memo_store", return_value=None),
+        ]
+        for p in self.patches:
+            p.start()
+        for name in ("expansion", "rerank", "clarification"):
+            config.get_model(name)._model = _NeverCalled()
+        self.deadline = config.new_deadline(0.01)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_expansion_skipped(self):
+        self.assertEqual(asyncio.run(node._expand_search_keywords("욕실매트", deadline=self.deadline)), [])
+
+    def test_node_reports_degraded(self):
+        nlu = node.NLUResponse(request_id="t", intent=Intent.PRODUCT_LOCATION, slots=node.NLUSlots(item="욕실매트"))
+
+        async def staged(text, history, deadline=None):
+            return "Y", nlu, await node._expand_search_keywords("욕실매트", deadline=deadline)
+
+        state = {"input_text": "욕실매트 어디 있어", "history": [], "deadline": self.deadline}
+        with mock.patch.object(node, "FAST_PATH_NLU", False), mock.patch.object(node, "_run_staged", staged):
+            self.assertTrue(asyncio.run(node.intent_keyword_node(state))["degraded"])
+            state["deadline"] = None
+            config.get_model("expansion")._model = mock.Mock(
+                generate_content_async=mock.AsyncMock(return_value=mock.Mock(text='["욕실매트"]')))
+            self.assertFalse(asyncio.run(node.intent_keyword_node(state))["degraded"])
+
+    def test_rerank_falls_back_to_lexical(self):
+        state = {"intent": Intent.PRODUCT_LOCATION, "input_text": "규조토 욕실매트 어디 있어",
+                 "slots": {"item": "규조토 욕실매트"}, "search_candidates": CANDIDATES,
+                 "deadline": self.deadline}
+        with mock.patch.object(reranker_node, "RERANKER", "llm"):
+            output = asyncio.run(reranker_node.reranker_node(state))
+        result = output["rerank_result"]
+        self.assertEqual((result["selected_id"], result["fallback"]), ("2", "lexical"))
+        self.assertTrue(output["degraded"])
+
+        # No clear winner → nothing selected
+        unclear = reranker_node._lexical_rerank("매트", CANDIDATES, "매트")
+        self.assertIsNone(unclear["selected_id"])
+
+    def test_clarification_uses_template(self):
+        state = {"input_text": "매트 어디 있어", "slots": {"item": "매트"},
+                 "search_candidates": CANDIDATES, "deadline": self.deadline}
+        output = asyncio.run(supervisor.clarification_node(state))
+        resp = output["final_response"]
+        self.assertTrue(output["degraded"])
+        self.assertTrue(resp.needs_clarification)
+        self.assertIn("욕실용품, 주방잡화", resp.generated_question)
+        self.assertEqual(supervisor._template_question({}, []), supervisor.DEFAULT_QUESTION)
+
+
+if __name__ == '__main__':
+    unittest.main()
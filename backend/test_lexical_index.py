@@ -0,0 +1,97 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.database import database
+from backend.database.lexical_index import BM25Index
+from backend.database.tokenizer import tokenize, words, to_jamo
+
+class TestTokenizer(unittest.TestCase):
+    def test_compound_shares_terms(self):
+        compound = set(tokenize("욕실매트"))
+        spaced = set(tokenize("욕실 매트"))
+        self.assertTrue(spaced <= compound)
+
+    def test_mixed_script_runs(self):
+        tokens = tokenize("USB충전기")
+        self.assertIn("usb", tokens)
+        self.assertIn("충전기", tokens)
+
+    def test_words_and_jamo(self):
+        self.assertEqual(words("파란색 볼펜(0.5mm)"), ["파란색", "볼펜", "0", "5mm"])
+        self.assertEqual(to_jamo("매트"), "ㅁㅐㅌㅡ")
+        self.assertIn("#ㅁㅐㅌ", tokenize("매트", jamo=True))
+
+class TestBM25Index(unittest.TestCase):
+    def setUp(self):
+        self.products = [
+            {"id": 1, "name": "모나미 볼펜 153 검정"},
+            {"id": 2, "name": "욕실 슬리퍼 그레이"},
+            {"id": 3, "name": "규조토 욕실 매트"},
+            {"id": 4, "name": "USB 충전 케이블 1m"},
+            {"id": 5, "name": ""},
+        ]
+        self.index = BM25Index().build(self.products)
+
+    def test_empty_names_skipped(self):
+        self.assertEqual(len(self.index), 4)
+
+    def test_ranked_results(self):
+        results = self.index.search("욕실 매트")
+        self.assertEqual([r["id"] for r in results], [3, 2])
+        self.assertGreater(results[0]["bm25_score"], results[1]["bm25_score"])
+
+    def test_case_insensitive_and_limit(self):
+        results = self.index.search("usb 케이블", limit=1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["id"], 4)
+
+    def test_compound_query_matches_spaced_name(self):
+        results = self.index.search("욕실매트")
+        self.assertEqual(results[0]["id"], 3)
+
+    def test_no_match(self):
+        self.assertEqual(self.index.search("가위"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_source_rows_not_mutated(self):
+        self.index.search("볼펜")
+        self.assertNotIn("bm25_score", self.products[0])
+
+class TestProductsFTS(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self._orig_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.tmp_dir, "products.db")
+        database.init_database()
+        for rank, name in enumerate(["제트스트림 볼펜 블랙", "규조토 욕실매트", "욕실 슬리퍼"], 1):
+            database.insert_product(rank, name, 1000, "")
+
+    def tearDown(self):
+        database.DB_PATH = self._orig_path
+        shutil.rmtree(self.tmp_dir)
+
+    def test_trigram_match_ranked(self):
+        results = database.search_products_fts("제트스트림")
+        self.assertEqual([r["name"] for r in results], ["제트스트림 볼펜 블랙"])
+
+    def test_short_terms(self):
+        results = database.search_products_fts("욕실 매트")
+        self.assertEqual(results[0]["name"], "규조토 욕실매트")
+        self.assertEqual(len(results), 2)
+
+    def test_triggers_keep_index_in_sync(self):
+        conn = database.get_connection()
+        conn.execute("UPDATE products SET name = '규조토 발매트' WHERE name = '규조토 욕실매트'")
+        conn.commit()
+        conn.close()
+        self.assertEqual(database.search_products_fts("욕실매트"), [])
+        self.assertEqual(database.search_products_fts("규조토")[0]["name"], "규조토 발매트")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import threading
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service.memo_store import (
+    MemoStore, EXPAND, INFER, category_expansions, poc_expansions, prewarm,
+)
+from backend.ai_service.prompts import KEYWORD_EXPANSION_PROMPT
+
+
+class TestMemoStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "memo.db")
+        self.store = MemoStore(self.path)
+
+    def tearDown(self):
+        self.store._conn.close()
+        self.tmp.cleanup()
+
+    def test_roundtrip_keyed_on_model_prompt_and_input(self):
+        self.store.put(EXPAND, "prompt v1", "욕실매트", ["욕실매트", "욕실", "매트"])
+        self.assertEqual(self.store.get(EXPAND, "prompt v1", " 욕실매트! "), ["욕실매트", "욕실", "매트"])
+        self.assertIsNone(self.store.get(EXPAND, "prompt v2", "욕실매트"))
+        self.assertIsNone(self.store.get(EXPAND, "prompt v1", "욕실매트", model="other-model"))
+        self.assertIsNone(self.store.get(INFER, "prompt v1", "욕실매트"))
+
+        # Persisted across instances
+        reopened = MemoStore(self.path)
+        self.assertEqual(reopened.get(EXPAND, "prompt v1", "욕실매트"), ["욕실매트", "욕실", "매트"])
+        reopened._conn.close()
+
+    def test_async_access_runs_off_the_loop(self):
+        threads = []
+        original = self.store._conn
+
+        class _Conn:
+            def __getattr__(self, name):
+                threads.append(threading.get_ident())
+                return getattr(original, name)
+
+        self.store._conn = _Conn()
+
+        async def run():
+            await self.store.aput(INFER, "prompt", "욕실이 미끄러워", ["미끄럼방지 매트"])
+            self.store._hot.clear()
+            return await self.store.aget(INFER, "prompt", "욕실이 미끄러워"), threading.get_ident()
+
+        value, loop_thread = asyncio.run(run())
+        self.store._conn = original
+        self.assertEqual(value, ["미끄럼방지 매트"])
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_category_expansions(self):
+        items = dict(category_expansions({"청소/욕실": {"욕실용품": ["비누", "욕실매트"]},
+                                          "수납/정리": {"수납함": ["비누"]}}))
+        self.assertEqual(items["욕실매트"], ["욕실매트", "욕실용품", "청소", "욕실"])
+        self.assertEqual(len(items), 2)
+
+    def test_prewarm_prefers_recorded_outputs(self):
+        poc = os.path.join(self.tmp.name, "expansion_result.json")
+        with open(poc, "w", encoding="utf-8") as f:
+            json.dump([
+                {"extraction": {"keyword": "비누"}, "expansion": {"expanded_keywords": ["비누", "세안", "욕실용품"]}},
+                {"extraction": {"error": "x"}, "expansion": {"error": "No valid keyword"}},
+            ], f, ensure_ascii=False)
+        self.assertEqual(poc_expansions(poc), [("비누", ["비누", "세안", "욕실용품"])])
+
+        self.assertGreater(prewarm(self.store, poc_path=poc), 1)
+        self.assertEqual(self.store.get(EXPAND, KEYWORD_EXPANSION_PROMPT, "비누"), ["비누", "세안", "욕실용품"])
+        self.assertEqual(self.store.get(EXPAND, KEYWORD_EXPANSION_PROMPT, "텀블러")[:2], ["텀블러", "잔/컵/물병"])
+        self.assertEqual(prewarm(self.store, poc_path=poc), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import sys
+import os
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.ai_service import config
+from backend.ai_service.config import LLMModel, get_model
+
+
+class _SlowModel:
+    """GenerativeModel stand-in that records how many calls are in flight."""
+
+    def __init__(self, delay=0.05, chunks=("a", "b")):
+        self.delay = delay
+        self.chunks = chunks
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content_async(self, contents, stream=False):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if stream:
+            return self._stream()
+        return contents
+
+    async def _stream(self):
+        for text in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield text
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+        fake_genai = mock.Mock(GenerativeModel=lambda name, **kw: self.built.append(kw) or _SlowModel())
+        self.patches = [
+            mock.patch.object(config, "get_genai", return_value=fake_genai),
+            mock.patch.dict(config._models, clear=True),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_model_built_once_per_name(self):
+        self.assertIs(get_model("nlu"), get_model("nlu"))
+        self.assertIs(get_model("nlu").model, get_model("nlu").model)
+        self.assertEqual(len(self.built), 1)
+        self.assertIn("response_schema", self.built[0]["generation_config"])
+
+        config.build_models()
+        self.assertEqual(len(self.built), len(config.MODEL_CONFIGS))
+
+    def test_concurrency_limit(self):
+        model = LLMModel("test", {}, timeout=5, concurrency=2)
+        model._model = _SlowModel()
+
+        async def run():
+            return await asyncio.gather(*(model.generate(i) for i in range(6)))
+
+        self.assertEqual(asyncio.run(run()), list(range(6)))
+        self.assertEqual(model._model.peak, 2)
+
+    def test_timeout(self):
+        model = LLMModel("test", {}, timeout=0.01)
+        model._model = _SlowModel(delay=0.2)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(model.generate("x"))
+
+    def test_stream_deadline_covers_whole_stream(self):
+        model = LLMModel("test", {}, timeout=1)
+        model._model = _SlowModel(delay=0.01)
+
+        async def collect():
+            return [c async for c in model.stream("x")]
+
+        self.assertEqual(asyncio.run(collect()), ["a", "b"])
+
+        model = LLMModel("test", {}, timeout=0.1)
+        model._model = _SlowModel(delay=0.04, chunks=("a",) * 10)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(collect())
+
+    def test_budget_exhausted_skips_call(self):
+        model = LLMModel("test", {}, timeout=5, reserve=0.5)
+        model._model = _SlowModel()
+        deadline = config.new_deadline(0.6)  # 0.1s left after the reserve
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(model.generate("x", deadline=deadline))
+        self.assertEqual((model._model.peak, model.stats["skipped"]), (0, 1))
+
+        self.assertEqual(asyncio.run(model.generate("x", deadline=config.new_deadline(2))), "x")
+        self.assertLess(model.call_timeout(config.new_deadline(2)), 1.6)
+
+    def test_hedged_request_wins_over_slow_primary(self):
+        class _Straggler:
+            calls = 0
+
+            async def generate_content_async(self, contents, stream=False):
+                _Straggler.calls += 1
+                await asyncio.sleep(1.0 if _Straggler.calls == 1 else 0.01)
+                return _Straggler.calls
+
+        model = LLMModel("test", {}, timeout=5)
+        model._model = _Straggler()
+        model._latencies.extend([0.02] * config.LLM_HEDGE_MIN_SAMPLES)
+        self.assertAlmostEqual(model.hedge_delay(), 0.02)
+
+        start = time.perf_counter()
+        self.assertEqual(asyncio.run(model.generate("x")), 2)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual((model.stats["hedged"], model.stats["hedge_wins"]), (1, 1))
+
+    def test_env_override(self):
+        with mock.patch.dict(os.environ, {"LLM_TIMEOUT_TEST": "1.5", "LLM_CONCURRENCY_TEST": "3"}):
+            model = LLMModel("test", {}, timeout=5, concurrency=1)
+        self.assertEqual((model.timeout, model.concurrency), (1.5, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
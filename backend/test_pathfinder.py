@@ -5,7 +5,12 @@ import unittest
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from backend.navigation.pathfinder import MapNavigator
+from collections import deque
+
+import numpy as np
+
+from backend.navigation import pathfinder
+from backend.navigation.pathfinder import MapNavigator, distance_transform_l1
 
 class TestMapNavigator(unittest.TestCase):
     def setUp(self):
@@ -58,5 +63,189 @@ class TestMapNavigator(unittest.TestCase):
         for x, y in path:
             self.assertEqual(self.grid[y][x], 0, f"Path goes through obstacle at {x},{y}")
 
+    def test_path_cost_is_optimal(self):
+        # Reference: plain Dijkstra over the same per-cell entry costs
+        import heapq
+        navigator = MapNavigator()
+        rng = np.random.default_rng(1)
+        grid = (rng.random((30, 40)) < 0.2).astype(np.uint8)
+        grid[0, 0] = grid[29, 39] = 0
+        navigator.load_grid("R", grid)
+        navigator.update_obstacles("R", [])
+        cost = navigator.cost_grids["R"]
+        w, n = 40, 30 * 40
+
+        dist = [float("inf")] * n
+        dist[0] = 0.0
+        heap = [(0.0, 0)]
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if d > dist[cur]:
+                continue
+            cy, cx = divmod(cur, w)
+            for nx, ny in [(cx, cy + 1), (cx, cy - 1), (cx + 1, cy), (cx - 1, cy)]:
+                nb = ny * w + nx
+                if 0 <= nx < w and 0 <= ny < 30 and cost[nb] >= 0 and d + cost[nb] < dist[nb]:
+                    dist[nb] = d + cost[nb]
+                    heapq.heappush(heap, (dist[nb], nb))
+
+        path = navigator.find_path("R", (0, 0), (39, 29))
+        if dist[n - 1] == float("inf"):
+            self.assertIsNone(path)
+        else:
+            self.assertAlmostEqual(sum(cost[y * w + x] for x, y in path[1:]), dist[n - 1])
+
+    def test_disconnected_returns_none(self):
+        navigator = MapNavigator()
+        grid = [[0, 0, 1, 0, 0] for _ in range(5)]
+        navigator.load_grid("D", grid)
+        self.assertIsNone(navigator.find_path("D", (0, 0), (4, 4)))
+        self.assertEqual(navigator.find_path("D", (1, 1), (1, 1)), [(1, 1)])
+
+class TestObstacles(unittest.TestCase):
+    def _bfs_distance(self, grid):
+        h, w = grid.shape
+        dist = np.full((h, w), np.inf)
+        queue = deque()
+        for y, x in zip(*np.nonzero(grid)):
+            dist[y, x] = 0
+            queue.append((x, y))
+        while queue:
+            cx, cy = queue.popleft()
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < w and 0 <= ny < h and dist[ny, nx] == np.inf:
+                    dist[ny, nx] = dist[cy, cx] + 1
+                    queue.append((nx, ny))
+        return dist
+
+    def test_distance_transform_matches_bfs(self):
+        rng = np.random.default_rng(0)
+        grid = (rng.random((40, 55)) < 0.05).astype(np.uint8)
+        expected = self._bfs_distance(grid)
+        np.testing.assert_array_equal(distance_transform_l1(grid), expected)
+
+        # NumPy fallback gives the same result as OpenCV
+        saved, pathfinder.cv2 = pathfinder.cv2, None
+        try:
+            np.testing.assert_array_equal(distance_transform_l1(grid), expected)
+        finally:
+            pathfinder.cv2 = saved
+
+    def test_update_obstacles_rasterizes_rect(self):
+        navigator = MapNavigator()
+        navigator.load_grid("F", [[0] * 20 for _ in range(10)])
+        navigator.update_obstacles("F", [
+            {"type": "zone", "name": "shelf", "rect": '{"left": "25%", "top": "40%", "width": "25%", "height": "20%"}'},
+            {"type": "start", "name": "kiosk", "rect": '{"left": "0%", "top": "0%", "width": "50%", "height": "50%"}'},
+        ])
+        grid = navigator.grids["F"]
+        # x: 5..10 (+1 padding) -> 4..11, y: 4..6 (+1 padding) -> 3..7
+        self.assertEqual(int(grid.sum()), 7 * 4)
+        self.assertTrue(grid[3:7, 4:11].all())
+        self.assertEqual(navigator.distance_grids["F"][0, 0], 7)
+
+    def test_incremental_zone_edit_matches_full_rebuild(self):
+        rng = np.random.default_rng(4)
+        grid = (rng.random((60, 80)) < 0.05).astype(np.uint8)
+        a = {"id": 1, "type": "zone", "name": "a", "rect": '{"left": "20%", "top": "20%", "width": "30%", "height": "10%"}'}
+        b = {"id": 2, "type": "zone", "name": "b", "rect": '{"left": "40%", "top": "25%", "width": "10%", "height": "40%"}'}
+
+        def rebuilt(zones):
+            nav = MapNavigator()
+            nav.load_grid("F", grid)
+            nav.update_obstacles("F", zones)
+            return nav
+
+        def assert_same(nav, ref):
+            np.testing.assert_array_equal(nav.grids["F"], ref.grids["F"])
+            np.testing.assert_array_equal(np.minimum(nav.distance_grids["F"], pathfinder.CENTERING_DIST),
+                                          np.minimum(ref.distance_grids["F"], pathfinder.CENTERING_DIST))
+            self.assertEqual(nav.cost_grids["F"], ref.cost_grids["F"])
+            self.assertEqual(nav.find_path("F", (0, 0), (79, 59)), ref.find_path("F", (0, 0), (79, 59)))
+
+        nav = rebuilt([a])
+        window = nav.add_zone_obstacle("F", b)
+        self.assertLess((window[2] - window[0]) * (window[3] - window[1]), 60 * 80)
+        assert_same(nav, rebuilt([a, b]))
+        self.assertIsNone(nav.add_zone_obstacle("F", b))  # unchanged
+
+        # Removing `a` keeps the part overlapping `b` blocked
+        nav.remove_zone_obstacle("F", 1)
+        assert_same(nav, rebuilt([b]))
+        nav.remove_zone_obstacle("F", 2)
+        assert_same(nav, rebuilt([]))
+        self.assertIsNone(nav.remove_zone_obstacle("F", 2))
+
+    def test_reapplying_zone_then_removing_clears_cells(self):
+        navigator = MapNavigator()
+        navigator.load_grid("F", [[0] * 20 for _ in range(10)])
+        zone = {"id": 7, "type": "zone", "name": "shelf",
+                "rect": '{"left": "25%", "top": "40%", "width": "25%", "height": "20%"}'}
+        navigator.update_obstacles("F", [zone])
+        navigator.update_obstacles("F", [zone])
+        self.assertEqual(int(navigator.zone_counts["F"].max()), 1)
+
+        navigator.remove_zone_obstacle("F", 7)
+        self.assertEqual(int(navigator.grids["F"].sum()), 0)
+
+class TestHierarchical(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.grid = (rng.random((64, 64)) < 0.25).astype(np.uint8)
+        self.navigator = MapNavigator()
+        self.navigator.load_grid("H", self.grid)
+        self.navigator.update_obstacles("H", [])
+        self.reference = MapNavigator()
+        self.reference.load_grid("H", self.grid)
+        self.reference.update_obstacles("H", [])
+        self.navigator.build_hierarchy("H", cluster_size=8)
+
+    def _cost(self, path):
+        cost = self.navigator.cost_grids["H"]
+        return sum(cost[y * 64 + x] for x, y in path[1:])
+
+    def _check_paths(self):
+        rng = np.random.default_rng(6)
+        free = np.argwhere(self.navigator.grids["H"] == 0)
+        for _ in range(20):
+            (sy, sx), (ey, ex) = free[rng.integers(len(free), size=2)]
+            start, end = (int(sx), int(sy)), (int(ex), int(ey))
+            path = self.navigator.find_path("H", start, end)
+            exact = self.reference.find_path("H", start, end)
+            if exact is None:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual((path[0], path[-1]), (start, end))
+            for (ax, ay), (bx, by) in zip(path, path[1:]):
+                self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+                self.assertEqual(self.navigator.grids["H"][by, bx], 0)
+            self.assertGreaterEqual(self._cost(path), self._cost(exact) - 1e-6)
+            self.assertLessEqual(self._cost(path), self._cost(exact) * 1.5)
+
+    def test_paths_valid_and_near_optimal(self):
+        self._check_paths()
+
+    def test_python_fallback_matches_scipy(self):
+        graph = self.navigator.hierarchies["H"]
+        saved, pathfinder._sp_dijkstra = pathfinder._sp_dijkstra, None
+        try:
+            fallback = pathfinder.ClusterGraph(graph.cost, 64, 64, 8)
+        finally:
+            pathfinder._sp_dijkstra = saved
+        self.assertEqual(fallback.intra, graph.intra)
+
+    def test_zone_edit_rebuilds_only_touched_clusters(self):
+        zone = {"type": "zone", "name": "shelf",
+                "rect": '{"left": "40%", "top": "40%", "width": "5%", "height": "5%"}'}
+        for nav in (self.navigator, self.reference):
+            nav.update_obstacles("H", [zone])
+        graph = self.navigator.hierarchies["H"]
+        full = pathfinder.ClusterGraph(self.navigator.cost_grids["H"], 64, 64, 8)
+        self.assertEqual(graph.transitions, full.transitions)
+        self.assertEqual(graph.intra, full.intra)
+        self._check_paths()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,149 @@
+import sys
+import os
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from backend.ai_service import reranker_node
+from backend.ai_service.reranker_node import HybridReranker, LocalReranker, Reranker
+from backend.ai_service.schemas import Intent
+
+CANDIDATES = [
+    {"id": 1, "name": "욕실 발매트", "category_middle": "욕실용품"},
+    {"id": 2, "name": "규조토 욕실매트", "category_middle": "욕실용품"},
+    {"id": 3, "name": "주방 매트", "category_middle": "주방잡화"},
+]
+
+
+def _bigram_embedder(calls):
+    """Stand-in for MiniLM: hashed character bigrams; records every batch it encodes."""
+    def embed(texts):
+        calls.append(list(texts))
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for i, t in enumerate(texts):
+            t = t.replace(" ", "")
+            for a, b in zip(t, t[1:]):
+                out[i, hash(a + b) % 64] += 1.0
+        return out
+    return embed
+
+
+class _FakeLLM(Reranker):
+    name = "llm"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def rerank(self, user_query, candidates, slots=None, deadline=None):
+        self.calls += 1
+        return {"selected_id": "3", "reason": "llm", "latency": 0.0, "reranker": self.name}
+
+
+class TestLocalReranker(unittest.TestCase):
+    def setUp(self):
+        self.local = LocalReranker(min_score=0.6, margin=0.2, use_embeddings=False)
+
+    def rerank(self, query, candidates=CANDIDATES, slots=None):
+        return asyncio.run(self.local.rerank(query, candidates, slots))
+
+    def test_decisive_full_match(self):
+        result = self.rerank("규조토 욕실매트 어디 있어", slots={"item": "규조토 욕실매트"})
+        self.assertEqual((result["selected_id"], result["decisive"], result["reranker"]), ("2", True, "local"))
+        self.assertGreaterEqual(result["margin"], 0.2)
+
+    def test_abstains_when_not_decisive(self):
+        self.assertIsNone(self.rerank("매트", slots={"item": "매트"})["selected_id"])  # tie
+        self.assertIsNone(self.rerank("우산", slots={"item": "우산"})["selected_id"])  # no match
+        self.assertIsNone(self.rerank("규조토 욕실매트 커버", slots={"item": "규조토 욕실매트 커버"})["selected_id"])
+        self.assertFalse(self.rerank("아무거나", candidates=[])["decisive"])
+
+    def test_rewrite_preferred_over_item(self):
+        scored = self.local.score("매트", CANDIDATES, {"item": "매트", "query_rewrite": "주방 매트"})
+        self.assertEqual(scored[0][2]["id"], 3)
+
+    def test_embeddings_cached(self):
+        calls = []
+        local = LocalReranker(min_score=0.5, margin=0.1, embedder=_bigram_embedder(calls))
+        first = asyncio.run(local.rerank("규조토 욕실매트", CANDIDATES))
+        self.assertEqual(first["selected_id"], "2")
+        asyncio.run(local.rerank("욕실매트", CANDIDATES))
+        self.assertEqual(calls[1], ["욕실매트"])  # candidates come from the cache
+
+    def test_full_match_required_with_embeddings(self):
+        local = LocalReranker(min_score=0.3, margin=0.05, embedder=_bigram_embedder([]))
+        result = asyncio.run(local.rerank("규조토 욕실매트 커버", CANDIDATES))
+        self.assertIsNone(result["selected_id"])
+        self.assertGreaterEqual(result["score"], 0.3)  # would pass score and margin alone
+
+
+    def test_encode_runs_off_the_loop(self):
+        calls, threads = [], []
+        embed = _bigram_embedder(calls)
+
+        def tracking_embed(texts):
+            threads.append(threading.get_ident())
+            return embed(texts)
+
+        async def run():
+            local = LocalReranker(min_score=0.5, margin=0.1, embedder=tracking_embed)
+            await local.rerank("규조토 욕실매트", CANDIDATES)
+            return threading.get_ident()
+
+        self.assertNotIn(asyncio.run(run()), threads)
+        self.assertTrue(threads)
+
+    def test_embeddings_unused_until_loaded(self):
+        local = LocalReranker(min_score=0.6, margin=0.2)
+        with mock.patch.object(reranker_node, "_load_embedder", side_effect=AssertionError):
+            result = asyncio.run(local.rerank("규조토 욕실매트", CANDIDATES))
+        self.assertEqual(result["selected_id"], "2")
+
+    def test_incomplete_reranker_fails_at_construction(self):
+        class Incomplete(Reranker):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestHybridReranker(unittest.TestCase):
+    def test_llm_only_when_not_decisive(self):
+        llm = _FakeLLM()
+        hybrid = HybridReranker(LocalReranker(min_score=0.6, margin=0.2, use_embeddings=False), llm)
+
+        result = asyncio.run(hybrid.rerank("규조토 욕실매트", CANDIDATES))
+        self.assertEqual((result["selected_id"], llm.calls), ("2", 0))
+
+        result = asyncio.run(hybrid.rerank("매트", CANDIDATES))
+        self.assertEqual((result["selected_id"], result["reranker"], llm.calls), ("3", "llm", 1))
+        self.assertEqual(hybrid.stats, {"local": 1, "llm": 1})
+
+    def test_node_uses_configured_reranker(self):
+        state = {"intent": Intent.PRODUCT_LOCATION, "input_text": "규조토 욕실매트 어디 있어",
+                 "slots": {"item": "욕실 매트"}, "search_candidates": CANDIDATES}
+        hybrid = HybridReranker(LocalReranker(use_embeddings=False), _FakeLLM())
+        with mock.patch.object(reranker_node, "get_reranker", return_value=hybrid), \
+                mock.patch.object(reranker_node, "_advanced_rerank", side_effect=AssertionError):
+            result = asyncio.run(reranker_node.reranker_node(state))["rerank_result"]
+        self.assertEqual(result["reranker"], "llm")  # lead over '욕실 발매트' below the margin
+
+        state["slots"] = {"item": "규조토 욕실매트"}
+        with mock.patch.object(reranker_node, "get_reranker", return_value=hybrid):
+            result = asyncio.run(reranker_node.reranker_node(state))["rerank_result"]
+        self.assertEqual((result["selected_id"], result["reranker"]), ("2", "local"))
+
+    def test_get_reranker_modes(self):
+        with mock.patch.dict(reranker_node._rerankers, clear=True):
+            self.assertIsInstance(reranker_node.get_reranker("hybrid"), HybridReranker)
+            self.assertIs(reranker_node.get_reranker("local"), reranker_node.get_reranker("local"))
+            self.assertIsInstance(reranker_node.get_reranker("bogus"), reranker_node.LLMReranker)
+
+
+if __name__ == '__main__':
+    unittest.main()
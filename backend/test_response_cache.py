@@ -0,0 +1,105 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from backend.ai_service import response_cache
+from backend.ai_service.fast_nlu import FastPathNLU
+from backend.ai_service.response_cache import ResponseCache, normalize_query, history_fingerprint
+
+TERMS = FastPathNLU(
+    [{"name": "욕실 매트"}, {"name": "볼펜"}],
+    {"전기용품": {"건전지": ["건전지"]}},
+).terms
+
+
+def _bigram_embedder(texts):
+    """Stand-in for MiniLM: hashed character bigrams."""
+    out = np.zeros((len(texts), 64), dtype=np.float32)
+    for i, t in enumerate(texts):
+        t = t.replace(" ", "")
+        for a, b in zip(t, t[1:]):
+            out[i, hash(a + b) % 64] += 1.0
+    return out
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=3, ttl=60, semantic_threshold=0, clock=self.clock)
+
+    def test_normalization(self):
+        self.assertEqual(normalize_query("  볼펜 어디 있어?? "), "볼펜 어디 있어")
+        self.assertEqual(normalize_query("ＡＢＣ  펜!"), "abc 펜")
+        self.assertEqual(history_fingerprint([]), "")
+        self.assertNotEqual(history_fingerprint([{"role": "user", "text": "펜"}]), "")
+
+    def test_exact_hit_ttl_and_lru(self):
+        self.cache.put("볼펜 어디 있어?", [], {"intent": "PRODUCT_LOCATION"})
+        self.assertEqual(self.cache.get("볼펜  어디 있어"), {"intent": "PRODUCT_LOCATION"})
+
+        # Different conversation context -> different entry
+        self.assertIsNone(self.cache.get("볼펜 어디 있어", [{"role": "assistant", "text": "어떤 펜이요?"}]))
+
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get("볼펜 어디 있어"))
+
+        for q in ["a", "b", "c"]:
+            self.cache.put(q, None, {"q": q})
+        self.cache.get("a")  # refresh a
+        self.cache.put("d", None, {"q": "d"})
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), {"q": "a"})
+
+        report = self.cache.report()
+        self.assertEqual(report["exact_hits"], 3)
+        self.assertEqual(report["misses"], 3)
+        self.assertEqual(report["evictions"], 2)
+
+    def test_catalog_version_change_clears(self):
+        self.cache.put("볼펜", None, {"x": 1}, version=1)
+        self.assertIsNotNone(self.cache.get("볼펜", version=1))
+        self.assertIsNone(self.cache.get("볼펜", version=2))
+
+    def test_semantic_hit_requires_same_numbers(self):
+        cache = ResponseCache(max_entries=10, ttl=60, semantic_threshold=0.8,
+                              embedder=_bigram_embedder, term_extractor=TERMS, clock=self.clock)
+        cache.put("5000원 이하 욕실 매트 어디 있어요", None, {"item": "욕실매트"})
+        self.assertEqual(cache.get("5000원 이하 욕실 매트 어디 있나요"), {"item": "욕실매트"})
+        self.assertIsNone(cache.get("3000원 이하 욕실 매트 어디 있어요"))
+        self.assertIsNone(cache.get("볼펜 주세요"))
+        self.assertEqual(cache.report()["semantic_hits"], 1)
+
+    def test_semantic_hit_requires_same_terms(self):
+        self.assertEqual(TERMS("파란색 볼펜 어디 있어"), {"파란색", "볼펜"})
+        cache = ResponseCache(max_entries=10, ttl=60, semantic_threshold=0.5,
+                              embedder=_bigram_embedder, term_extractor=TERMS, clock=self.clock)
+        cache.put("파란색 볼펜 어디 있어요", None, {"item": "볼펜"})
+        cache.put("건전지 aa 어디 있어요", None, {"item": "건전지"})
+        self.assertIsNone(cache.get("빨간색 볼펜 어디 있어요"))
+        self.assertIsNone(cache.get("건전지 aaa 어디 있어요"))
+        self.assertEqual(cache.get("파란색 볼펜 어디 있나요"), {"item": "볼펜"})
+
+    def test_semantic_tier_off_without_terms(self):
+        cache = ResponseCache(max_entries=10, ttl=60, semantic_threshold=0.5,
+                              embedder=_bigram_embedder, clock=self.clock)
+        with mock.patch.object(response_cache, "_default_term_extractor", return_value=None):
+            cache.put("파란색 볼펜 어디 있어요", None, {"item": "볼펜"})
+            self.assertIsNone(cache.get("파란색 볼펜 어디 있나요"))
+
+
+if __name__ == '__main__':
+    unittest.main()
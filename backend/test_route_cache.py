@@ -0,0 +1,116 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from backend.navigation.pathfinder import MapNavigator
+from backend.navigation.route_cache import RouteCache
+from backend.navigation.zone_index import ZoneIndex
+
+
+def _rect(left, top):
+    return f'{{"left": "{left}%", "top": "{top}%", "width": "5%", "height": "5%"}}'
+
+
+class TestRouteCache(unittest.TestCase):
+    def setUp(self):
+        self.navigator = MapNavigator()
+        rng = np.random.default_rng(3)
+        grid = (rng.random((40, 50)) < 0.15).astype(np.uint8)
+        self.navigator.load_grid("F", grid)
+        self.navigator.update_obstacles("F", [])
+        self.zones = ZoneIndex([
+            {"id": 1, "floor": "F", "name": "kiosk", "type": "start", "rect": _rect(5, 5)},
+            {"id": 2, "floor": "F", "name": "Elevator", "type": "connection", "rect": _rect(80, 80)},
+            {"id": 3, "floor": "F", "name": "shelf", "type": "zone", "rect": _rect(40, 40)},
+        ], version=1)
+
+    def _cost(self, path):
+        cost, w = self.navigator.cost_grids["F"], self.navigator.width["F"]
+        return sum(cost[y * w + x] for x, y in path[1:])
+
+    def test_cached_route_matches_astar_cost(self):
+        cache = RouteCache(self.navigator).build(self.zones)
+        self.assertEqual(len(cache), 2)
+
+        start = self.navigator.to_grid("F", *self.zones.find("start", "kiosk").center)
+        for end in [(45, 35), (10, 30), (30, 2)]:
+            cached = cache.route("F", start, end)
+            astar = self.navigator.find_path("F", start, end)
+            if astar is None:
+                self.assertIsNone(cached)
+                continue
+            self.assertEqual(cached[0], astar[0])
+            self.assertEqual(cached[-1], astar[-1])
+            self.assertAlmostEqual(self._cost(cached), self._cost(astar), places=3)
+
+        # Not a cached source -> caller falls back to A*
+        self.assertIsNone(cache.route("F", (25, 20), (45, 35)))
+
+    def test_multi_target_tree_stops_early(self):
+        start = self.navigator.get_nearest_walkable("F", (2, 2))
+        targets = [self.navigator.get_nearest_walkable("F", t) for t in [(10, 10), (20, 5)]]
+        full_dist, _ = self.navigator.shortest_path_tree("F", start)
+        dist, _ = self.navigator.shortest_path_tree("F", start, targets=targets)
+        w = self.navigator.width["F"]
+        for x, y in targets:
+            self.assertEqual(dist[y * w + x], full_dist[y * w + x])
+        self.assertGreater(np.isinf(dist).sum(), np.isinf(full_dist).sum())
+
+    def test_memory_mapped_trees(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = RouteCache(self.navigator, cache_dir=tmp).build(self.zones)
+            self.assertEqual(len(os.listdir(tmp)), 4)
+            second = RouteCache(self.navigator, cache_dir=tmp).build(self.zones)
+            for key, tree in second.trees.items():
+                self.assertIsInstance(tree.parent, np.memmap)
+                self.assertEqual(tree.parent.dtype, np.int32)
+                np.testing.assert_array_equal(tree.parent, first.trees[key].parent)
+            del first, second
+
+    def test_zone_edit_invalidates_crossing_paths_only(self):
+        nav = self.navigator
+        cache = RouteCache(nav).build(self.zones)
+        start = nav.to_grid("F", *self.zones.find("start", "kiosk").center)
+        shelf = {"id": 9, "floor": "F", "name": "new shelf", "type": "zone",
+                 "rect": '{"left": "40%", "top": "0%", "width": "10%", "height": "60%"}'}
+
+        window = nav.add_zone_obstacle("F", shelf)
+        self.assertGreater(cache.invalidate("F", window, costs_decreased=False), 0)
+        tree = cache.tree("F", start)
+        self.assertIsNotNone(tree.stale)
+        kept = 0
+        for end in [(3, 30), (45, 35), (8, 12), (40, 5)]:
+            node = nav.get_nearest_walkable("F", end)
+            cached = cache.route("F", start, end)
+            if tree.stale[node[1] * tree.width + node[0]]:
+                self.assertIsNone(cached)  # caller falls back to A*
+                continue
+            kept += 1
+            astar = nav.find_path("F", start, end)
+            self.assertAlmostEqual(self._cost(cached), self._cost(astar), places=3)
+        self.assertGreater(kept, 0)
+
+        exact = cache.tree("F", start, exact=True)
+        self.assertIsNone(exact.stale)
+        astar = nav.find_path("F", start, (45, 35))
+        self.assertAlmostEqual(self._cost(exact.path_to(nav.get_nearest_walkable("F", (45, 35)))),
+                               self._cost(astar), places=3)
+
+        # Removal can shorten paths anywhere they reach: recomputed on next use
+        window = nav.remove_zone_obstacle("F", 9)
+        cache.invalidate("F", window, costs_decreased=True)
+        self.assertTrue(cache.outdated)
+        dist, _ = nav.shortest_path_tree("F", nav.get_nearest_walkable("F", start))
+        tree = cache.tree("F", start)
+        np.testing.assert_array_equal(tree.dist, dist)
+        self.assertNotIn(("F", tree.source), cache.outdated)
+
+
+if __name__ == '__main__':
+    unittest.main()
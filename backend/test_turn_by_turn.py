@@ -0,0 +1,48 @@
+import sys
+import os
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from backend.navigation.turn_by_turn import simplify_path, generate_turn_by_turn_steps, zone_landmarks
+from backend.navigation.zone_index import ZoneIndex
+
+
+class TestSimplifyPath(unittest.TestCase):
+    def test_l_shape_keeps_corner(self):
+        path = [(0, y) for y in range(10)] + [(x, 9) for x in range(1, 10)]
+        self.assertEqual(simplify_path(path), [(0, 0), (0, 9), (9, 9)])
+
+    def test_shortcut_blocked_by_obstacle(self):
+        grid = np.zeros((10, 10), dtype=np.uint8)
+        grid[3:7, 3:7] = 1  # shelf on the diagonal between the L's end points
+        path = [(0, y) for y in range(10)] + [(x, 9) for x in range(1, 10)]
+        self.assertEqual(simplify_path(path, epsilon=20.0), [(0, 0), (9, 9)])
+        self.assertEqual(simplify_path(path, grid, epsilon=20.0), [(0, 0), (0, 9), (9, 9)])
+
+
+class TestTurnByTurn(unittest.TestCase):
+    def test_turns_and_landmark(self):
+        # up, then right, then up (doc example)
+        path = [{"x": 50, "y": 90}, {"x": 50, "y": 50}, {"x": 70, "y": 50}, {"x": 70, "y": 20}]
+        zones = ZoneIndex([{"id": 1, "floor": "B1", "name": "문구", "type": "zone",
+                            "rect": '{"left": "52%", "top": "40%", "width": "10%", "height": "8%"}'}])
+        steps = generate_turn_by_turn_steps(path, landmark=zone_landmarks(zones, "B1"))
+
+        kinds = [s["icon"] for s in steps]
+        self.assertEqual(kinds, ["⬆️", "➡️", "⬆️", "⬅️", "⬆️", "🎯"])
+        self.assertEqual(steps[0]["distance_m"], 12)
+        self.assertEqual(steps[1]["instruction"], "문구 앞에서 우회전하세요")
+        self.assertIsNone(steps[3]["landmark"])
+        self.assertEqual(steps[-1]["point_index"], 3)
+
+    def test_arrival_text(self):
+        steps = generate_turn_by_turn_steps([{"x": 0, "y": 0}, {"x": 0, "y": 10}], arrival="엘리베이터")
+        self.assertEqual(steps[-1]["instruction"], "엘리베이터")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import json
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from backend.navigation.zone_index import ZoneIndex, get_zone_center
+
+def _rect(left, top, size=2):
+    return json.dumps({"left": f"{left}%", "top": f"{top}%", "width": f"{size}%", "height": f"{size}%"})
+
+class TestZoneIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ZoneIndex([
+            {"id": 1, "floor": "B1", "name": "Entrance 1", "type": "start", "rect": _rect(10, 10)},
+            {"id": 2, "floor": "B1", "name": "Elevator", "type": "connection", "rect": _rect(90, 90)},
+            {"id": 3, "floor": "B1", "name": "Escalator", "type": "connection", "rect": _rect(20, 50)},
+            {"id": 4, "floor": "B2", "name": "Elevator", "type": "connection", "rect": _rect(5, 5)},
+            {"id": 5, "floor": "B1", "name": "필기구", "type": "category", "rect": "not json"},
+        ])
+
+    def test_zone_center(self):
+        self.assertEqual(get_zone_center(_rect(10, 20, 4)), {"x": 12.0, "y": 22.0})
+        self.assertEqual(get_zone_center([{"x": 0, "y": 0}, {"x": 10, "y": 20}]), {"x": 5.0, "y": 10.0})
+        self.assertIsNone(get_zone_center("not json"))
+
+    def test_find(self):
+        self.assertEqual(self.index.find("start", "Entrance 1").center, (11.0, 11.0))
+        self.assertEqual(self.index.find("connection", "Elevator", floor="B2").id, 4)
+        self.assertIsNone(self.index.find("start", "missing"))
+        self.assertIsNone(self.index.find("category", "필기구").center)
+
+    def test_nearest(self):
+        self.assertEqual(self.index.nearest("connection", "B1", 15, 15).id, 3)
+        self.assertEqual(self.index.nearest("connection", "B1", 80, 99).id, 2)
+        self.assertIsNone(self.index.nearest("connection", "B3", 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ import mapB1 from '../../../assets/images/map_b1.jpg';
 import mapB2 from '../../../assets/images/map_b2.jpg';
 
 import { useSearchParams, useRouter } from 'next/navigation';
-import { Suspense, useEffect, useState } from 'react';
+import { Suspense, useEffect, useRef, useState } from 'react';
 import Header from '@/components/shared/Header';
 import BottomNav from '@/components/shared/BottomNav';
 import { QrCode, ChevronRight, Loader2, MessageSquareWarning, Map as MapIcon } from 'lucide-react';
@@ -17,6 +17,8 @@ import MapNavigation, { Point } from '@/components/MapNavigation';
 import { Floor } from '@/types/MapData';
 import { useAllMapZones } from '@/hooks/useMapZones';
 
+type RouteMap = Record<string, { path: Point[]; floor: Floor }>;
+
 function SearchResultsContent() {
     const searchParams = useSearchParams();
     const router = useRouter();
@@ -36,21 +38,67 @@ function SearchResultsContent() {
     // Navigation State
     const [navPath, setNavPath] = useState<Point[]>([]);
     const [navFloor, setNavFloor] = useState<Floor | null>(null);
+    // Routes to every candidate product, fetched in one /api/navigation/routes call;
+    // fetchRoute waits for this batch before falling back to a single-route request
+    const routeBatch = useRef<Promise<RouteMap> | null>(null);
+    // Product whose route is being shown (drops results for an earlier selection)
+    const activeRouteId = useRef<string | null>(null);
 
     const zoneInfo = getZoneFromCategory(selectedProduct?.category_major, selectedProduct?.category_middle);
     const targetFloor = zoneInfo?.floor || selectedProduct?.floor || 'B1';
     const targetZoneName = zoneInfo?.zone;
 
+    useEffect(() => {
+        const ids = (response?.products || []).map(p => Number(p.id));
+        routeBatch.current = ids.length > 0 ? prefetchRoutes(ids) : null;
+    }, [response]);
+
     useEffect(() => {
         if (selectedProduct) {
             fetchRoute(selectedProduct.id.toString());
         } else {
+            activeRouteId.current = null;
             setNavPath([]);
             setNavFloor(null);
         }
     }, [selectedProduct]);
 
+    const prefetchRoutes = async (productIds: number[]): Promise<RouteMap> => {
+        const cache: RouteMap = {};
+        try {
+            const res = await fetch('http://localhost:8000/api/navigation/routes', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    start_x: 50, // Fallback
+                    start_y: 90,
+                    floor: 'B1', // Current Kiosk Floor
+                    target_product_ids: productIds,
+                    kiosk_id: "Kiosk 1"
+                })
+            });
+            if (res.ok) {
+                const data = await res.json();
+                for (const route of data.routes) {
+                    cache[String(route.product_id)] = { path: route.path, floor: route.floor as Floor };
+                }
+            }
+        } catch (e) {
+            console.error("Error prefetching routes:", e);
+        }
+        return cache;
+    };
+
     const fetchRoute = async (productId: string) => {
+        activeRouteId.current = productId;
+        const cached = routeBatch.current ? (await routeBatch.current)[productId] : undefined;
+        if (activeRouteId.current !== productId) return;
+        if (cached) {
+            setNavPath(cached.path);
+            setNavFloor(cached.floor);
+            return;
+        }
+
         try {
             // Use "Kiosk 1" as default start point based on walkthrough
             const kioskId = "Kiosk 1";
@@ -67,6 +115,7 @@ function SearchResultsContent() {
                 })
             });
 
+            if (activeRouteId.current !== productId) return;
             if (res.ok) {
                 const data = await res.json();
                 setNavPath(data.path);
@@ -8,11 +8,13 @@ import os
 import time
 import requests
 
+from ivhl.core.tokenize import ngram_tokenize
 from ivhl.core.types import Document, ScoredDoc
 
 
 def _simple_tokenize(text: str) -> List[str]:
-    return [t for t in (text or "").strip().split() if t]
+    # 백엔드 lexical index와 동일한 토크나이저 (음절 n-gram)
+    return ngram_tokenize(text)
 
 
 @dataclass
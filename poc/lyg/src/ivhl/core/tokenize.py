@@ -1,23 +1,68 @@
 from __future__ import annotations
 
 import re
-from typing import List
+import sys
+from pathlib import Path
+from typing import List, Optional
 
 
 _WORD_RE = re.compile(r"[\w가-힣]+", re.UNICODE)
 
 
+def _load_shared_tokenizer() -> Optional[object]:
+    """Import the repo-wide Korean tokenizer (backend/database/tokenizer.py).
+
+    ivhl lives at poc/lyg/src inside the same repository, so the repo root is
+    added to sys.path when the harness is run standalone.
+    """
+    try:
+        from backend.database import tokenizer
+        return tokenizer
+    except ImportError:
+        pass
+    repo_root = Path(__file__).resolve().parents[5]
+    if (repo_root / "backend" / "database" / "tokenizer.py").exists():
+        sys.path.append(str(repo_root))
+        try:
+            from backend.database import tokenizer
+            return tokenizer
+        except ImportError:
+            pass
+    return None
+
+
+_shared = _load_shared_tokenizer()
+
+
+def _regex_tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
 def tokenize(text: str) -> List[str]:
-    """Lightweight tokenizer.
+    """Lightweight word tokenizer.
 
     - Lowercases Latin text.
     - Keeps Korean syllables.
     - Splits on non-word characters.
 
-    Note: This is intentionally simple for benchmark harness use.
+    Uses the shared backend word splitter when available so the benchmark
+    harness and the kiosk backend agree on word boundaries.
+    """
+    if not text:
+        return []
+    if _shared is not None:
+        return _shared.words(text)
+    return _regex_tokenize(text)
+
+
+def ngram_tokenize(text: str) -> List[str]:
+    """BM25 index/query terms: words plus Korean syllable bigrams/trigrams.
+
+    Same terms as the backend lexical index ("욕실매트" and "욕실 매트" share
+    욕실/매트). Falls back to word tokens if the shared tokenizer is missing.
     """
     if not text:
         return []
-    # Lowercase only affects Latin characters
-    t = text.lower()
-    return _WORD_RE.findall(t)
+    if _shared is not None:
+        return _shared.tokenize(text)
+    return _regex_tokenize(text)